@@ -0,0 +1,164 @@
+import math
+
+import numpy as np
+
+# Bet fraction per risk tolerance for Fixed Fraction betting
+FIXED_FRACTIONS = {
+    "Conservative": 0.01,
+    "Moderate": 0.025,
+    "Aggressive": 0.05
+}
+
+# Share of the full Kelly fraction bet per risk tolerance
+KELLY_MULTIPLIERS = {
+    "Conservative": 0.5,
+    "Moderate": 0.75,
+    "Aggressive": 1.0
+}
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Upper bound on outcomes drawn at once (paths x bets) to keep memory flat
+BLOCK_ELEMENTS = 1 << 22
+
+
+def win_probability_for_edge(house_edge):
+    """Even-money win probability implied by a house edge"""
+    return 0.5 - house_edge / 2
+
+
+def kelly_fraction(win_probability, win_payout, risk_tolerance):
+    """Fractional Kelly bet size, constrained to the 1%-20% range used by the simulation"""
+    b = win_payout - 1
+    p = win_probability
+    full_kelly = (b * p - (1 - p)) / b
+    return max(0.01, min(0.2, full_kelly * KELLY_MULTIPLIERS[risk_tolerance]))
+
+
+def strategy_fraction(betting_strategy, risk_tolerance, win_probability=None, win_payout=None):
+    """Bankroll fraction bet per wager for the proportional strategies"""
+    if betting_strategy == "Fixed Fraction":
+        return FIXED_FRACTIONS[risk_tolerance]
+    if betting_strategy == "Kelly Criterion":
+        return kelly_fraction(win_probability, win_payout, risk_tolerance)
+    raise ValueError(f"{betting_strategy} is not a proportional betting strategy")
+
+
+def draw_wins(rng, shape, p):
+    """Draw Bernoulli(p) outcomes from 16-bit integers, resolving ties exactly"""
+    scaled = p * 65536
+    cut = int(scaled)
+    u = rng.integers(0, 65535, size=shape, dtype=np.uint16, endpoint=True)
+    wins = u < cut
+    if 0 < scaled - cut:
+        # Values equal to the cut point win with the leftover probability
+        ties = np.flatnonzero(u == cut)
+        if ties.size:
+            wins.flat[ties] = rng.random(ties.size) < (scaled - cut)
+    return wins
+
+
+def _percentiles_from_counts(counts, values, total, percentiles):
+    """Linear-interpolated percentiles of `total` outcomes, where `counts[i]`
+    outcomes equal `values[i]` and the remainder are ruined at 0"""
+    # Sorted outcomes are the ruined zeros followed by each value in turn
+    ends = np.cumsum(counts) + (total - counts.sum())
+    ranks = np.asarray(percentiles, dtype=np.float64) / 100 * (total - 1)
+    lower = np.floor(ranks).astype(np.int64)
+    upper = np.minimum(lower + 1, total - 1)
+
+    def order_statistic(rank):
+        index = np.searchsorted(ends, rank, side="right")
+        ruined = rank < total - counts.sum()
+        return np.where(ruined, 0.0, values[np.minimum(index, len(values) - 1)])
+
+    low = order_statistic(lower)
+    return low + (ranks - lower) * (order_statistic(upper) - low)
+
+
+def simulate_bankroll(initial_bankroll, fraction, house_edge, num_sessions, bets_per_session,
+                      num_paths=10000, win_payout=2.0, min_bet=1.0,
+                      percentiles=DEFAULT_PERCENTILES, seed=None):
+    """Monte Carlo bankroll paths for proportional (Fixed Fraction / Kelly) betting.
+
+    Every wager stakes `fraction` of the current bankroll and pays `win_payout`
+    times the bet on a win. A path is ruined once its bankroll drops below
+    `min_bet` at any point during a session; ruined paths are masked at $0
+    for the rest of the run. Returns per-session percentile bands, the final
+    bankroll of every path and the probability of ruin.
+    """
+    if not 0 < fraction < 1:
+        raise ValueError("fraction must be between 0 and 1")
+    if initial_bankroll <= 0 or min_bet <= 0:
+        raise ValueError("initial_bankroll and min_bet must be positive")
+
+    rng = np.random.default_rng(seed)
+    p = win_probability_for_edge(house_edge)
+
+    # Work in log space: each win adds log_win, each loss adds log_loss
+    log_win = math.log1p(fraction * (win_payout - 1))
+    log_loss = math.log1p(-fraction)
+    log_floor = math.log(min_bet)
+    # Log-change after k bets with w wins is w * spread + k * log_loss
+    spread = log_win - log_loss
+    k = np.arange(1, bets_per_session + 1, dtype=np.float64)
+    drift = (k * log_loss).astype(np.float32)[:, None]
+    count_dtype = np.int16 if bets_per_session < 32768 else np.int32
+
+    log_start = math.log(initial_bankroll)
+    total_wins = np.zeros(num_paths, dtype=np.int32)
+    alive = np.ones(num_paths, dtype=bool)
+    block_paths = max(1, BLOCK_ELEMENTS // max(1, bets_per_session))
+
+    bands = {q: np.empty(num_sessions + 1) for q in percentiles}
+    ruin_by_session = np.zeros(num_sessions + 1)
+    for q in percentiles:
+        bands[q][0] = initial_bankroll
+
+    for session in range(num_sessions):
+        bets_so_far = session * bets_per_session
+        log_bankroll = log_start + total_wins * spread + bets_so_far * log_loss
+        # A path can only be ruined this session if losing every bet would sink it
+        at_risk = alive & (log_bankroll + bets_per_session * log_loss < log_floor)
+
+        for start in range(0, num_paths, block_paths):
+            stop = min(start + block_paths, num_paths)
+            # Bets run along the first axis so per-path reductions stay contiguous
+            wins = draw_wins(rng, (bets_per_session, stop - start), p)
+            block_risk = at_risk[start:stop]
+
+            if block_risk.any():
+                # Track the lowest point of each at-risk path within the session
+                # (float32 is plenty for a floor check and halves the memory traffic)
+                risky_wins = wins if block_risk.all() else wins[:, block_risk]
+                running = np.cumsum(risky_wins, axis=0, dtype=count_dtype).astype(np.float32)
+                running *= np.float32(spread)
+                running += drift
+                low = running.min(axis=0)
+                ruined = np.zeros(stop - start, dtype=bool)
+                ruined[block_risk] = log_bankroll[start:stop][block_risk] + low < log_floor
+                alive[start:stop] &= ~ruined
+
+            total_wins[start:stop] += wins.sum(axis=0, dtype=np.int32)
+
+        ruin_by_session[session + 1] = 1 - np.count_nonzero(alive) / num_paths
+        log_values = log_start + np.arange((session + 1) * bets_per_session + 1) * spread \
+            + (session + 1) * bets_per_session * log_loss
+        values = _percentiles_from_counts(
+            np.bincount(total_wins[alive], minlength=len(log_values)),
+            np.exp(log_values), num_paths, percentiles
+        )
+        for q, value in zip(percentiles, values):
+            bands[q][session + 1] = value
+
+    log_bankroll = log_start + total_wins * spread + num_sessions * bets_per_session * log_loss
+    log_bankroll[~alive] = -np.inf
+    final_bankrolls = np.exp(log_bankroll)
+    return {
+        "sessions": np.arange(num_sessions + 1),
+        "bands": bands,
+        "final_bankrolls": final_bankrolls,
+        "mean_final": float(final_bankrolls.mean()),
+        "ruin_probability": float(ruin_by_session[-1]),
+        "ruin_by_session": ruin_by_session
+    }
@@ -0,0 +1,59 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from name_search import NameSearchIndex  # noqa: E402
+
+QUERIES = ["z", "dr", "gold", "dragon", "fortune 12", "lucky lar", "xyzzy"]
+
+
+def synthetic_names(size, seed=0):
+    """Game names shaped like the shipped catalog: title words plus a variant suffix"""
+    catalog = pd.read_csv(Path(__file__).resolve().parent.parent / "extended_game_list.csv_")
+    words = sorted(set(" ".join(catalog['Name']).split()))
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(1, 4, size)
+    picks = rng.choice(words, counts.sum())
+    titles = pd.Series(picks).groupby(np.repeat(np.arange(size), counts)).agg(" ".join)
+    return titles + " " + pd.Series(rng.integers(0, 1000, size)).astype(str)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Name index vs. str.contains on a synthetic catalog")
+    parser.add_argument("--size", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    names = synthetic_names(args.size)
+    start = time.perf_counter()
+    index = NameSearchIndex(names)
+    print(f"{args.size:,} names ({len(index.names):,} distinct), index built in {time.perf_counter() - start:.2f}s")
+    print(f"{'query':<14}{'matches':>10}{'str.contains':>16}{'index':>12}{'speedup':>10}")
+
+    for query in QUERIES:
+        scan_time, expected = best_of(
+            lambda: np.flatnonzero(names.str.contains(query, case=False).to_numpy()), args.repeat)
+        index_time, found = best_of(lambda: index.search(query), args.repeat)
+        if not np.array_equal(expected, found):
+            raise AssertionError(f"index and str.contains disagree for {query!r}")
+        print(f"{query!r:<14}{len(found):>10,}{scan_time * 1000:>14.2f}ms{index_time * 1000:>10.2f}ms"
+              f"{scan_time / index_time:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
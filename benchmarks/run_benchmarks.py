@@ -0,0 +1,234 @@
+import argparse
+import ast
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bankroll_sim import simulate_bankroll  # noqa: E402
+from game_cards import add_display_labels, render_game_cards  # noqa: E402
+from game_catalog import compact_catalog, load_catalog, normalize_catalog  # noqa: E402
+from game_filters import GameFilterIndex  # noqa: E402
+from game_ranking import top_k  # noqa: E402
+from game_recommender import GameRecommender  # noqa: E402
+from outcome_distribution import even_money_distribution, flat_bet_distribution  # noqa: E402
+from ruin_solver import solve_progression  # noqa: E402
+from session_math import MAX_BET_SHARE, STOP_LOSS_SHARE  # noqa: E402
+from session_store import SessionStore  # noqa: E402
+from synthetic import REPO_DIR, synthetic_catalog, synthetic_sessions  # noqa: E402
+from trip_history import GROUPINGS, TripHistory, best_and_worst_games, roi_trend, summarize  # noqa: E402
+from trip_planner import plan_trip  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+CATALOG_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+SESSION_SIZES = [1_000, 10_000, 100_000]
+# A benchmark is flagged when it is this much slower than the baseline
+DEFAULT_TOLERANCE = 1.25
+
+
+def load_function(script, name):
+    """A top-level function from a Streamlit script, without running the script"""
+    path = REPO_DIR / script
+    tree = ast.parse(path.read_text(), filename=str(path))
+    nodes = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == name]
+    if not nodes:
+        raise LookupError(f"{name} not found in {script}")
+    namespace = {}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(path), 'exec'), namespace)
+    return namespace[name]
+
+
+def measure(func, repeat):
+    """Run once to warm up, then time `repeat` runs"""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+# Each benchmark group yields (name, callable) pairs for one size
+
+def catalog_benchmarks(size, workdir):
+    path = workdir / f"catalog_{size}.csv"
+    synthetic_catalog(size).to_csv(path, index=False)
+    # load_game_data: normalization of the raw CSV, then from the columnar cache
+    yield "catalog.normalize", lambda: add_display_labels(normalize_catalog(pd.read_csv(path)))
+    yield "catalog.load_cached", lambda: add_display_labels(load_catalog(path, cache_dir=workdir / "cache"))
+    labelled = add_display_labels(normalize_catalog(pd.read_csv(path)))
+    yield "catalog.compact", lambda: compact_catalog(labelled)
+
+
+def game_plan_benchmarks(size, workdir):
+    df = add_display_labels(normalize_catalog(synthetic_catalog(size)))
+    yield "game_plan.build_index", lambda: GameFilterIndex(df)
+    index = GameFilterIndex(df)
+
+    def page(**filters):
+        matches = index.query(**filters)
+        return render_game_cards(df.iloc[top_k(index.scores, matches, 50)])
+
+    yield "game_plan.page_unfiltered", lambda: page()
+    yield "game_plan.page_filtered", lambda: page(max_min_bet=2.0, min_rtp=92.0, game_type="Slot",
+                                                  advantage="High (4-5)", volatility="Low (1-2)")
+    yield "game_plan.page_name_search", lambda: page(name_query="dragon")
+    compact = compact_catalog(df)
+    yield "game_plan.trip_plan_20", lambda: plan_trip(compact, 1000.0, 20, MAX_BET_SHARE, STOP_LOSS_SHARE)
+
+
+def recommend_benchmarks():
+    recommend = load_function("profit_hopper_with_game_order.py", "get_recommended_games")
+    yield "recommend_games", lambda: [recommend(bankroll / 5, bankroll / 5 / 30, risk)
+                                      for bankroll in range(100, 1100, 100)
+                                      for risk in ("Low", "Medium", "High")]
+
+
+def modern_recommend_benchmarks(size, workdir):
+    # profit_hopper_modern.py's game_list.csv schema, derived from the synthetic catalog
+    raw = synthetic_catalog(size)
+    games = pd.DataFrame({
+        'Name': raw['Name'],
+        'Type': raw['Type'],
+        'Volatility': np.array(["Low", "Low", "Medium", "High", "High"])[raw['Volatility'] - 1],
+        'Bonus': raw['Has_Bonus'] == "Yes",
+        'Min_Bet': raw['Min_Bet'],
+        'RTP': raw['RTP']
+    })
+    yield "recommend.modern_build", lambda: GameRecommender(games)
+    recommender = GameRecommender(games)
+    yield "recommend.modern_uncached", lambda: (recommender.cache_clear(), recommender.recommend(20.0, 5.0))
+    yield "recommend.modern_cached", lambda: recommender.recommend(20.0, 5.0)
+
+
+def trip_benchmarks(size, workdir):
+    sessions = synthetic_sessions(size)
+    store = SessionStore(workdir / f"sessions_{size}.db")
+    store.add_sessions(sessions.to_dict('records'))
+    trip_id = int(sessions['trip_id'].iloc[-1])
+    latest = sessions['date'].max()
+
+    def append_sessions():
+        for i in range(100):
+            store.add_session({'trip_id': trip_id, 'date': latest, 'casino': "Coushatta", 'game': "Cleopatra",
+                               'money_in': 100.0, 'money_out': 90.0 + i, 'profit': i - 10.0})
+
+    yield "trips.append_100_sessions", append_sessions
+    yield "trips.read_aggregates", lambda: (store.trip_totals(trip_id), store.game_totals(trip_id),
+                                            store.profit_series(trip_id))
+
+    history = TripHistory(store, workdir / f"history_{size}").frame()
+
+    def history_analytics():
+        for column in GROUPINGS.values():
+            summarize(history, column)
+        roi_trend(history)
+        best_and_worst_games(history)
+
+    yield "trips.history_analytics", history_analytics
+
+
+def simulation_benchmarks():
+    yield "bankroll.simulate_10k_paths", lambda: simulate_bankroll(
+        1000.0, 0.05, 0.05, num_sessions=100, bets_per_session=20, num_paths=10_000, seed=0)
+    yield "bankroll.simulate_100k_paths", lambda: simulate_bankroll(
+        1000.0, 0.05, 0.05, num_sessions=100, bets_per_session=20, num_paths=100_000, seed=0)
+    yield "ruin.solve_martingale", lambda: solve_progression(
+        "Martingale", 1000.0, 0.05, base_bet=5.0, table_max=500.0, num_bets=2000, bets_per_session=20)
+    yield "flat_bet.exact_distribution", lambda: flat_bet_distribution(
+        *even_money_distribution(0.05), 5.0, 20, num_sessions=100, stop_loss=60.0, profit_goal=40.0)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline_path, tolerance):
+    """Print timing ratios against a baseline run; returns the regressed benchmark keys"""
+    baseline = {(r['name'], r['size']): r['best'] for r in json.loads(Path(baseline_path).read_text())['results']}
+    regressions = []
+    print(f"\nAgainst {baseline_path} (tolerance {tolerance:.2f}x)")
+    for result in results:
+        key = (result['name'], result['size'])
+        if key not in baseline:
+            continue
+        ratio = result['best'] / baseline[key]
+        flag = "  REGRESSION" if ratio > tolerance else ""
+        print(f"{result['name']:<30}{str(result['size'] or ''):>10}{ratio:>9.2f}x{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the catalog, Game Plan, recommendation, trip and "
+                                                 "simulation hot paths and store the results as JSON")
+    parser.add_argument("--sizes", type=int, nargs="+", default=CATALOG_SIZES, help="catalog sizes")
+    parser.add_argument("--session-sizes", type=int, nargs="+", default=SESSION_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="run only benchmarks whose name starts with this prefix")
+    parser.add_argument("--output", type=Path, help="results file (default: results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="baseline results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        groups = [(size, catalog_benchmarks(size, workdir)) for size in args.sizes]
+        groups += [(size, game_plan_benchmarks(size, workdir)) for size in args.sizes]
+        groups += [(None, recommend_benchmarks())]
+        groups += [(size, modern_recommend_benchmarks(size, workdir)) for size in args.sizes]
+        groups += [(size, trip_benchmarks(size, workdir)) for size in args.session_sizes]
+        groups += [(None, simulation_benchmarks())]
+
+        print(f"{'benchmark':<30}{'size':>10}{'best':>12}{'median':>12}")
+        for size, benchmarks in groups:
+            for name, func in benchmarks:
+                if args.only and not name.startswith(args.only):
+                    continue
+                timings = measure(func, args.repeat)
+                results.append({
+                    'name': name,
+                    'size': size,
+                    'best': min(timings),
+                    'median': statistics.median(timings),
+                    'repeat': args.repeat
+                })
+                print(f"{name:<30}{str(size or ''):>10}{min(timings) * 1000:>10.2f}ms"
+                      f"{statistics.median(timings) * 1000:>10.2f}ms")
+
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'results': results
+    }, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+SHIPPED_CATALOG = REPO_DIR / "extended_game_list.csv_"
+
+CASINOS = [
+    "L'auberge Lake Charles",
+    "Golden Nugget Lake Charles",
+    "Caesar's Horseshoe Lake Charles",
+    "Delta Downs",
+    "Island View",
+    "Paragon Marksville",
+    "Coushatta"
+]
+
+
+def synthetic_catalog(size, seed=0):
+    """Raw catalog rows with the shipped CSV's columns and value distributions.
+
+    Numeric columns are resampled from the shipped rows with a little noise,
+    text columns are resampled as-is and names combine shipped title words
+    with a numeric variant so most of them are distinct.
+    """
+    shipped = pd.read_csv(SHIPPED_CATALOG)
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(shipped), size)
+    df = shipped.iloc[rows].reset_index(drop=True)
+
+    words = np.array(sorted(set(" ".join(shipped['Name']).split())))
+    counts = rng.integers(1, 4, size)
+    picks = words[rng.integers(0, len(words), counts.sum())]
+    titles = pd.Series(picks).groupby(np.repeat(np.arange(size), counts)).agg(" ".join)
+    df['Name'] = titles + " " + pd.Series(rng.integers(0, 10000, size)).astype(str)
+
+    df['Min_Bet'] = np.round(df['Min_Bet'] * rng.uniform(0.5, 2.0, size), 2)
+    df['RTP'] = np.round(np.clip(df['RTP'] + rng.normal(0, 1.5, size), 80, 99.9), 2)
+    df['Bonus_Frequency'] = np.clip(df['Bonus_Frequency'] + rng.normal(0, 0.05, size), 0, 1)
+    df['Advantage_Play_Potential'] = rng.integers(1, 6, size)
+    df['Volatility'] = rng.integers(1, 6, size)
+    return df
+
+
+def synthetic_sessions(size, num_trips=None, seed=0):
+    """Session rows (as the store keeps them) spread over trips, casinos, games and dates"""
+    rng = np.random.default_rng(seed)
+    num_trips = num_trips or max(1, size // 20)
+    games = synthetic_catalog(min(size, 2000), seed)['Name'].to_numpy()
+    trip_ids = np.sort(rng.integers(1, num_trips + 1, size))
+    trip_casino = np.array(CASINOS)[rng.integers(0, len(CASINOS), num_trips + 1)]
+    dates = np.datetime64('2015-01-01') + rng.integers(0, 3650, size).astype('timedelta64[D]')
+    money_in = np.round(rng.uniform(20, 500, size), 2)
+    money_out = np.round(money_in * rng.gamma(2.0, 0.47, size), 2)
+    return pd.DataFrame({
+        'session_id': np.arange(1, size + 1),
+        'trip_id': trip_ids,
+        'date': np.datetime_as_string(dates, unit='D'),
+        'casino': trip_casino[trip_ids],
+        'game': games[rng.integers(0, len(games), size)],
+        'money_in': money_in,
+        'money_out': money_out,
+        'profit': money_out - money_in,
+        'notes': ""
+    })
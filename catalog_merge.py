@@ -0,0 +1,178 @@
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from game_catalog import (CACHE_DIR, CACHE_VERSION, COLUMN_DEFAULTS, COLUMN_MAP, NUMERIC_COLUMNS, _HAS_PYARROW,
+                          _read_frame, _write_frame, catalog_columns, file_digest, game_key, normalize_catalog,
+                          normalize_column_name)
+
+# Catalog files (or directories of .csv files) to merge, separated like PATH; earlier sources win conflicts
+SOURCES_ENV = "PROFIT_HOPPER_CATALOGS"
+
+# Bump when merging changes so previously built catalogs are rebuilt
+MERGE_VERSION = 1
+
+
+def configured_sources(value=None):
+    """Ordered catalog paths from PROFIT_HOPPER_CATALOGS (or `value`), or None when unset"""
+    value = os.environ.get(SOURCES_ENV, "") if value is None else value
+    paths = []
+    for entry in filter(None, value.split(os.pathsep)):
+        path = Path(entry)
+        paths.extend(sorted(path.glob("*.csv")) if path.is_dir() else [path])
+    return tuple(paths) or None
+
+
+def source_name(path):
+    return Path(path).stem
+
+
+def read_source(source):
+    """One catalog file under the standard column names, with numeric columns parsed.
+
+    The header is resolved against COLUMN_MAP once; header variants that were
+    not picked (e.g. a second name column) are dropped, other columns are kept.
+    """
+    raw = pd.read_csv(source)
+    raw.columns = [normalize_column_name(col) for col in raw.columns]
+    raw = raw.loc[:, ~raw.columns.duplicated()]
+    columns = catalog_columns(raw.columns)
+    aliases = {variant for variants in COLUMN_MAP.values() for variant in variants}
+    renamed = {variant: standard for standard, variant in columns.items()}
+    df = raw[[col for col in raw.columns if col in renamed or col not in aliases]].rename(columns=renamed)
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def name_hashes(names):
+    """64-bit hash of each normalized game name; games with the same key are the same game"""
+    return pd.util.hash_array(game_key(names).to_numpy(dtype=object), categorize=False)
+
+
+def merge_catalogs(frames, names=None, precedence=None):
+    """Merge catalog frames (already under standard column names) into one row per game.
+
+    Rows are matched on the hashed normalized name, so "Buffalo Gold" and
+    "BUFFALO-GOLD" are one game. Each field of a merged game takes the first
+    non-missing value in source order - the order of `frames` - unless
+    `precedence` maps that field to a preferred order of source `names`
+    (unlisted sources follow in their usual order). Rows without a name are
+    kept as they are. Returns (merged frame, number of rows merged away).
+    """
+    names = [str(i) for i in range(len(frames))] if names is None else list(names)
+    combined = pd.concat([frame.assign(_source=i) for i, frame in enumerate(frames)], ignore_index=True)
+    source = combined.pop('_source').to_numpy()
+    if 'game_name' not in combined.columns:
+        return combined, 0
+
+    named = (game_key(combined['game_name']) != "").to_numpy()
+    keys = name_hashes(combined['game_name'])
+    unnamed = combined[~named]
+    combined, source, keys = combined[named], source[named], keys[named]
+
+    # Rows are concatenated in source order, so the default precedence needs no sort
+    grouped = combined.groupby(keys, sort=False)
+    merged = grouped.first()
+    for field, order in (precedence or {}).items():
+        if field not in merged.columns:
+            continue
+        preferred = [names.index(name) for name in order if name in names]
+        rank = np.argsort(preferred + [i for i in range(len(names)) if i not in preferred])
+        ranked = np.argsort(rank[source], kind='stable')
+        merged[field] = combined[field].iloc[ranked].groupby(keys[ranked], sort=False).first()
+
+    duplicates = len(combined) - len(merged)
+    merged = pd.concat([merged.reset_index(drop=True), unnamed], ignore_index=True)
+    return merged, duplicates
+
+
+def catalog_version(digests, precedence=None):
+    """Content version of a merged catalog: its sources' hashes, their order and the precedence"""
+    payload = json.dumps([MERGE_VERSION, CACHE_VERSION, digests, precedence or {}], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _build_paths(version, cache_dir):
+    suffix = "parquet" if _HAS_PYARROW else "npz"
+    base = Path(cache_dir) / f"merged-{version}"
+    return base.with_suffix(f".{suffix}"), base.with_suffix(".json")
+
+
+def build_catalog(sources, precedence=None, cache_dir=CACHE_DIR):
+    """Merge several catalog files into one normalized, versioned catalog.
+
+    The version is a hash of the sources' contents, their order and the field
+    precedence, so an unchanged set of files reuses the catalog built before.
+    Fields no source gives a game take their COLUMN_DEFAULTS value.
+    Returns (catalog, manifest); the manifest records the version, each source
+    with its hash and row count, and how many duplicate rows were merged.
+    """
+    sources = [Path(source) for source in sources]
+    names = [source_name(source) for source in sources]
+    digests = [file_digest(source) for source in sources]
+    version = catalog_version(digests, precedence)
+    data_path, manifest_path = _build_paths(version, cache_dir)
+    if data_path.exists() and manifest_path.exists():
+        return _read_frame(data_path), json.loads(manifest_path.read_text())
+
+    frames = [read_source(source) for source in sources]
+    merged, duplicates = merge_catalogs(frames, names, precedence)
+    # A game may be missing from every source that has a column; it gets the column default
+    df = normalize_catalog(merged)
+    df = df.fillna({col: default for col, default in COLUMN_DEFAULTS.items() if col in df.columns})
+    manifest = {
+        'version': version,
+        'built': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'sources': [{'name': name, 'path': str(source), 'sha256': digest, 'rows': len(frame)}
+                    for name, source, digest, frame in zip(names, sources, digests, frames)],
+        'precedence': precedence or {},
+        'duplicates': duplicates,
+        'games': len(df)
+    }
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    tmp = data_path.with_name(data_path.name + ".tmp")
+    _write_frame(df, tmp)
+    os.replace(tmp, data_path)
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    return df, manifest
+
+
+def parse_precedence(rules):
+    """{'rtp': ['vendor', 'survey']} from command line rules such as "rtp=vendor,survey" """
+    precedence = {}
+    for rule in rules:
+        field, _, order = rule.partition('=')
+        if not order:
+            raise ValueError(f"Expected FIELD=SOURCE[,SOURCE...], got {rule!r}")
+        precedence[normalize_column_name(field.strip())] = [name.strip() for name in order.split(',')]
+    return precedence
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge game catalogs into one versioned catalog.")
+    parser.add_argument('sources', nargs='+', help="catalog CSV files, highest precedence first")
+    parser.add_argument('--prefer', action='append', default=[], metavar="FIELD=SOURCE[,SOURCE...]",
+                        help="source order for one field, by file name without extension")
+    parser.add_argument('--output', help="also write the merged catalog to this CSV file")
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    df, manifest = build_catalog(args.sources, parse_precedence(args.prefer), args.cache_dir)
+    if args.output:
+        df.to_csv(args.output, index=False)
+    print(f"catalog {manifest['version']}: {manifest['games']} games, "
+          f"{manifest['duplicates']} duplicate rows merged")
+    for source in manifest['sources']:
+        print(f"  {source['name']:<30}{source['rows']:>8} rows  {source['sha256'][:12]}")
+
+
+if __name__ == "__main__":
+    main()
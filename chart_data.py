@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+# Most points any chart is sent; longer series are downsampled on the server
+MAX_CHART_POINTS = 2000
+
+
+def lttb_indices(y, threshold, x=None):
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling of (x, y) to `threshold` points.
+
+    The first and last points are always kept; every bucket in between keeps the
+    point forming the largest triangle with the previously kept point and the
+    average of the next bucket, which preserves peaks and the overall shape.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    # Bucket averages are needed for every bucket; compute them in one pass
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    avg_x = np.append(sums_x / sizes, x[-1])
+    avg_y = np.append(sums_y / sizes, y[-1])
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = 0
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((x[previous] - avg_x[bucket + 1]) * (y[start:stop] - y[previous]) -
+                      (x[previous] - x[start:stop]) * (avg_y[bucket + 1] - y[previous]))
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    kept[-1] = n - 1
+    return kept
+
+
+def minmax_indices(y, max_points):
+    """Indices of the minimum and maximum of each bucket (plus both ends), at most `max_points`"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if max_points >= n or max_points < 4:
+        return np.arange(n)
+    num_buckets = (max_points - 2) // 2
+    size = -(-n // num_buckets)
+    padded = np.full(num_buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(num_buckets, size)
+    offsets = np.arange(num_buckets) * size
+    # Every bucket holds at least one real value since size = ceil(n / buckets)
+    valid = np.isfinite(padded).any(axis=1)
+    filled_low = np.where(np.isnan(padded), np.inf, padded)
+    filled_high = np.where(np.isnan(padded), -np.inf, padded)
+    low = offsets + np.argmin(filled_low, axis=1)
+    high = offsets + np.argmax(filled_high, axis=1)
+    kept = np.concatenate(([0, n - 1], low[valid], high[valid]))
+    return np.unique(np.minimum(kept, n - 1))
+
+
+def downsample_frame(df, y, max_points=MAX_CHART_POINTS, method="lttb"):
+    """Rows of `df` to chart, chosen on column `y` (or a list of columns sharing the point budget).
+
+    Other columns follow the same rows. With several columns every one keeps
+    its own extremes, so bands drawn from them keep their envelope.
+    """
+    if len(df) <= max_points:
+        return df
+    columns = [y] if isinstance(y, str) else list(y)
+    budget = max(4, max_points // len(columns))
+    select = minmax_indices if method == "minmax" else lttb_indices
+    rows = np.unique(np.concatenate([select(df[column].to_numpy(dtype=np.float64), budget)
+                                     for column in columns]))
+    return df.iloc[rows]
+
+
+class BankrollSeries:
+    """Running bankroll of one trip, extended in place as sessions are added.
+
+    Only sessions stored since the last refresh are read; a backdated session
+    shifts the running profit of later ones, so it triggers a full reload.
+    The downsampled chart frame is rebuilt only when the series changes.
+    """
+
+    def __init__(self, store, trip_id):
+        self.store = store
+        self.trip_id = trip_id
+        self._reset()
+
+    def _reset(self):
+        self.dates = []
+        self.profit = np.empty(0)
+        self.size = 0
+        self.last_session_id = 0
+        self._frame = None
+
+    def _append(self, points):
+        needed = self.size + len(points)
+        if needed > len(self.profit):
+            # Grow geometrically so appends stay amortized O(1)
+            grown = np.empty(max(needed, 2 * len(self.profit), 64))
+            grown[:self.size] = self.profit[:self.size]
+            self.profit = grown
+        self.profit[self.size:needed] = [point['cumulative_profit'] for point in points]
+        self.dates.extend(point['date'] for point in points)
+        self.size = needed
+        self.last_session_id = max(point['session_id'] for point in points)
+        self._frame = None
+
+    def refresh(self, sessions=None):
+        """Pick up new sessions; `sessions` is the trip's current session count if the caller has it"""
+        if sessions is None:
+            sessions = self.store.trip_totals(self.trip_id)['sessions']
+        if sessions == self.size:
+            return self
+        points = self.store.profit_points(self.trip_id, self.last_session_id)
+        in_order = bool(points) and (not self.dates or points[0]['date'] >= self.dates[-1])
+        if not in_order or self.size + len(points) != sessions:
+            self._reset()
+            points = self.store.profit_points(self.trip_id)
+        if points:
+            self._append(points)
+        return self
+
+    def chart_frame(self, starting_bankroll, max_points=MAX_CHART_POINTS):
+        """Date / Bankroll frame to chart, starting at the bankroll before the first session"""
+        key = (starting_bankroll, max_points, self.size)
+        if self._frame is None or self._frame[0] != key:
+            # The starting point shares the first session's date; an empty trip has no points
+            dates = self.dates[:1] + self.dates
+            bankroll = starting_bankroll + np.concatenate(([0.0], self.profit[:self.size]))[:len(dates)]
+            frame = pd.DataFrame({"Date": dates, "Bankroll": bankroll})
+            self._frame = (key, downsample_frame(frame, "Bankroll", max_points))
+        return self._frame[1]
+
+
+def nice_bin_step(span, max_bins):
+    """Smallest 1/2/5 x 10^k step that covers `span` in at most `max_bins` bins"""
+    if span <= 0:
+        return 1.0
+    raw = span / max_bins
+    magnitude = 10.0 ** np.floor(np.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if factor * magnitude >= raw:
+            return float(factor * magnitude)
+
+
+def profit_histogram(profits, max_bins=20):
+    """Win / loss histogram of session profits as one row per non-empty bar.
+
+    Bars are [k, k + 1) x a nice step, so zero is always an edge and no bar
+    mixes wins (profit >= 0) with losses. Missing (NaN) profits are left out.
+    Returns bin_start, bin_end, Type and Count columns - at most
+    2 * (max_bins + 1) rows however many sessions there are.
+    """
+    profits = np.asarray(profits, dtype=np.float64)
+    profits = profits[np.isfinite(profits)]
+    if not len(profits):
+        return pd.DataFrame(columns=['bin_start', 'bin_end', 'Type', 'Count'])
+    step = nice_bin_step(profits.max() - profits.min(), max_bins)
+    # Bar index of each profit; rounding keeps values such as 1.4 / 0.1 on their own edge
+    index = np.floor(np.round(profits / step, 9)).astype(np.int64)
+    wins = profits >= 0
+    index[~wins] = np.minimum(index[~wins], -1)
+    first = index.min()
+    frames = []
+    for label, mask in (('Win', wins), ('Loss', ~wins)):
+        counts = np.bincount(index[mask] - first, minlength=index.max() - first + 1)
+        used = np.flatnonzero(counts)
+        # Edges are rounded the same way, so 14 x 0.1 reads as 1.4 rather than 1.4000000000000001
+        frames.append(pd.DataFrame({'bin_start': np.round((first + used) * step, 9),
+                                    'bin_end': np.round((first + used + 1) * step, 9),
+                                    'Type': label, 'Count': counts[used]}))
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,153 @@
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from bankroll_sim import simulate_bankroll, strategy_fraction
+from catalog_merge import build_catalog, configured_sources
+from game_cards import add_display_labels
+from game_catalog import compact_catalog, find_local_catalog, load_catalog
+from game_filters import GameFilterIndex
+from kelly_optimizer import catalog_kelly
+from outcome_distribution import even_money_distribution, flat_bet_distribution
+from remote_catalog import RemoteCatalog
+from ruin_solver import solve_progression
+from session_math import MAX_BET_SHARE, STOP_LOSS_SHARE
+from trip_planner import RISK_WEIGHT, SPINS_PER_SESSION, plan_trip
+
+# How long a downloaded catalog is served before it is revalidated with the server
+REMOTE_CATALOG_TTL = 3600
+
+
+def _frozen(value):
+    """Mark cached arrays read-only so one caller cannot change another's result"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            _frozen(item)
+    return value
+
+
+# Catalog
+
+def _catalog_key(source):
+    """Cache key that changes whenever the catalog file (or any merged catalog file) does"""
+    if source is None:
+        source = configured_sources() or find_local_catalog()
+    if source is None:
+        # Remote catalog: the copy on disk, revalidated in the background once per TTL
+        source = remote_catalog().path()
+    if isinstance(source, (list, tuple)):
+        stats = [Path(path).stat() for path in source]
+        return (tuple(str(Path(path).resolve()) for path in source),
+                tuple((stat.st_mtime_ns, stat.st_size) for stat in stats))
+    stat = Path(source).stat()
+    return str(Path(source).resolve()), (stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4)
+def _game_catalog(source, version):
+    # Several sources are merged into one catalog by catalog_merge, in order of precedence
+    df = build_catalog(source)[0] if isinstance(source, tuple) else load_catalog(source)
+    return compact_catalog(add_display_labels(df))
+
+
+@lru_cache(maxsize=4)
+def _filter_index(source, version):
+    return GameFilterIndex(_game_catalog(source, version))
+
+
+_remote_catalog = None
+
+
+def remote_catalog():
+    """The remote catalog, created on first use so importing this module reads no cache state"""
+    global _remote_catalog
+    if _remote_catalog is None:
+        # A changed remote catalog is parsed and indexed on the refresh thread, before it is swapped in
+        _remote_catalog = RemoteCatalog(ttl=REMOTE_CATALOG_TTL, on_update=lambda path: filter_index(path))
+    return _remote_catalog
+
+
+def game_catalog(source=None):
+    """Compact, labelled catalog, shared by every caller and session until the file changes.
+
+    One frame is held per catalog version and handed out without copying;
+    callers must not modify it in place. `source` may be a list of catalog
+    files to merge; by default those in PROFIT_HOPPER_CATALOGS are, if set.
+    """
+    return _game_catalog(*_catalog_key(source))
+
+
+def filter_index(source=None):
+    """GameFilterIndex (filters, name search and scores) over game_catalog(source)"""
+    return _filter_index(*_catalog_key(source))
+
+
+@lru_cache(maxsize=8)
+def _kelly_table(source, version, rtp_adjustment, kelly_multiplier):
+    fractions, growth = catalog_kelly(_game_catalog(source, version), rtp_adjustment, kelly_multiplier)
+    return _frozen({'fraction': fractions, 'log_growth': growth})
+
+
+def kelly_table(rtp_adjustment=0.0, kelly_multiplier=1.0, source=None):
+    """Multi-outcome (fractional) Kelly bet fraction and log growth per bet for every catalog row"""
+    return _kelly_table(*_catalog_key(source), float(rtp_adjustment), float(kelly_multiplier))
+
+
+@lru_cache(maxsize=32)
+def _trip_plan(source, version, bankroll, num_sessions, spins, risk_weight):
+    return plan_trip(_game_catalog(source, version), bankroll, num_sessions, MAX_BET_SHARE, STOP_LOSS_SHARE,
+                     spins=spins, risk_weight=risk_weight)
+
+
+def trip_plan(bankroll, num_sessions, spins=SPINS_PER_SESSION, risk_weight=RISK_WEIGHT, source=None):
+    """Catalog game for each session of a trip, with the session plan and expected outcome of each.
+
+    Uses the same max bet and stop loss shares as session_plan; the frame is
+    shared between callers and must not be modified in place.
+    """
+    return _trip_plan(*_catalog_key(source), float(bankroll), int(num_sessions), int(spins), float(risk_weight))
+
+
+# Simulation
+
+@lru_cache(maxsize=32)
+def bankroll_projection(initial_bankroll, betting_strategy, risk_tolerance, house_edge, num_sessions,
+                        bets_per_session, num_paths, min_bet, win_probability=None, win_payout=None, seed=None):
+    """Monte Carlo projection for Fixed Fraction / Kelly betting; arrays in the result are read-only"""
+    fraction = strategy_fraction(betting_strategy, risk_tolerance, win_probability, win_payout)
+    return _frozen(simulate_bankroll(initial_bankroll, fraction, house_edge, num_sessions, bets_per_session,
+                                     num_paths=num_paths, min_bet=min_bet, seed=seed))
+
+
+@lru_cache(maxsize=32)
+def progression_projection(betting_strategy, initial_bankroll, house_edge, base_bet, table_max, num_sessions,
+                           bets_per_session):
+    """Exact Martingale / D'Alembert solution restarted each session; arrays in the result are read-only"""
+    return _frozen(solve_progression(betting_strategy, initial_bankroll, house_edge, base_bet, table_max,
+                                     num_sessions * bets_per_session, bets_per_session=bets_per_session))
+
+
+@lru_cache(maxsize=32)
+def flat_bet_projection(house_edge, bet, num_sessions, bets_per_session, stop_loss=None, profit_goal=None):
+    """Exact flat-bet session and trip distributions for an even-money game; arrays in the result are read-only"""
+    multipliers, probabilities = even_money_distribution(house_edge)
+    return _frozen(flat_bet_distribution(multipliers, probabilities, bet, bets_per_session, num_sessions,
+                                         stop_loss=stop_loss, profit_goal=profit_goal))
+
+
+_MEMOIZED = (_game_catalog, _filter_index, _kelly_table, _trip_plan, bankroll_projection, progression_projection,
+             flat_bet_projection)
+
+
+def clear_caches():
+    """Drop every memoized result (e.g. after replacing the catalog file in place with the same mtime)"""
+    for func in _MEMOIZED:
+        func.cache_clear()
+
+
+def cache_misses():
+    """Total cache misses of every memoized function so far in this process"""
+    return sum(func.cache_info().misses for func in _MEMOIZED)
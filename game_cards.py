@@ -0,0 +1,93 @@
+import html
+
+import numpy as np
+
+# Descriptive labels shown on the game cards
+ADVANTAGE_LABELS = {
+    5: "⭐️⭐️⭐️⭐️⭐️ Excellent advantage opportunities",
+    4: "⭐️⭐️⭐️⭐️ Strong potential for skilled players",
+    3: "⭐️⭐️⭐️ Moderate advantage play value",
+    2: "⭐️⭐️ Low advantage value",
+    1: "⭐️ Minimal advantage potential"
+}
+
+VOLATILITY_LABELS = {
+    1: "📈 Very low volatility (frequent small wins)",
+    2: "📈 Low volatility",
+    3: "📊 Medium volatility",
+    4: "📉 High volatility",
+    5: "📉 Very high volatility (rare big wins)"
+}
+
+# (minimum bonus frequency, label), checked from the top down
+BONUS_FREQ_LABELS = [
+    (0.4, "🎁🎁🎁 Very frequent bonuses"),
+    (0.3, "🎁🎁 Frequent bonus features"),
+    (0.2, "🎁 Occasional bonuses"),
+    (0.1, "🎁 Rare bonuses")
+]
+BONUS_FREQ_DEFAULT = "🎁 Very rare bonuses"
+
+PAGE_SIZES = [25, 50, 100, 200]
+
+
+def map_advantage(value):
+    return ADVANTAGE_LABELS.get(value, "Unknown")
+
+
+def map_volatility(value):
+    return VOLATILITY_LABELS.get(value, "Unknown")
+
+
+def map_bonus_freq(value):
+    for threshold, label in BONUS_FREQ_LABELS:
+        if value >= threshold:
+            return label
+    return BONUS_FREQ_DEFAULT
+
+
+def add_display_labels(df):
+    """Precompute the card label columns for the whole catalog in one pass"""
+    df = df.copy()
+    # Ratings are truncated to whole stars like int() did for a single card
+    df['advantage_label'] = np.trunc(df['advantage_play_potential']).map(ADVANTAGE_LABELS).fillna("Unknown")
+    df['volatility_label'] = np.trunc(df['volatility']).map(VOLATILITY_LABELS).fillna("Unknown")
+    bonus = df['bonus_frequency'].to_numpy(dtype=np.float64)
+    df['bonus_label'] = np.select(
+        [bonus >= threshold for threshold, _ in BONUS_FREQ_LABELS],
+        [label for _, label in BONUS_FREQ_LABELS],
+        default=BONUS_FREQ_DEFAULT
+    )
+    return df
+
+
+def _text(values):
+    # Label and text columns may be categoricals in the compact catalog
+    return values.astype(str)
+
+
+def _escaped(values):
+    return _text(values).map(html.escape)
+
+
+def render_game_cards(page):
+    """HTML for a page of game cards, built column-wise and sent as one element"""
+    if page.empty:
+        return '<div class="ph-game-grid"></div>'
+    detail = '<div class="ph-game-detail"><strong>{}</strong> '
+    cards = (
+        '<div class="ph-game-card"><div class="ph-game-title">🎰 ' + _escaped(page['game_name']) + '</div>' +
+        detail.format('🗂️ Type:') + _escaped(page['type']) + '</div>' +
+        detail.format('💸 Min Bet:') + page['min_bet'].map('${:,.2f}'.format) + '</div>' +
+        detail.format('🧠 Advantage Play:') + _text(page['advantage_label']) + '</div>' +
+        detail.format('🎲 Volatility:') + _text(page['volatility_label']) + '</div>' +
+        detail.format('🎁 Bonus Frequency:') + _text(page['bonus_label']) + '</div>' +
+        detail.format('🔢 RTP:') + page['rtp'].map('{:.2f}%'.format) + '</div>' +
+        detail.format('💡 Tips:') + _escaped(page['tips']) + '</div>' +
+        '</div>'
+    )
+    return '<div class="ph-game-grid">' + ''.join(cards) + '</div>'
+
+
+def page_count(total, page_size):
+    return max(1, -(-total // page_size))
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Parquet needs pyarrow; fall back to .npz when it is unavailable
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except Exception:
+    _HAS_PYARROW = False
+
+CATALOG_URL = "https://raw.githubusercontent.com/nwt002tech/profit-hopper/main/extended_game_list.csv"
+APP_DIR = Path(__file__).resolve().parent
+LOCAL_CATALOGS = [APP_DIR / "extended_game_list.csv", APP_DIR / "extended_game_list.csv_"]
+CACHE_DIR = APP_DIR / ".catalog_cache"
+
+# Bump when normalization changes so stale caches are rebuilt
+CACHE_VERSION = 1
+
+# Standard column names and the header variants they may appear as
+COLUMN_MAP = {
+    'rtp': ['rtp', 'expected_rtp'],
+    'min_bet': ['min_bet', 'minbet', 'minimum_bet', 'min_bet_amount'],
+    'advantage_play_potential': ['advantage_play_potential', 'app', 'advantage_potential'],
+    'volatility': ['volatility', 'vol'],
+    'bonus_frequency': ['bonus_frequency', 'bonus_freq', 'bonus_rate'],
+    'game_name': ['game_name', 'name', 'title', 'game'],
+    'type': ['type', 'game_type', 'category'],
+    'tips': ['tips', 'tip', 'strategy']
+}
+
+REQUIRED_COLUMNS = ['rtp', 'min_bet']
+NUMERIC_COLUMNS = ['rtp', 'min_bet', 'advantage_play_potential', 'volatility', 'bonus_frequency']
+
+# Compact form: whole-number ratings stored as small ints, text columns with few
+# distinct values as categoricals. Other numbers stay float64: rtp and min_bet are
+# compared against slider values, and float32 scores would reorder near-ties.
+RATING_COLUMNS = ['volatility', 'advantage_play_potential']
+BOOLEAN_COLUMNS = ['has_bonus']
+TRUE_VALUES = {'yes', 'y', 'true', '1'}
+# Text columns with at most this share of distinct values become categoricals
+CATEGORICAL_MAX_RATIO = 0.5
+
+# Defaults for optional columns missing from the source
+COLUMN_DEFAULTS = {
+    'advantage_play_potential': 3,  # Default: moderate
+    'volatility': 3,  # Default: medium
+    'bonus_frequency': 0.2,  # Default: occasional
+    'game_name': "Unknown Game",
+    'type': "Unknown",
+    'tips': "No tips available"
+}
+
+
+def normalize_column_name(name):
+    """Convert column names to consistent lowercase with underscores"""
+    return re.sub(r'\W+', '_', name.lower().strip())
+
+
+def catalog_columns(headers):
+    """Standard column -> the (normalized) header it is read from, resolved once per file"""
+    present = set(headers)
+    columns = {}
+    for standard, variants in COLUMN_MAP.items():
+        found = next((variant for variant in variants if variant in present), None)
+        if found is not None:
+            columns[standard] = found
+    return columns
+
+
+def game_key(names):
+    """Case, spacing and punctuation insensitive key for matching game names"""
+    return names.fillna("").astype(str).str.lower().str.replace(r'\W+', '_', regex=True).str.strip('_')
+
+
+def normalize_catalog(df):
+    """Map raw catalog columns onto the standard names and types used by the app"""
+    df = df.copy()
+    df.columns = [normalize_column_name(col) for col in df.columns]
+
+    # Create final standardized columns
+    for standard, variant in catalog_columns(df.columns).items():
+        df[standard] = df[variant]
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    for col, default in COLUMN_DEFAULTS.items():
+        if col not in df.columns:
+            df[col] = default
+
+    # Drop rows with missing required data
+    return df.dropna(subset=REQUIRED_COLUMNS).reset_index(drop=True)
+
+
+def compact_catalog(df):
+    """Memory-compact copy of a normalized catalog for sharing across sessions.
+
+    Raw columns already copied under a standard name (e.g. 'name' for
+    game_name) are dropped, yes/no flags become booleans, whole-number ratings
+    small ints, and repetitive text columns categoricals.
+    """
+    aliases = [variant for standard, variants in COLUMN_MAP.items() if standard in df.columns
+               for variant in variants if variant != standard and variant in df.columns]
+    df = df.drop(columns=aliases)
+
+    for col in BOOLEAN_COLUMNS:
+        if col in df.columns and not pd.api.types.is_bool_dtype(df[col]):
+            df[col] = df[col].astype(str).str.strip().str.lower().isin(TRUE_VALUES)
+
+    for col in RATING_COLUMNS:
+        if col in df.columns:
+            values = df[col].to_numpy(dtype=np.float64)
+            integral = np.all(np.isfinite(values) & (values == np.round(values)) & (np.abs(values) < 128))
+            df[col] = values.astype(np.int8) if integral else values
+
+    for col in df.columns:
+        values = df[col]
+        if (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)) \
+                and values.nunique() <= CATEGORICAL_MAX_RATIO * len(values):
+            df[col] = values.astype('category')
+    return df
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_local_catalog():
+    """First catalog file shipped alongside the app, if any"""
+    for path in LOCAL_CATALOGS:
+        if path.exists():
+            return path
+    return None
+
+
+def _write_frame(df, path):
+    if _HAS_PYARROW:
+        df.to_parquet(path, index=False)
+        return
+    # Numeric columns are stored as-is; text columns as unicode arrays plus a null mask
+    arrays = {}
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            arrays[f"c{i}"] = values.to_numpy()
+        else:
+            arrays[f"c{i}"] = values.fillna("").astype(str).to_numpy(dtype=str)
+            arrays[f"n{i}"] = values.isna().to_numpy()
+    with open(path, 'wb') as f:
+        np.savez(f, columns=np.array(df.columns, dtype=str), **arrays)
+
+
+def _read_frame(path):
+    if _HAS_PYARROW:
+        return pd.read_parquet(path)
+    with np.load(path, allow_pickle=False) as data:
+        columns = {}
+        for i, col in enumerate(data['columns']):
+            values = data[f"c{i}"]
+            if f"n{i}" in data:
+                values = pd.Series(values, dtype=object).mask(data[f"n{i}"])
+            columns[str(col)] = values
+    return pd.DataFrame(columns)
+
+
+def _cache_paths(source, cache_dir):
+    key = hashlib.sha1(str(Path(source).resolve()).encode()).hexdigest()[:12]
+    suffix = "parquet" if _HAS_PYARROW else "npz"
+    base = Path(cache_dir) / f"{Path(source).stem}-{key}"
+    return base.with_suffix(f".{suffix}"), base.with_suffix(".json")
+
+
+def load_catalog(source=None, cache_dir=CACHE_DIR, url=CATALOG_URL):
+    """Load the normalized catalog, preferring a local file and a columnar cache.
+
+    The cache is reused while the source's mtime and size are unchanged; if
+    they differ, the content hash decides whether the cached frame is still
+    valid. Without a local file the remote CSV is read through RemoteCatalog.
+    """
+    if source is None:
+        source = find_local_catalog()
+    if source is None:
+        # remote_catalog builds on this module, so it is imported only when needed
+        from remote_catalog import RemoteCatalog
+        source = RemoteCatalog(url, cache_dir).path()
+    source = Path(source)
+
+    data_path, meta_path = _cache_paths(source, cache_dir)
+    stat = source.stat()
+    meta = {}
+    if meta_path.exists() and data_path.exists():
+        meta = json.loads(meta_path.read_text())
+        if meta.get('version') == CACHE_VERSION and meta.get('format') == data_path.suffix:
+            if meta.get('mtime_ns') == stat.st_mtime_ns and meta.get('size') == stat.st_size:
+                return _read_frame(data_path)
+        else:
+            meta = {}
+
+    digest = file_digest(source)
+    if meta.get('sha256') == digest:
+        # Touched but unchanged: keep the cached frame and record the new mtime
+        df = _read_frame(data_path)
+    else:
+        df = normalize_catalog(pd.read_csv(source))
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        tmp = data_path.with_name(data_path.name + ".tmp")
+        _write_frame(df, tmp)
+        os.replace(tmp, data_path)
+
+    meta = {
+        'version': CACHE_VERSION,
+        'format': data_path.suffix,
+        'source': str(source),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': digest
+    }
+    meta_path.write_text(json.dumps(meta))
+    return df
@@ -0,0 +1,125 @@
+from functools import lru_cache
+
+import numpy as np
+
+from game_ranking import game_scores
+from name_search import NameSearchIndex
+
+# Filter options offered in the Game Plan tab and the rows each one keeps
+ADVANTAGE_BANDS = {
+    "High (4-5)": lambda v: v >= 4,
+    "Medium (3)": lambda v: v == 3,
+    "Low (1-2)": lambda v: v <= 2
+}
+
+VOLATILITY_BANDS = {
+    "Low (1-2)": lambda v: v <= 2,
+    "Medium (3)": lambda v: v == 3,
+    "High (4-5)": lambda v: v >= 4
+}
+
+
+def bitset_from_mask(mask):
+    """Pack a boolean mask into little-endian uint64 words"""
+    packed = np.packbits(mask, bitorder='little')
+    padded = np.zeros(-(-len(packed) // 8) * 8, dtype=np.uint8)
+    padded[:len(packed)] = packed
+    return padded.view(np.uint64)
+
+
+def bitset_prefix(count, num_words):
+    """Bitset with the first `count` bits set"""
+    words = np.zeros(num_words, dtype=np.uint64)
+    full, rest = divmod(count, 64)
+    words[:full] = np.uint64(0xFFFFFFFFFFFFFFFF)
+    if rest:
+        words[full] = np.uint64((1 << rest) - 1)
+    return words
+
+
+def bitset_to_ids(words):
+    """Positions of the set bits, unpacking only the non-empty words"""
+    nonzero = np.flatnonzero(words)
+    if not len(nonzero):
+        return np.empty(0, dtype=np.int64)
+    bits = np.unpackbits(words[nonzero].view(np.uint8), bitorder='little').reshape(len(nonzero), 64)
+    word_index, bit_index = np.nonzero(bits)
+    return nonzero[word_index] * 64 + bit_index
+
+
+class GameFilterIndex:
+    """Precomputed bitsets answering the Game Plan filters without scanning the catalog.
+
+    Rows are held in min_bet order, so the "max min bet" slider is a bitset prefix
+    found by binary search. Game type, advantage band and volatility band each
+    have one bitset per option, and RTP thresholds are built from a sorted RTP
+    column and memoized per slider value. A query is a handful of word-wise ANDs;
+    a name search probes only the rows returned by the name index.
+    """
+
+    def __init__(self, df):
+        self.size = len(df)
+        self.num_words = -(-self.size // 64)
+
+        min_bet = df['min_bet'].to_numpy(dtype=np.float64)
+        self.order = np.argsort(min_bet, kind='stable')
+        self.sorted_min_bet = min_bet[self.order]
+
+        # RTP order expressed in index positions, NaN excluded
+        rtp = df['rtp'].to_numpy(dtype=np.float64)[self.order]
+        rtp_order = np.argsort(rtp, kind='stable')
+        valid = np.count_nonzero(~np.isnan(rtp))
+        self.rtp_order = rtp_order[:valid]
+        self.sorted_rtp = rtp[self.rtp_order]
+
+        types = df['type'].to_numpy()[self.order]
+        self.type_bits = {value: bitset_from_mask(types == value) for value in dict.fromkeys(types)}
+
+        advantage = df['advantage_play_potential'].to_numpy(dtype=np.float64)[self.order]
+        self.advantage_bits = {label: bitset_from_mask(test(advantage)) for label, test in ADVANTAGE_BANDS.items()}
+
+        volatility = df['volatility'].to_numpy(dtype=np.float64)[self.order]
+        self.volatility_bits = {label: bitset_from_mask(test(volatility)) for label, test in VOLATILITY_BANDS.items()}
+
+        self.rtp_bits = lru_cache(maxsize=64)(self._rtp_bits)
+        self.all_bits = bitset_prefix(self.size, self.num_words)
+
+        # Position of every catalog row within the index order
+        self.rank = np.empty(self.size, dtype=np.int64)
+        self.rank[self.order] = np.arange(self.size)
+        self.names = NameSearchIndex(df['game_name'])
+        # Static part of the recommendation score, by catalog position
+        self.scores = game_scores(df)
+
+    def _rtp_bits(self, min_rtp):
+        start = np.searchsorted(self.sorted_rtp, min_rtp, side='left')
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.rtp_order[start:]] = True
+        return bitset_from_mask(mask)
+
+    def min_bet_bits(self, max_min_bet):
+        """Rows whose min_bet is at most `max_min_bet`"""
+        return bitset_prefix(np.searchsorted(self.sorted_min_bet, max_min_bet, side='right'), self.num_words)
+
+    def query(self, max_min_bet=None, min_rtp=None, game_type="All", advantage="All", volatility="All",
+              name_query=""):
+        """Catalog row positions (ascending) matching every selected filter"""
+        bits = self.all_bits if max_min_bet is None else self.min_bet_bits(max_min_bet)
+        if min_rtp is not None:
+            bits = bits & self.rtp_bits(float(min_rtp))
+        if game_type != "All":
+            type_bits = self.type_bits.get(game_type)
+            if type_bits is None:
+                return np.empty(0, dtype=np.int64)
+            bits = bits & type_bits
+        if advantage != "All":
+            bits = bits & self.advantage_bits[advantage]
+        if volatility != "All":
+            bits = bits & self.volatility_bits[volatility]
+        if name_query:
+            # Check the name matches against the combined bitset instead of unpacking it
+            rows = self.names.search(name_query)
+            at = self.rank[rows]
+            hit = (bits[at >> 6] >> (at & 63).astype(np.uint64)) & np.uint64(1)
+            return rows[hit.astype(bool)]
+        return np.sort(self.order[bitset_to_ids(bits)])
@@ -0,0 +1,45 @@
+import numpy as np
+
+# Weights of the Game Plan recommendation score
+SCORE_WEIGHTS = {
+    'rtp': 0.5,
+    'bonus_frequency': 0.2,
+    'advantage_play_potential': 0.2,
+    'volatility': 0.1  # Applied to (6 - volatility) so calmer games rank higher
+}
+
+
+def game_scores(df):
+    """Recommendation score for every catalog row; it only depends on catalog fields"""
+    return (
+        (df['rtp'].to_numpy(dtype=np.float64) * SCORE_WEIGHTS['rtp']) +
+        (df['bonus_frequency'].to_numpy(dtype=np.float64) * SCORE_WEIGHTS['bonus_frequency']) +
+        (df['advantage_play_potential'].to_numpy(dtype=np.float64) * SCORE_WEIGHTS['advantage_play_potential']) +
+        ((6 - df['volatility'].to_numpy(dtype=np.float64)) * SCORE_WEIGHTS['volatility'])
+    )
+
+
+def top_k(scores, positions, k, offset=0):
+    """Rows of `positions` ranked offset..offset+k-1 by descending score.
+
+    Selects the best offset+k rows with argpartition and only sorts those, so a
+    page costs O(n + (offset+k) log(offset+k)) rather than a full sort. Ties are
+    broken by catalog position and rows with a missing score rank last.
+    """
+    positions = np.asarray(positions)
+    needed = min(offset + k, len(positions))
+    if needed <= 0 or offset >= len(positions):
+        return positions[:0]
+
+    values = scores[positions]
+    values = np.where(np.isnan(values), -np.inf, values)
+    if needed < len(positions):
+        best = np.argpartition(-values, needed - 1)[:needed]
+        # argpartition splits ties at the cutoff arbitrarily; keep them all so ties break by position
+        cutoff = values[best].min()
+        best = np.union1d(best, np.flatnonzero(values == cutoff))
+    else:
+        best = np.arange(len(positions))
+
+    ranked = best[np.lexsort((positions[best], -values[best]))]
+    return positions[ranked[offset:offset + k]]
@@ -0,0 +1,58 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from session_math import STOP_LOSS_SHARE
+
+# Score terms of profit_hopper_modern.py's recommended game order
+VOLATILITY_LEVELS = ["Low", "Medium", "High"]
+# Indexed by volatility code; the last entry covers values outside VOLATILITY_LEVELS
+VOLATILITY_SCORES = np.array([0.3, 0.2, 0.1, 0.1])
+BONUS_SCORE = 0.2
+
+
+class GameRecommender:
+    """Recommended game order for a game_list.csv-style catalog (Name, Type, Volatility, Bonus, Min_Bet, RTP).
+
+    Scores depend only on the catalog, so they are computed once with volatility
+    codes looked up in a score array, and the catalog is kept pre-sorted by score.
+    The playable rows only change when the max bet crosses a catalog min bet, so
+    they are memoized per min-bet breakpoint (the number of games whose min bet
+    is at most the max bet): any bankroll between two breakpoints is a cache hit,
+    and only the vectorized stop loss is computed per call.
+    """
+
+    def __init__(self, games_df):
+        volatility = pd.Index(VOLATILITY_LEVELS).get_indexer(games_df["Volatility"])
+        score = (
+            games_df["RTP"].to_numpy(dtype=np.float64) / 100 +
+            np.where(games_df["Bonus"].to_numpy().astype(bool), BONUS_SCORE, 0.0) +
+            VOLATILITY_SCORES[np.where(volatility < 0, len(VOLATILITY_LEVELS), volatility)]
+        )
+        # Stable descending order with missing scores last, like sort_values
+        order = np.argsort(-np.where(np.isnan(score), -np.inf, score), kind='stable')
+        self.games = games_df.iloc[order].reset_index(drop=True)
+        self.games["Score"] = score[order]
+        self.min_bet = pd.to_numeric(self.games["Min_Bet"], errors='coerce').to_numpy(dtype=np.float64)
+        # Rows by min bet; missing min bets sort last and are never playable
+        self.bet_order = np.argsort(self.min_bet, kind='stable')
+        self.sorted_min_bet = self.min_bet[self.bet_order]
+        self._recommend = lru_cache(maxsize=128)(self._playable)
+
+    def _playable(self, count):
+        # The `count` cheapest games, back in score order
+        rows = np.sort(self.bet_order[:count])
+        return self.games.iloc[rows].reset_index(drop=True), self.min_bet[rows]
+
+    def recommend(self, session_bankroll, max_bet):
+        """Games playable at `max_bet`, best score first, with a per-game stop loss"""
+        count = int(np.searchsorted(self.sorted_min_bet, float(max_bet), side='right'))
+        games, min_bet = self._recommend(count)
+        return games.assign(Stop_Loss=np.maximum(float(session_bankroll) * STOP_LOSS_SHARE, min_bet).round(2))
+
+    def cache_info(self):
+        return self._recommend.cache_info()
+
+    def cache_clear(self):
+        self._recommend.cache_clear()
@@ -0,0 +1,129 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Heuristic outcome model for catalog games, indexed by volatility rating 1-5:
+# share of spins that pay anything, and share of the RTP paid out by bonus rounds
+HIT_FREQUENCY = np.array([0.45, 0.38, 0.30, 0.22, 0.15])
+BONUS_RTP_SHARE = np.array([0.15, 0.25, 0.35, 0.45, 0.55])
+# Catalog bonus_frequency is a relative rating; this turns it into a per-spin trigger chance
+BONUS_TRIGGER_SCALE = 0.02
+
+NUM_CANDIDATES = 65
+REFINEMENTS = 5
+# Upper bound on games x candidates x outcomes evaluated at once
+BLOCK_ELEMENTS = 1 << 22
+
+
+def catalog_distributions(rtp, volatility, bonus_frequency):
+    """Discrete return distributions (multipliers of the bet, probabilities) for catalog games.
+
+    Each game gets three outcomes - lose the bet, a regular line hit and a bonus
+    round - whose probabilities come from the volatility rating and the bonus
+    frequency and whose payouts are set so the expected return equals the RTP.
+    Returns two (games, 3) arrays.
+    """
+    rtp = np.asarray(rtp, dtype=np.float64) / 100
+    level = np.clip(np.rint(np.asarray(volatility, dtype=np.float64)), 1, 5).astype(np.int64) - 1
+    hit = HIT_FREQUENCY[level]
+    bonus = np.clip(np.asarray(bonus_frequency, dtype=np.float64) * BONUS_TRIGGER_SCALE, 1e-4, hit / 2)
+    line = hit - bonus
+    share = BONUS_RTP_SHARE[level]
+
+    multipliers = np.stack([np.zeros_like(rtp), rtp * (1 - share) / line, rtp * share / bonus], axis=-1)
+    probabilities = np.stack([1 - hit, line, bonus], axis=-1)
+    return multipliers, probabilities
+
+
+def paytable_distribution(paytable):
+    """Distribution from a paytable of {multiplier: probability}; leftover probability loses the bet"""
+    multipliers = np.array([0.0] + [float(m) for m in paytable], dtype=np.float64)
+    probabilities = np.array([0.0] + [float(p) for p in paytable.values()], dtype=np.float64)
+    total = probabilities.sum()
+    if total > 1 + 1e-9 or (probabilities < 0).any():
+        raise ValueError("Paytable probabilities must be non-negative and sum to at most 1")
+    probabilities[0] = max(0.0, 1 - total)
+    return multipliers, probabilities
+
+
+def log_growth(fractions, multipliers, probabilities):
+    """Expected log growth per bet, E[log(1 + f (M - 1))], for each game and candidate fraction.
+
+    `fractions` is (games, candidates); the distributions are (games, outcomes).
+    """
+    net = (multipliers - 1)[:, None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.log1p(fractions[:, :, None] * net)
+    growth = np.where(probabilities[:, None, :] > 0, growth, 0.0)
+    return np.einsum('gco,go->gc', growth, probabilities)
+
+
+def _max_fraction(multipliers, probabilities):
+    # A fraction at or above 1 / worst loss can wipe the bankroll out on that outcome
+    worst = np.min(np.where(probabilities > 0, multipliers, np.inf), axis=1)
+    return np.where(worst < 1, 1 / np.maximum(1 - worst, 1e-12), 1.0) * (1 - 1e-9)
+
+
+def kelly_fractions(multipliers, probabilities, num_candidates=NUM_CANDIDATES, refinements=REFINEMENTS):
+    """Growth-optimal bet fraction and its expected log growth for every game.
+
+    Log growth is evaluated for `num_candidates` fractions per game at once;
+    each refinement pass re-grids the interval around the best candidate, so
+    the resolution shrinks by a factor of ~num_candidates/2 per pass. Games with
+    a non-positive expected return get a fraction of 0.
+    """
+    multipliers = np.atleast_2d(np.asarray(multipliers, dtype=np.float64))
+    probabilities = np.atleast_2d(np.asarray(probabilities, dtype=np.float64))
+    num_games, num_outcomes = multipliers.shape
+    fractions = np.zeros(num_games)
+    growth = np.zeros(num_games)
+
+    positive = np.flatnonzero((multipliers * probabilities).sum(axis=1) > 1)
+    block = max(1, BLOCK_ELEMENTS // (num_candidates * num_outcomes))
+    steps = np.linspace(0.0, 1.0, num_candidates)
+    for start in range(0, len(positive), block):
+        games = positive[start:start + block]
+        m, p = multipliers[games], probabilities[games]
+        low = np.zeros(len(games))
+        high = _max_fraction(m, p)
+        for _ in range(refinements + 1):
+            candidates = low[:, None] + (high - low)[:, None] * steps
+            values = log_growth(candidates, m, p)
+            best = np.argmax(values, axis=1)
+            rows = np.arange(len(games))
+            spacing = (high - low) / (num_candidates - 1)
+            low = np.maximum(candidates[rows, best] - spacing, 0.0)
+            high = np.minimum(candidates[rows, best] + spacing, high)
+        fractions[games] = candidates[rows, best]
+        growth[games] = values[rows, best]
+    return fractions, growth
+
+
+@lru_cache(maxsize=1024)
+def game_kelly(rtp, volatility, bonus_frequency):
+    """(fraction, log growth per bet) for one catalog game, memoized by its fields"""
+    multipliers, probabilities = catalog_distributions([rtp], [volatility], [bonus_frequency])
+    fractions, growth = kelly_fractions(multipliers, probabilities)
+    return float(fractions[0]), float(growth[0])
+
+
+def catalog_kelly(df, rtp_adjustment=0.0, kelly_multiplier=1.0):
+    """Bet fraction and its log growth per bet for every catalog row in one batch.
+
+    `rtp_adjustment` (percentage points) models advantage-play situations such as
+    high progressive meters that lift the effective RTP above the listed one;
+    `kelly_multiplier` scales the optimum for fractional Kelly betting.
+    """
+    multipliers, probabilities = catalog_distributions(
+        df['rtp'].to_numpy(dtype=np.float64) + rtp_adjustment,
+        df['volatility'].to_numpy(dtype=np.float64),
+        df['bonus_frequency'].to_numpy(dtype=np.float64)
+    )
+    fractions, growth = kelly_fractions(multipliers, probabilities)
+    if kelly_multiplier != 1.0:
+        fractions = fractions * kelly_multiplier
+        growth = np.zeros_like(growth)
+        for start in range(0, len(fractions), BLOCK_ELEMENTS // multipliers.shape[1]):
+            rows = slice(start, start + BLOCK_ELEMENTS // multipliers.shape[1])
+            growth[rows] = log_growth(fractions[rows, None], multipliers[rows], probabilities[rows])[:, 0]
+    return fractions, growth
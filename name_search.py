@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# Grams are indexed at lengths 1-3; longer queries intersect their trigrams
+MAX_GRAM = 3
+# Code points fit in 21 bits, so three of them pack into one uint64 key
+_BITS = 21
+
+
+def _gram_keys(codes, length):
+    """Packed keys for every `length`-gram starting at each position of `codes`"""
+    usable = len(codes) - length + 1
+    if usable <= 0:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=bool)
+    keys = np.zeros(usable, dtype=np.uint64)
+    valid = np.ones(usable, dtype=bool)
+    for offset in range(length):
+        chunk = codes[offset:offset + usable]
+        keys = (keys << np.uint64(_BITS)) | chunk
+        # Grams may not span the separator between two names
+        valid &= chunk != 0
+    return keys, valid
+
+
+def _encode(text):
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+
+
+class NameSearchIndex:
+    """Case-insensitive substring and prefix search over game names.
+
+    Built once per catalog version from the distinct lowercased names. Posting
+    lists for every 1-, 2- and 3-gram are built in a single vectorized pass, and
+    a sorted copy of the names answers prefix queries by binary search. Queries
+    only touch the posting lists of their own grams. They return catalog row
+    positions in ascending order.
+    """
+
+    def __init__(self, names):
+        lowered = pd.Series(names).fillna("").astype(str).str.lower()
+        codes, uniques = pd.factorize(lowered, sort=False)
+        self.names = np.asarray(uniques, dtype=str)
+        self.size = len(codes)
+
+        # Rows of each distinct name, grouped CSR-style
+        self.row_order = np.argsort(codes, kind='stable')
+        self.row_starts = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(self.names)))])
+
+        # All names in one code point array, separated by zeros
+        lengths = np.fromiter((len(name) for name in self.names), dtype=np.int64, count=len(self.names))
+        text = _encode("\x00".join(self.names))
+        owner = np.repeat(np.arange(len(self.names)), lengths + 1)[:len(text)]
+
+        self.postings = {}
+        for length in range(1, MAX_GRAM + 1):
+            keys, valid = _gram_keys(text, length)
+            keys, ids = keys[valid], owner[:len(valid)][valid]
+            # Names are laid out in id order, so a stable sort by key orders by (key, name);
+            # then drop repeats of a gram within one name
+            order = np.argsort(keys, kind='stable')
+            keys, ids = keys[order], ids[order]
+            keep = np.ones(len(keys), dtype=bool)
+            keep[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+            keys, ids = keys[keep], ids[keep]
+            distinct, starts = np.unique(keys, return_index=True)
+            self.postings[length] = (distinct, np.append(starts, len(keys)), ids)
+
+        self.sorted_names = np.sort(self.names)
+        self.sorted_ids = np.argsort(self.names)
+
+    def _posting(self, gram):
+        distinct, starts, ids = self.postings[len(gram)]
+        key = _gram_keys(_encode(gram), len(gram))[0][0]
+        at = np.searchsorted(distinct, key)
+        if at == len(distinct) or distinct[at] != key:
+            return ids[:0]
+        return ids[starts[at]:starts[at + 1]]
+
+    def _rows(self, name_ids):
+        """Catalog row positions for a set of distinct-name ids"""
+        starts = self.row_starts[name_ids]
+        counts = self.row_starts[name_ids + 1] - starts
+        if not counts.sum():
+            return np.empty(0, dtype=np.int64)
+        # Gather each id's run of rows without a Python loop
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+        return np.sort(self.row_order[np.arange(counts.sum()) + offsets])
+
+    def match_names(self, query, prefix=False):
+        """Ids of the distinct names containing (or starting with) `query`"""
+        query = query.lower()
+        if not query:
+            return np.arange(len(self.names))
+        if prefix:
+            lo = np.searchsorted(self.sorted_names, query, side='left')
+            hi = np.searchsorted(self.sorted_names, query + "\U0010ffff", side='left')
+            return np.sort(self.sorted_ids[lo:hi])
+        if len(query) <= MAX_GRAM:
+            return self._posting(query)
+
+        # Intersect trigram postings, shortest first, then confirm the full substring
+        grams = {query[i:i + MAX_GRAM] for i in range(len(query) - MAX_GRAM + 1)}
+        postings = sorted((self._posting(gram) for gram in grams), key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        if not len(candidates):
+            return candidates
+        found = pd.Series(self.names[candidates]).str.contains(query, regex=False).to_numpy()
+        return candidates[found]
+
+    def search(self, query, prefix=False):
+        """Catalog row positions whose name contains (or starts with) `query`"""
+        return self._rows(self.match_names(query, prefix=prefix))
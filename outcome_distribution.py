@@ -0,0 +1,148 @@
+import numpy as np
+
+from bankroll_sim import DEFAULT_PERCENTILES, win_probability_for_edge
+
+# Grid points per bet when payouts are not whole multiples of the bet
+GRID_RESOLUTION = 4
+# Probabilities below this are FFT round-off, not outcomes
+MASS_EPSILON = 1e-15
+
+
+def even_money_distribution(house_edge):
+    """(multipliers, probabilities) of one even-money bet at the given house edge"""
+    p = win_probability_for_edge(house_edge)
+    return np.array([0.0, 2.0]), np.array([1 - p, p])
+
+
+def bet_outcomes(multipliers, probabilities, bet, step):
+    """Net result of one bet as a pmf over a grid of `step` dollars.
+
+    Returns (low, pmf) with pmf[i] the probability of a result of (low + i) x
+    step. A result between two grid points is split between them in
+    proportion to its distance, which keeps the mean exact; results on the grid
+    (e.g. even-money bets with step = bet) are exact.
+    """
+    net = (np.asarray(multipliers, dtype=np.float64) - 1) * bet / step
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    floor = np.floor(np.round(net, 9))
+    upper = np.round(net - floor, 9)
+    # The grid always spans a result of zero
+    low = min(int(floor.min()), 0)
+    pmf = np.zeros(max(int(np.ceil(np.round(net.max(), 9))), 0) - low + 1)
+    np.add.at(pmf, (floor - low).astype(np.int64), probabilities * (1 - upper))
+    split = upper > 0
+    np.add.at(pmf, (floor[split] - low + 1).astype(np.int64), probabilities[split] * upper[split])
+    return low, pmf
+
+
+def _fft_size(n):
+    return 1 << max(0, int(n - 1).bit_length())
+
+
+def _clean(pmf):
+    pmf = np.where(pmf > MASS_EPSILON, pmf, 0.0)
+    return pmf / pmf.sum()
+
+
+def convolve_power(low, pmf, n):
+    """Distribution of the sum of `n` independent draws from (low, pmf), by one FFT power"""
+    if n == 1:
+        return low, pmf
+    size = n * (len(pmf) - 1) + 1
+    fft_size = _fft_size(size)
+    total = np.fft.irfft(np.fft.rfft(pmf, fft_size) ** n, fft_size)[:size]
+    return n * low, _clean(total)
+
+
+def session_with_limits(low, pmf, num_bets, stop_units=None, goal_units=None):
+    """Session result pmf when play stops once down `stop_units` or up `goal_units` grid steps.
+
+    The mass still in play is advanced one bet at a time - one FFT convolution
+    with the bet's pmf per bet - and whatever lands on or past a limit is set
+    aside where it landed, so a final result can overshoot the limit by part of
+    a bet. Returns (low, pmf, stop_probability, goal_probability).
+    """
+    width = len(pmf) - 1
+    # Results in play lie strictly between the limits; a missing limit is one no session can reach
+    floor = -stop_units if stop_units is not None else num_bets * low - 1
+    ceiling = goal_units if goal_units is not None else num_bets * (low + width) + 1
+    band_low, band_size = floor + 1, ceiling - floor - 1
+    final = np.zeros(band_size + width)
+
+    fft_size = _fft_size(band_size + width)
+    kernel = np.fft.rfft(pmf, fft_size)
+    in_play = np.zeros(band_size)
+    in_play[-band_low] = 1.0
+    stopped = reached = 0.0
+    for _ in range(num_bets):
+        landed = np.fft.irfft(np.fft.rfft(in_play, fft_size) * kernel, fft_size)[:band_size + width]
+        landed = np.where(landed > MASS_EPSILON, landed, 0.0)
+        # landed[i] is a result of band_low + low + i; the band starts `-low` entries in
+        below, above = -low, -low + band_size
+        stopped += landed[:below].sum()
+        reached += landed[above:].sum()
+        final[:below] += landed[:below]
+        final[above:] += landed[above:]
+        in_play = landed[below:above]
+    final[-low:-low + band_size] += in_play
+    return band_low + low, final / final.sum(), stopped, reached
+
+
+def quantiles(values, pmf, percentiles=DEFAULT_PERCENTILES):
+    """Smallest value whose cumulative probability reaches each percentile"""
+    cdf = np.cumsum(pmf)
+    ranks = np.asarray(percentiles, dtype=np.float64) / 100 * cdf[-1] - 1e-12
+    return {q: float(values[min(np.searchsorted(cdf, rank), len(values) - 1)])
+            for q, rank in zip(percentiles, ranks)}
+
+
+def flat_bet_distribution(multipliers, probabilities, bet, num_bets, num_sessions=1, stop_loss=None,
+                          profit_goal=None, resolution=GRID_RESOLUTION, percentiles=DEFAULT_PERCENTILES):
+    """Exact session and trip result distributions for flat betting, with no sampling.
+
+    Every bet stakes `bet` on a game whose return per dollar is `multipliers`
+    with `probabilities` (e.g. even_money_distribution or a row of
+    kelly_optimizer.catalog_distributions). A session is `num_bets` bets, or
+    fewer once it is down `stop_loss` or up `profit_goal` dollars; a trip is
+    `num_sessions` independent sessions. Results are on a grid of bet /
+    `resolution` dollars, or of the bet itself when every payout is a whole
+    number of bets. Without limits a session is one bet's distribution
+    convolved `num_bets` times, and a trip is the session's convolved
+    `num_sessions` times; each is a single FFT power.
+    """
+    if bet <= 0 or num_bets < 1 or num_sessions < 1:
+        raise ValueError("bet, num_bets and num_sessions must be positive")
+    if (stop_loss is not None and stop_loss <= 0) or (profit_goal is not None and profit_goal <= 0):
+        raise ValueError("stop_loss and profit_goal must be positive")
+    multipliers = np.asarray(multipliers, dtype=np.float64)
+    whole = np.allclose(multipliers, np.round(multipliers))
+    step = bet if whole else bet / resolution
+    low, pmf = bet_outcomes(multipliers, probabilities, bet, step)
+
+    if stop_loss is None and profit_goal is None:
+        session_low, session_pmf = convolve_power(low, pmf, num_bets)
+        stopped = reached = 0.0
+    else:
+        stop_units = max(1, int(np.floor(stop_loss / step + 1e-9))) if stop_loss is not None else None
+        goal_units = int(np.ceil(profit_goal / step - 1e-9)) if profit_goal is not None else None
+        session_low, session_pmf, stopped, reached = session_with_limits(low, pmf, num_bets, stop_units,
+                                                                         goal_units)
+    trip_low, trip_pmf = convolve_power(session_low, session_pmf, num_sessions)
+
+    session_values = (session_low + np.arange(len(session_pmf))) * step
+    trip_values = (trip_low + np.arange(len(trip_pmf))) * step
+    session_support = np.flatnonzero(session_pmf)
+    trip_support = np.flatnonzero(trip_pmf)
+    return {
+        "session_values": session_values[session_support],
+        "session_probabilities": session_pmf[session_support],
+        "trip_values": trip_values[trip_support],
+        "trip_probabilities": trip_pmf[trip_support],
+        "session_quantiles": quantiles(session_values, session_pmf, percentiles),
+        "trip_quantiles": quantiles(trip_values, trip_pmf, percentiles),
+        "expected_session": float(session_values @ session_pmf),
+        "expected_trip": float(trip_values @ trip_pmf),
+        "stop_probability": float(stopped),
+        "goal_probability": float(reached),
+        "trip_profit_probability": float(trip_pmf[trip_values > 0].sum())
+    }
@@ -2,6 +2,9 @@
 import streamlit as st
 import pandas as pd
 
+from session_import import empty_report, read_session_chunks, tracker_entries
+from session_math import tracker_totals, unit_plan
+
 st.set_page_config(page_title="Profit Hopper", layout="centered")
 
 st.title("🎰 Profit Hopper - Casino Bankroll Manager")
@@ -15,9 +18,10 @@ with st.sidebar:
     profit_goal_percent = st.slider("Profit Goal (%):", 5, 100, 20)
 
 # Calculations
-session_unit = bankroll / sessions
-max_bet = session_unit / 40
-profit_goal = bankroll * (1 + profit_goal_percent / 100)
+plan = unit_plan(bankroll, sessions, "Low", profit_goal_percent)
+session_unit = plan['session_unit']
+max_bet = plan['max_bet']
+profit_goal = plan['profit_goal']
 
 st.subheader("📊 Strategy Overview")
 col1, col2 = st.columns(2)
@@ -55,6 +59,21 @@ with st.form("session_form"):
         })
         st.success("Session logged!")
 
+# Bulk import of past sessions, e.g. an exported session log or a spreadsheet
+with st.expander("📥 Import Past Sessions (CSV)"):
+    import_file = st.file_uploader("Session CSV", type=["csv"], key="session_import_file")
+    if import_file is not None and st.button("Import Sessions"):
+        report = empty_report()
+        try:
+            for chunk in read_session_chunks(import_file, report=report, require_date=False):
+                st.session_state.tracker.extend(tracker_entries(chunk))
+        except ValueError as e:
+            st.error(f"Could not import {import_file.name}: {e}")
+        else:
+            rejected = sum(report['rejected'].values())
+            st.success(f"Imported {report['rows'] - rejected:,} of {report['rows']:,} rows"
+                       + (f" ({rejected:,} invalid rows skipped)" if rejected else ""))
+
 # Display session tracker
 if st.session_state.tracker:
     st.markdown("### 🧾 Session Log")
@@ -62,9 +81,8 @@ if st.session_state.tracker:
     df.index += 1
     st.dataframe(df, use_container_width=True)
 
-    total_in = df["Amount In"].sum()
-    total_out = df["Amount Out"].sum()
-    total_net = total_out - total_in
+    totals = tracker_totals(df["Amount In"], df["Amount Out"])
+    total_in, total_out, total_net = totals['total_in'], totals['total_out'], totals['net']
 
     st.markdown("### 📈 Summary")
     col1, col2, col3 = st.columns(3)
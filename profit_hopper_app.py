@@ -1,131 +1,69 @@
 import streamlit as st
 import pandas as pd
-import re
 import numpy as np
 from datetime import datetime
 import altair as alt
-import base64
+
+from chart_data import BankrollSeries, profit_histogram
+from compute_core import cache_misses, filter_index, game_catalog, trip_plan
+from game_cards import PAGE_SIZES, page_count, render_game_cards
+from game_ranking import top_k
+from rerun_profiler import RerunProfiler, note_miss, profiled
+from session_export import EXPORT_FORMATS, export_file_name, export_frame, export_mime, export_sessions
+from session_import import import_sessions
+from session_math import session_plan, trip_summary
+from session_store import SessionStore
+from trip_history import GROUPINGS, TripHistory, best_and_worst_games, roi_trend, summarize
+from trip_planner import RISK_WEIGHT, SPINS_PER_SESSION, plan_stop_risk
 
 # Configure page for mobile
 st.set_page_config(layout="wide", initial_sidebar_state="expanded", page_title="Profit Hopper Casino Manager")
 
-# Define descriptive mapping functions
-def map_advantage(value):
-    mapping = {
-        5: "⭐️⭐️⭐️⭐️⭐️ Excellent advantage opportunities",
-        4: "⭐️⭐️⭐️⭐️ Strong potential for skilled players",
-        3: "⭐️⭐️⭐️ Moderate advantage play value",
-        2: "⭐️⭐️ Low advantage value",
-        1: "⭐️ Minimal advantage potential"
-    }
-    return mapping.get(value, "Unknown")
-
-def map_volatility(value):
-    mapping = {
-        1: "📈 Very low volatility (frequent small wins)",
-        2: "📈 Low volatility",
-        3: "📊 Medium volatility",
-        4: "📉 High volatility",
-        5: "📉 Very high volatility (rare big wins)"
-    }
-    return mapping.get(value, "Unknown")
-
-def map_bonus_freq(value):
-    if value >= 0.4:
-        return "🎁🎁🎁 Very frequent bonuses"
-    elif value >= 0.3:
-        return "🎁🎁 Frequent bonus features"
-    elif value >= 0.2:
-        return "🎁 Occasional bonuses"
-    elif value >= 0.1:
-        return "🎁 Rare bonuses"
-    else:
-        return "🎁 Very rare bonuses"
-
-# Normalize column names
-def normalize_column_name(name):
-    """Convert column names to consistent lowercase with underscores"""
-    return re.sub(r'\W+', '_', name.lower().strip())
+# Cached compute core calls are timed, with their cache hit or miss, for the rerun timings panel
+trip_plan = profiled("trip_plan", cache_misses)(trip_plan)
 
-# Load game data with caching
-@st.cache_data(ttl=3600)  # Refresh every hour
+# Catalog and filter index are memoized by the compute core until the catalog file changes
+@profiled("game_catalog", cache_misses)
 def load_game_data():
     try:
-        url = "https://raw.githubusercontent.com/nwt002tech/profit-hopper/main/extended_game_list.csv"
-        df = pd.read_csv(url)
-        
-        # Normalize column names
-        df.columns = [normalize_column_name(col) for col in df.columns]
-        
-        # Create standard column names
-        col_map = {
-            'rtp': ['rtp', 'expected_rtp'],
-            'min_bet': ['min_bet', 'minbet', 'minimum_bet', 'min_bet_amount'],
-            'advantage_play_potential': ['advantage_play_potential', 'app', 'advantage_potential'],
-            'volatility': ['volatility', 'vol'],
-            'bonus_frequency': ['bonus_frequency', 'bonus_freq', 'bonus_rate'],
-            'game_name': ['game_name', 'name', 'title', 'game'],
-            'type': ['type', 'game_type', 'category'],
-            'tips': ['tips', 'tip', 'strategy']
-        }
-        
-        # Create final standardized columns
-        for standard, variants in col_map.items():
-            for variant in variants:
-                if variant in df.columns:
-                    df[standard] = df[variant]
-                    break
-        
-        # Check required columns
-        required_cols = ['rtp', 'min_bet']
-        missing = [col for col in required_cols if col not in df.columns]
-        if missing:
-            st.error(f"Missing required columns: {', '.join(missing)}")
-            return pd.DataFrame()
-        
-        # Convert columns to numeric
-        numeric_cols = ['rtp', 'min_bet', 'advantage_play_potential', 'volatility', 'bonus_frequency']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Set defaults for optional columns
-        if 'advantage_play_potential' not in df.columns:
-            df['advantage_play_potential'] = 3  # Default: moderate
-        if 'volatility' not in df.columns:
-            df['volatility'] = 3  # Default: medium
-        if 'bonus_frequency' not in df.columns:
-            df['bonus_frequency'] = 0.2  # Default: occasional
-            
-        # Set defaults for display columns
-        if 'game_name' not in df.columns:
-            df['game_name'] = "Unknown Game"
-        if 'type' not in df.columns:
-            df['type'] = "Unknown"
-        if 'tips' not in df.columns:
-            df['tips'] = "No tips available"
-        
-        # Drop rows with missing required data
-        return df.dropna(subset=['rtp', 'min_bet'])
+        return game_catalog()
     except Exception as e:
         st.error(f"Error loading game data: {str(e)}")
         return pd.DataFrame()
 
-# CSV download helper
-def get_csv_download_link(df, filename):
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    return f'<a href="data:file/csv;base64,{b64}" download="{filename}">Download CSV</a>'
+@profiled("filter_index", cache_misses)
+def load_filter_index():
+    return filter_index()
+
+# Histogram bars are binned here, once per trip version, instead of in the browser
+@profiled("profit_histogram")
+@st.cache_data(max_entries=32)
+def profit_histogram_data(trip_id, trip_version, _sessions):
+    note_miss()
+    return profit_histogram([s['profit'] for s in _sessions])
+
+# Session store is opened once and shared by every browser session
+@profiled("session_store")
+@st.cache_resource
+def get_session_store():
+    note_miss()
+    return SessionStore()
+
+# Columnar history of all trips, kept in sync with the session store
+@profiled("trip_history")
+@st.cache_resource
+def get_trip_history():
+    note_miss()
+    return TripHistory(get_session_store())
 
 # Main app function
 def main():
+    profiler = RerunProfiler()
+    
     # Initialize session state for tracker
-    if 'session_log' not in st.session_state:
-        st.session_state.session_log = []
-    if 'current_trip_id' not in st.session_state:
-        st.session_state.current_trip_id = 1
+    store = get_session_store()
     if 'casino_list' not in st.session_state:
-        st.session_state.casino_list = sorted([
+        st.session_state.casino_list = sorted({
             "L'auberge Lake Charles",
             "Golden Nugget Lake Charles",
             "Caesar's Horseshoe Lake Charles",
@@ -133,13 +71,22 @@ def main():
             "Island View",
             "Paragon Marksville",
             "Coushatta"
-        ])
-    if 'trip_settings' not in st.session_state:
+        } | {trip['casino'] for trip in store.trips() if trip['casino']})
+    if 'current_trip_id' not in st.session_state:
+        # Resume the most recent trip so sessions survive a browser reload
+        trip = store.latest_trip()
+        if trip is None:
+            default_casino = st.session_state.casino_list[0] if st.session_state.casino_list else ""
+            trip = store.get_trip(store.start_trip(default_casino, 1000.0, 10))
+        st.session_state.current_trip_id = trip['trip_id']
         st.session_state.trip_settings = {
-            'casino': st.session_state.casino_list[0] if st.session_state.casino_list else "",
-            'starting_bankroll': 1000.0,
-            'num_sessions': 10
+            'casino': trip['casino'],
+            'starting_bankroll': trip['starting_bankroll'],
+            'num_sessions': trip['num_sessions']
         }
+        st.session_state.saved_trip_settings = dict(st.session_state.trip_settings)
+    
+    profiler.checkpoint("setup")
     
     # CSS for sticky header and mobile optimization
     st.markdown("""
@@ -322,24 +269,29 @@ def main():
                                       key='session_count_input')
         st.session_state.trip_settings['num_sessions'] = num_sessions
         
+        # Persist settings changes to the current trip
+        if st.session_state.trip_settings != st.session_state.saved_trip_settings:
+            store.save_trip(st.session_state.current_trip_id, **st.session_state.trip_settings)
+            st.session_state.saved_trip_settings = dict(st.session_state.trip_settings)
+        
         # New trip button
         if st.button("Start New Trip"):
-            st.session_state.current_trip_id += 1
-            st.session_state.session_log = []
+            st.session_state.current_trip_id = store.start_trip(**st.session_state.trip_settings)
             st.success(f"Started new trip! Trip ID: {st.session_state.current_trip_id}")
         
         st.markdown("---")
         
         # Trip summary
         st.subheader("Trip Summary")
-        trip_sessions = [s for s in st.session_state.session_log if s['trip_id'] == st.session_state.current_trip_id]
-        trip_profit = sum(s['profit'] for s in trip_sessions)
+        current_trip_sessions = store.trip_sessions(st.session_state.current_trip_id)
+        trip_totals = store.trip_totals(st.session_state.current_trip_id)
+        trip_profit = trip_totals['total_profit']
         current_bankroll = st.session_state.trip_settings['starting_bankroll'] + trip_profit
         
         st.markdown(f"**Casino:** {st.session_state.trip_settings['casino']}")
         st.markdown(f"**Starting Bankroll:** ${st.session_state.trip_settings['starting_bankroll']:,.2f}")
         st.markdown(f"**Current Bankroll:** ${current_bankroll:,.2f}")
-        st.markdown(f"**Sessions Completed:** {len(trip_sessions)}/{st.session_state.trip_settings['num_sessions']}")
+        st.markdown(f"**Sessions Completed:** {trip_totals['sessions']}/{st.session_state.trip_settings['num_sessions']}")
         
         st.markdown("---")
         st.warning("""
@@ -350,15 +302,13 @@ def main():
         - Gambling addiction help: 1-800-522-4700
         """)
     
-    # Calculations
-    session_bankroll = st.session_state.trip_settings['starting_bankroll'] / st.session_state.trip_settings['num_sessions']
-    max_bet = session_bankroll * 0.25
-    stop_loss = session_bankroll * 0.6
+    profiler.checkpoint("sidebar")
     
-    # Current trip sessions
-    current_trip_sessions = [s for s in st.session_state.session_log if s['trip_id'] == st.session_state.current_trip_id]
-    trip_profit = sum(s['profit'] for s in current_trip_sessions)
-    current_bankroll = st.session_state.trip_settings['starting_bankroll'] + trip_profit
+    # Calculations
+    plan = session_plan(st.session_state.trip_settings['starting_bankroll'], st.session_state.trip_settings['num_sessions'])
+    session_bankroll = plan['session_bankroll']
+    max_bet = plan['max_bet']
+    stop_loss = plan['stop_loss']
     
     # Sticky header
     st.markdown(f"""
@@ -381,6 +331,7 @@ def main():
         
         # Load and filter games
         game_df = load_game_data()
+        profiler.checkpoint("game_plan.catalog")
         
         if not game_df.empty:
             # Game filters
@@ -405,92 +356,86 @@ def main():
                                                ["All", "Low (1-2)", "Medium (3)", "High (4-5)"])
                 search_query = st.text_input("Search Game Name")
             
-            # Apply filters
-            filtered_games = game_df[
-                (game_df['min_bet'] <= max_min_bet) &
-                (game_df['rtp'] >= min_rtp) &
-                (game_df['rtp'].notna())
-            ]
-            
-            # Apply game type filter
-            if game_type != "All":
-                filtered_games = filtered_games[filtered_games['type'] == game_type]
-                
-            # Apply advantage filter
-            if advantage_filter == "High (4-5)":
-                filtered_games = filtered_games[filtered_games['advantage_play_potential'] >= 4]
-            elif advantage_filter == "Medium (3)":
-                filtered_games = filtered_games[filtered_games['advantage_play_potential'] == 3]
-            elif advantage_filter == "Low (1-2)":
-                filtered_games = filtered_games[filtered_games['advantage_play_potential'] <= 2]
-                
-            # Apply volatility filter
-            if volatility_filter == "Low (1-2)":
-                filtered_games = filtered_games[filtered_games['volatility'] <= 2]
-            elif volatility_filter == "Medium (3)":
-                filtered_games = filtered_games[filtered_games['volatility'] == 3]
-            elif volatility_filter == "High (4-5)":
-                filtered_games = filtered_games[filtered_games['volatility'] >= 4]
-                
-            # Apply search filter
-            if search_query:
-                filtered_games = filtered_games[
-                    filtered_games['game_name'].str.contains(search_query, case=False)
-                ]
-            
-            if not filtered_games.empty:
-                # Calculate score
-                filtered_games['Score'] = (
-                    (filtered_games['rtp'] * 0.5) +
-                    (filtered_games['bonus_frequency'] * 0.2) +
-                    (filtered_games['advantage_play_potential'] * 0.2) +
-                    ((6 - filtered_games['volatility']) * 0.1)
-                )
+            # Apply filters from the precomputed index
+            filter_index = load_filter_index()
+            matches = filter_index.query(
+                max_min_bet=max_min_bet,
+                min_rtp=min_rtp,
+                game_type=game_type,
+                advantage=advantage_filter,
+                volatility=volatility_filter,
+                name_query=search_query
+            )
+            profiler.checkpoint("game_plan.filters")
                 
-                # Sort and display
-                filtered_games = filtered_games.sort_values('Score', ascending=False)
-                
-                st.subheader(f"Recommended Games ({len(filtered_games)} matches)")
+            if len(matches):
+                st.subheader(f"Recommended Games ({len(matches)} matches)")
                 st.caption(f"Showing games with RTP ≥ {min_rtp}% and min bet ≤ ${max_min_bet:,.2f}")
                 
-                # Display games in a responsive grid
-                st.markdown('<div class="ph-game-grid">', unsafe_allow_html=True)
+                # Page through the ranked matches; only the visible page is selected and sorted
+                page_col1, page_col2 = st.columns(2)
+                with page_col1:
+                    page_size = st.selectbox("Games per Page", PAGE_SIZES, index=1)
+                with page_col2:
+                    total_pages = page_count(len(matches), page_size)
+                    page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1)
+                offset = (page - 1) * page_size
                 
-                for _, row in filtered_games.head(50).iterrows():
-                    # Create the game card HTML
-                    game_card = f"""
-                    <div class="ph-game-card">
-                        <div class="ph-game-title">🎰 {row['game_name']}</div>
-                        <div class="ph-game-detail">
-                            <strong>🗂️ Type:</strong> {row['type']}
-                        </div>
-                        <div class="ph-game-detail">
-                            <strong>💸 Min Bet:</strong> ${row['min_bet']:,.2f}
-                        </div>
-                        <div class="ph-game-detail">
-                            <strong>🧠 Advantage Play:</strong> {map_advantage(int(row['advantage_play_potential']))}
-                        </div>
-                        <div class="ph-game-detail">
-                            <strong>🎲 Volatility:</strong> {map_volatility(int(row['volatility']))}
-                        </div>
-                        <div class="ph-game-detail">
-                            <strong>🎁 Bonus Frequency:</strong> {map_bonus_freq(row['bonus_frequency'])}
-                        </div>
-                        <div class="ph-game-detail">
-                            <strong>🔢 RTP:</strong> {row['rtp']:.2f}%
-                        </div>
-                        <div class="ph-game-detail">
-                            <strong>💡 Tips:</strong> {row['tips']}
-                        </div>
-                    </div>
-                    """
-                    
-                    # Render the game card with HTML interpretation
-                    st.markdown(game_card, unsafe_allow_html=True)
+                top = top_k(filter_index.scores, matches, page_size, offset)
+                filtered_games = game_df.iloc[top]
+                st.caption(f"Page {page} of {total_pages} · games {offset + 1}-{offset + len(top)}")
                 
-                st.markdown('</div>', unsafe_allow_html=True)
+                # Display games in a responsive grid as a single element
+                st.markdown(render_game_cards(filtered_games), unsafe_allow_html=True)
+                profiler.checkpoint("game_plan.cards")
             else:
                 st.warning("No games match your current filters. Try adjusting your criteria.")
+            
+            # Session-by-session plan for the rest of the trip
+            st.subheader("🗺️ Trip Game Plan")
+            remaining_sessions = st.session_state.trip_settings['num_sessions'] - trip_totals['sessions']
+            if remaining_sessions > 0 and current_bankroll > 0:
+                plan_col1, plan_col2 = st.columns(2)
+                with plan_col1:
+                    spins = st.slider("Spins per Session", 50, 500, SPINS_PER_SESSION, step=25)
+                with plan_col2:
+                    risk_weight = st.slider("Stop-Loss Aversion", 0.0, 1.0, RISK_WEIGHT, step=0.05,
+                                            help="How much expected value to give up to avoid hitting stop losses")
+                
+                trip_plan_df = trip_plan(current_bankroll, remaining_sessions, spins, risk_weight)
+                if len(trip_plan_df):
+                    st.caption(f"{len(trip_plan_df)} remaining sessions from ${current_bankroll:,.2f} · "
+                               f"expected to finish with ${trip_plan_df['expected_bankroll'].iloc[-1]:,.2f}, "
+                               f"{plan_stop_risk(trip_plan_df) * 100:.1f}% chance of hitting a stop loss")
+                    st.dataframe(trip_plan_df.assign(
+                        session=trip_plan_df['session'] + trip_totals['sessions']
+                    ).rename(columns={
+                        'session': 'Session',
+                        'game': 'Game',
+                        'min_bet': 'Min Bet',
+                        'volatility': 'Volatility',
+                        'rtp': 'RTP (%)',
+                        'session_bankroll': 'Session Bankroll',
+                        'max_bet': 'Max Bet',
+                        'stop_loss': 'Stop Loss',
+                        'expected_result': 'Expected Result',
+                        'stop_loss_probability': 'Stop-Loss Chance',
+                        'expected_bankroll': 'Expected Bankroll'
+                    }).style.format({
+                        'Min Bet': '${:,.2f}',
+                        'RTP (%)': '{:.2f}',
+                        'Session Bankroll': '${:,.2f}',
+                        'Max Bet': '${:,.2f}',
+                        'Stop Loss': '${:,.2f}',
+                        'Expected Result': '${:+,.2f}',
+                        'Stop-Loss Chance': '{:.1%}',
+                        'Expected Bankroll': '${:,.2f}'
+                    }), hide_index=True)
+                else:
+                    st.warning("No game's minimum bet fits the session max bet for the bankroll left.")
+            else:
+                st.info("All sessions of this trip are complete. Start a new trip to plan the next one.")
+            profiler.checkpoint("game_plan.trip_plan")
         else:
             st.error("Failed to load game data. Please check the CSV format and column names.")
     
@@ -540,7 +485,7 @@ def main():
                         st.warning("Please select a game")
                     else:
                         profit = money_out - money_in
-                        st.session_state.session_log.append({
+                        store.add_session({
                             "trip_id": st.session_state.current_trip_id,
                             "date": session_date.strftime("%Y-%m-%d"),
                             "casino": st.session_state.trip_settings['casino'],
@@ -551,9 +496,39 @@ def main():
                             "notes": session_notes
                         })
                         st.success(f"Session added: ${profit:+,.2f} profit")
+                        current_trip_sessions = store.trip_sessions(st.session_state.current_trip_id)
+                        trip_totals = store.trip_totals(st.session_state.current_trip_id)
+        
+        # Bulk import of past sessions from a spreadsheet or win/loss statement export
+        with st.expander("📥 Import Past Sessions (CSV)"):
+            st.caption("Needs date and game columns, plus money in and money out or a net win/loss column. "
+                       "Games are matched to the catalog by name.")
+            import_file = st.file_uploader("Session CSV", type=["csv"], key="session_import_file")
+            if import_file is not None and st.button("Import Sessions"):
+                progress = st.empty()
+                try:
+                    report = import_sessions(
+                        store, import_file, st.session_state.current_trip_id,
+                        casino=st.session_state.trip_settings['casino'],
+                        game_names=game_df['game_name'] if not game_df.empty else None,
+                        on_chunk=lambda report: progress.caption(f"Imported {report['imported']:,} rows...")
+                    )
+                except ValueError as e:
+                    st.error(f"Could not import {import_file.name}: {e}")
+                else:
+                    rejected = sum(report['rejected'].values())
+                    st.success(f"Imported {report['imported']:,} of {report['rows']:,} rows")
+                    if rejected:
+                        st.warning("Skipped " + ", ".join(
+                            f"{count:,} with {reason}" for reason, count in report['rejected'].items() if count))
+                    if report['unmatched_games']:
+                        unmatched = sorted(report['unmatched_games'])
+                        st.info(f"{len(unmatched):,} games are not in the catalog and were kept as written: "
+                                + ", ".join(unmatched[:10]) + (" ..." if len(unmatched) > 10 else ""))
+                    current_trip_sessions = store.trip_sessions(st.session_state.current_trip_id)
+                    trip_totals = store.trip_totals(st.session_state.current_trip_id)
         
         # Display current trip sessions
-        current_trip_sessions = [s for s in st.session_state.session_log if s['trip_id'] == st.session_state.current_trip_id]
         
         if current_trip_sessions:
             st.subheader(f"Trip #{st.session_state.current_trip_id} Sessions")
@@ -575,14 +550,21 @@ def main():
                 """
                 st.markdown(session_card, unsafe_allow_html=True)
             
-            # Export sessions to CSV
+            # Export sessions; the file is only built when the download is clicked
             st.subheader("Export Data")
-            if st.button("💾 Export Session History to CSV"):
-                session_df = pd.DataFrame(current_trip_sessions)
-                st.markdown(get_csv_download_link(session_df, f"trip_{st.session_state.current_trip_id}_sessions.csv"), unsafe_allow_html=True)
+            trip_id = st.session_state.current_trip_id
+            session_format = st.selectbox("Session Export Format", list(EXPORT_FORMATS), key="session_export_format")
+            st.download_button(
+                "💾 Export Session History",
+                data=lambda: export_sessions(store, session_format, trip_id=trip_id),
+                file_name=export_file_name(f"trip_{trip_id}_sessions", session_format),
+                mime=export_mime(session_format)
+            )
         else:
             st.info("No sessions recorded for this trip yet. Add your first session above.")
     
+    profiler.checkpoint("tracker")
+    
     # Trip Analytics Tab
     with tab3:
         st.info("Analyze your trip performance and track your bankroll growth")
@@ -590,14 +572,13 @@ def main():
         if not current_trip_sessions:
             st.info("No sessions recorded for this trip yet. Add sessions to see analytics.")
         else:
-            # Calculate cumulative values
-            trip_profit = sum(s['profit'] for s in current_trip_sessions)
-            current_bankroll = st.session_state.trip_settings['starting_bankroll'] + trip_profit
-            
-            # Calculate performance metrics
-            total_invested = sum(s['money_in'] for s in current_trip_sessions)
-            roi = (trip_profit / total_invested) * 100 if total_invested > 0 else 0
-            avg_session_profit = trip_profit / len(current_trip_sessions)
+            # Performance metrics from the maintained trip totals
+            trip_profit = trip_totals['total_profit']
+            summary = trip_summary(st.session_state.trip_settings['starting_bankroll'], trip_totals['sessions'],
+                                   trip_profit, trip_totals['total_invested'])
+            current_bankroll = summary['current_bankroll']
+            roi = summary['roi']
+            avg_session_profit = summary['avg_session_profit']
             
             # Display key metrics
             col1, col2, col3 = st.columns(3)
@@ -609,40 +590,21 @@ def main():
             with col3:
                 st.metric("📊 ROI", f"{roi:.1f}%")
             
-            # Bankroll growth chart
-            bankroll_history = [st.session_state.trip_settings['starting_bankroll']]
-            dates = [min(s['date'] for s in current_trip_sessions)]
-            cumulative = 0
-            
-            for session in sorted(current_trip_sessions, key=lambda x: x['date']):
-                cumulative += session['profit']
-                bankroll_history.append(st.session_state.trip_settings['starting_bankroll'] + cumulative)
-                dates.append(session['date'])
+            # Bankroll growth chart, extended with new sessions only and downsampled for the browser
+            series = st.session_state.get('bankroll_series')
+            if series is None or series.trip_id != st.session_state.current_trip_id:
+                series = BankrollSeries(store, st.session_state.current_trip_id)
+                st.session_state.bankroll_series = series
+            series.refresh(trip_totals['sessions'])
             
             st.subheader("Bankroll Growth")
-            chart_data = pd.DataFrame({
-                "Date": dates,
-                "Bankroll": bankroll_history
-            })
+            chart_data = series.chart_frame(st.session_state.trip_settings['starting_bankroll'])
             st.line_chart(chart_data.set_index("Date"))
+            profiler.checkpoint("analytics.bankroll_chart")
             
             # Game performance analysis
             st.subheader("Game Performance")
-            game_performance = {}
-            for session in current_trip_sessions:
-                game = session['game']
-                if game not in game_performance:
-                    game_performance[game] = {
-                        'sessions': 0,
-                        'total_profit': 0,
-                        'total_invested': 0
-                    }
-                game_performance[game]['sessions'] += 1
-                game_performance[game]['total_profit'] += session['profit']
-                game_performance[game]['total_invested'] += session['money_in']
-            
-            # Create performance DataFrame
-            perf_df = pd.DataFrame.from_dict(game_performance, orient='index')
+            perf_df = pd.DataFrame(store.game_totals(st.session_state.current_trip_id)).set_index('game').rename_axis(None)
             perf_df['ROI'] = (perf_df['total_profit'] / perf_df['total_invested']) * 100
             perf_df['Avg Profit'] = perf_df['total_profit'] / perf_df['sessions']
             perf_df = perf_df.sort_values('ROI', ascending=False)
@@ -660,17 +622,15 @@ def main():
             
             # Win/Loss distribution using Altair
             st.subheader("Win/Loss Distribution")
-            profits = [s['profit'] for s in current_trip_sessions]
-            
-            if profits:
-                df = pd.DataFrame({
-                    'Profit': profits,
-                    'Type': ['Win' if p >= 0 else 'Loss' for p in profits]
-                })
+            if current_trip_sessions:
+                bins = profit_histogram_data(st.session_state.current_trip_id,
+                                             (trip_totals['sessions'], trip_totals['total_profit']),
+                                             current_trip_sessions)
                 
-                chart = alt.Chart(df).mark_bar().encode(
-                    alt.X("Profit:Q", bin=alt.Bin(maxbins=20), title='Profit/Loss Amount'),
-                    alt.Y('count()', title='Frequency'),
+                chart = alt.Chart(bins).mark_bar().encode(
+                    alt.X('bin_start:Q', title='Profit/Loss Amount'),
+                    alt.X2('bin_end'),
+                    alt.Y('Count:Q', title='Frequency'),
                     color=alt.Color('Type', scale=alt.Scale(
                         domain=['Win', 'Loss'],
                         range=['#27ae60', '#e74c3c']
@@ -682,18 +642,80 @@ def main():
                 st.altair_chart(chart, use_container_width=True)
             else:
                 st.info("No profit data available")
+            profiler.checkpoint("analytics.histogram")
                 
             # Export analytics data
             st.subheader("Export Analytics")
-            if st.button("📊 Export Trip Analytics to CSV"):
-                analytics_df = pd.DataFrame({
-                    'Metric': ['Trip ID', 'Casino', 'Starting Bankroll', 'Current Bankroll', 
-                              'Total Profit/Loss', 'ROI', 'Avg Session Profit', 'Sessions Completed'],
-                    'Value': [st.session_state.current_trip_id, st.session_state.trip_settings['casino'], 
-                             st.session_state.trip_settings['starting_bankroll'], current_bankroll,
-                             trip_profit, f"{roi}%", avg_session_profit, len(current_trip_sessions)]
-                })
-                st.markdown(get_csv_download_link(analytics_df, f"trip_{st.session_state.current_trip_id}_analytics.csv"), unsafe_allow_html=True)
+            analytics_df = pd.DataFrame({
+                'Metric': ['Trip ID', 'Casino', 'Starting Bankroll', 'Current Bankroll', 
+                          'Total Profit/Loss', 'ROI', 'Avg Session Profit', 'Sessions Completed'],
+                'Value': [str(value) for value in [
+                    st.session_state.current_trip_id, st.session_state.trip_settings['casino'], 
+                    st.session_state.trip_settings['starting_bankroll'], current_bankroll,
+                    trip_profit, f"{roi}%", avg_session_profit, trip_totals['sessions']]]
+            })
+            analytics_format = st.selectbox("Analytics Export Format", list(EXPORT_FORMATS), key="analytics_export_format")
+            st.download_button(
+                "📊 Export Trip Analytics",
+                data=lambda: export_frame(analytics_df, analytics_format),
+                file_name=export_file_name(f"trip_{st.session_state.current_trip_id}_analytics", analytics_format),
+                mime=export_mime(analytics_format)
+            )
+        
+        # Analytics across every recorded trip
+        history_df = get_trip_history().frame()
+        if not history_df.empty:
+            st.markdown("---")
+            st.subheader("📚 History Across Trips")
+            group_label = st.selectbox("Group History By", list(GROUPINGS), key="history_grouping")
+            history_summary = summarize(history_df, GROUPINGS[group_label])
+            st.dataframe(history_summary.rename(columns={
+                'sessions': 'Sessions',
+                'total_profit': 'Total Profit',
+                'total_invested': 'Total Invested',
+                'avg_profit': 'Avg Profit/Session',
+                'roi': 'ROI (%)'
+            }).style.format({
+                'Total Profit': '${:,.2f}',
+                'Total Invested': '${:,.2f}',
+                'Avg Profit/Session': '${:,.2f}',
+                'ROI (%)': '{:.1f}%'
+            }))
+            
+            st.subheader("ROI Trend")
+            trend = roi_trend(history_df)
+            st.line_chart(trend[['roi', 'cumulative_roi']].rename(columns={
+                'roi': 'Monthly ROI (%)',
+                'cumulative_roi': 'Cumulative ROI (%)'
+            }))
+            
+            best_games, worst_games = best_and_worst_games(history_df)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**🏆 Best Games (ROI)**")
+                st.dataframe(best_games[['sessions', 'total_profit', 'roi']].style.format(
+                    {'total_profit': '${:,.2f}', 'roi': '{:.1f}%'}))
+            with col2:
+                st.markdown("**⚠️ Worst Games (ROI)**")
+                st.dataframe(worst_games[['sessions', 'total_profit', 'roi']].style.format(
+                    {'total_profit': '${:,.2f}', 'roi': '{:.1f}%'}))
+    profiler.checkpoint("analytics")
+    
+    # Optional debug panel with this rerun's timings (the panel itself is not timed)
+    timings = profiler.finish()
+    with st.sidebar:
+        if st.checkbox("🛠️ Show Rerun Timings", key="show_rerun_timings"):
+            st.caption(f"Rerun took {timings['total'] * 1000:,.1f} ms")
+            st.dataframe(pd.DataFrame({
+                'Section': list(timings['sections']),
+                'ms': [seconds * 1000 for seconds in timings['sections'].values()]
+            }).style.format({'ms': '{:,.2f}'}), hide_index=True)
+            if timings['calls']:
+                st.dataframe(pd.DataFrame({
+                    'Cached Call': [call['name'] for call in timings['calls']],
+                    'Cache': ["hit" if call['hit'] else "miss" for call in timings['calls']],
+                    'ms': [call['seconds'] * 1000 for call in timings['calls']]
+                }).style.format({'ms': '{:,.2f}'}), hide_index=True)
 
 # Run the app
 if __name__ == "__main__":
@@ -3,11 +3,18 @@ import numpy as np
 import pandas as pd
 import altair as alt  # Replaced matplotlib with Altair
 
+from bankroll_sim import DEFAULT_PERCENTILES, FIXED_FRACTIONS, KELLY_MULTIPLIERS
+from chart_data import downsample_frame
+from compute_core import bankroll_projection, flat_bet_projection, game_catalog, kelly_table, progression_projection
+from strategy_sweep import RISK_TOLERANCES, SWEEP_STRATEGIES, row_label, run_sweep, sweep_cells
+
 # Initialize session state
 if 'bankroll_history' not in st.session_state:
     st.session_state.bankroll_history = []
 if 'simulation_results' not in st.session_state:
     st.session_state.simulation_results = None
+if 'sweep_results' not in st.session_state:
+    st.session_state.sweep_results = None
 
 # Page config
 st.set_page_config(
@@ -25,7 +32,8 @@ with st.sidebar:
     st.header("Bankroll Parameters")
     initial_bankroll = st.number_input("Initial Bankroll ($)", min_value=100, value=1000, step=100)
     risk_tolerance = st.select_slider("Risk Tolerance", options=["Conservative", "Moderate", "Aggressive"])
-    betting_strategy = st.selectbox("Betting Strategy", ["Fixed Fraction", "Kelly Criterion", "Martingale", "D'Alembert"])
+    betting_strategy = st.selectbox("Betting Strategy",
+                                    ["Fixed Fraction", "Kelly Criterion", "Martingale", "D'Alembert", "Flat Bet"])
     game_type = st.selectbox("Game Type", ["Blackjack", "Roulette", "Craps", "Baccarat", "Slots"])
     house_edge = st.slider("House Edge (%)", min_value=0.1, max_value=20.0, value=5.0, step=0.1) / 100
     
@@ -33,6 +41,14 @@ with st.sidebar:
     if betting_strategy == "Kelly Criterion":
         win_probability = st.slider("Win Probability", min_value=0.1, max_value=0.9, value=0.48, step=0.01)
         win_payout = st.slider("Win Payout (x bet)", min_value=1.0, max_value=10.0, value=2.0, step=0.1)
+    elif betting_strategy in ["Martingale", "D'Alembert"]:
+        base_bet = st.number_input("Base Bet ($)", min_value=1.0,
+                                   value=25.0 if betting_strategy == "Martingale" else 50.0, step=5.0)
+        table_max = st.number_input("Table Maximum ($)", min_value=base_bet, value=max(base_bet, 1000.0), step=100.0)
+    elif betting_strategy == "Flat Bet":
+        flat_bet = st.number_input("Bet Size ($)", min_value=1.0, value=10.0, step=5.0)
+        session_stop_loss = st.number_input("Session Stop Loss ($, 0 = none)", min_value=0.0, value=200.0, step=25.0)
+        session_win_goal = st.number_input("Session Win Goal ($, 0 = none)", min_value=0.0, value=100.0, step=25.0)
     
     st.divider()
     st.caption("Developed by Casino Strategy Pro™")
@@ -46,12 +62,7 @@ with col1:
     
     # Calculate bet size based on strategy
     if betting_strategy == "Fixed Fraction":
-        if risk_tolerance == "Conservative":
-            fraction = 0.01
-        elif risk_tolerance == "Moderate":
-            fraction = 0.025
-        else:  # Aggressive
-            fraction = 0.05
+        fraction = FIXED_FRACTIONS[risk_tolerance]
         
         bet_size = initial_bankroll * fraction
         st.metric("Recommended Bet Size", f"${bet_size:.2f}")
@@ -69,26 +80,53 @@ with col1:
         kelly_fraction = (b * p - q) / b
         
         # Apply risk tolerance adjustment
-        if risk_tolerance == "Conservative":
-            fraction = kelly_fraction * 0.5
-        elif risk_tolerance == "Moderate":
-            fraction = kelly_fraction * 0.75
-        else:  # Aggressive
-            fraction = kelly_fraction
+        fraction = kelly_fraction * KELLY_MULTIPLIERS[risk_tolerance]
         
         bet_size = initial_bankroll * fraction
         st.metric("Optimal Bet Fraction", f"{fraction*100:.2f}%")
         st.metric("Recommended Bet Size", f"${bet_size:.2f}")
         
+        # Multi-outcome Kelly from each catalog game's payout model
+        with st.expander("Game-Specific Kelly (catalog payout models)"):
+            catalog = game_catalog()
+            rtp_adjustment = st.slider("RTP Boost from Advantage Play (pts)", 0.0, 20.0, 0.0, step=0.5,
+                                       help="Raise the listed RTP, e.g. for high progressive meters or must-hit bonuses")
+            multiplier = KELLY_MULTIPLIERS[risk_tolerance]
+            kelly = kelly_table(rtp_adjustment, multiplier)
+            kelly_df = pd.DataFrame({
+                'Game': catalog['game_name'],
+                'Effective RTP (%)': catalog['rtp'] + rtp_adjustment,
+                'Volatility': catalog['volatility'],
+                'Kelly Fraction (%)': kelly['fraction'] * 100,
+                'Bet Size ($)': initial_bankroll * kelly['fraction'],
+                'Growth per 1,000 Bets (%)': np.expm1(kelly['log_growth'] * 1000) * 100
+            })
+            playable = kelly_df[kelly_df['Kelly Fraction (%)'] > 0]
+            if playable.empty:
+                st.info("No catalog game has a positive expected return at this RTP - Kelly says not to bet.")
+            else:
+                st.caption(f"{len(playable):,} of {len(kelly_df):,} games have a positive edge "
+                           f"({risk_tolerance.lower()} Kelly, x{multiplier})")
+                st.dataframe(playable.sort_values('Kelly Fraction (%)', ascending=False).head(25).style.format({
+                    'Effective RTP (%)': '{:.2f}',
+                    'Kelly Fraction (%)': '{:.3f}',
+                    'Bet Size ($)': '${:,.2f}',
+                    'Growth per 1,000 Bets (%)': '{:.2f}'
+                }), hide_index=True)
+        
     elif betting_strategy == "Martingale":
-        st.metric("Base Bet Size", "$25.00")
+        st.metric("Base Bet Size", f"${base_bet:.2f}")
         st.warning("Double bet after each loss. Reset to base after win.")
         st.info("High risk strategy - requires large bankroll")
         
     elif betting_strategy == "D'Alembert":
-        st.metric("Base Bet Size", "$50.00")
+        st.metric("Base Bet Size", f"${base_bet:.2f}")
         st.warning("Increase bet by base after loss. Decrease by base after win.")
         st.info("Moderate risk progression strategy")
+        
+    elif betting_strategy == "Flat Bet":
+        st.metric("Bet Size", f"${flat_bet:.2f}")
+        st.info("Bet the same amount on every wager. Quit a session at its stop loss or win goal.")
     
     # Bankroll management tips
     st.divider()
@@ -106,105 +144,209 @@ with col2:
     # Simulation parameters
     num_sessions = st.slider("Number of Gambling Sessions", 1, 100, 20)
     bets_per_session = st.slider("Bets per Session", 1, 100, 20)
+    if betting_strategy in ["Fixed Fraction", "Kelly Criterion"]:
+        num_paths = st.select_slider("Simulated Paths", options=[1000, 10000, 50000, 100000], value=10000)
+        min_bet = st.number_input("Table Minimum Bet ($)", min_value=1.0, value=5.0, step=1.0,
+                                  help="A path is ruined once its bankroll can no longer cover the table minimum")
     
     if st.button("Run Simulation", key="simulate"):
-        # Initialize bankroll
-        bankroll = initial_bankroll
-        history = [bankroll]
-        
-        # Strategy-specific parameters
-        if betting_strategy == "Fixed Fraction":
-            fraction = 0.025 if risk_tolerance == "Moderate" else 0.01 if risk_tolerance == "Conservative" else 0.05
-        elif betting_strategy == "Kelly Criterion":
-            fraction = max(0.01, min(0.2, fraction))  # Constrain fraction
-        
-        # Run simulation
-        for session in range(num_sessions):
-            session_bankroll = bankroll
-            for bet in range(bets_per_session):
-                # Determine bet size based on strategy
-                if betting_strategy == "Fixed Fraction":
-                    bet_amount = fraction * session_bankroll
-                elif betting_strategy == "Kelly Criterion":
-                    bet_amount = fraction * session_bankroll
-                elif betting_strategy == "Martingale":
-                    bet_amount = 25  # Base bet for Martingale
-                elif betting_strategy == "D'Alembert":
-                    bet_amount = 50  # Base bet for D'Alembert
-                
-                # Ensure we don't bet more than available
-                bet_amount = min(bet_amount, session_bankroll)
-                
-                # Determine win/loss (consider house edge)
-                if np.random.random() > (0.5 + house_edge/2):
-                    # Win
-                    if betting_strategy in ["Fixed Fraction", "Kelly Criterion"]:
-                        session_bankroll += bet_amount
-                    else:
-                        session_bankroll += bet_amount  # Even money payout
-                else:
-                    # Loss
-                    session_bankroll -= bet_amount
-                
-                # Check for bankruptcy
-                if session_bankroll <= 0:
-                    session_bankroll = 0
-                    break
+        if betting_strategy in ["Fixed Fraction", "Kelly Criterion"]:
+            # Vectorized Monte Carlo over many paths, memoized on the inputs
+            if betting_strategy == "Kelly Criterion":
+                sim = bankroll_projection(initial_bankroll, betting_strategy, risk_tolerance, house_edge,
+                                          num_sessions, bets_per_session, num_paths, min_bet,
+                                          win_probability=win_probability, win_payout=win_payout)
+            else:
+                sim = bankroll_projection(initial_bankroll, betting_strategy, risk_tolerance, house_edge,
+                                          num_sessions, bets_per_session, num_paths, min_bet)
             
-            bankroll = session_bankroll
-            history.append(bankroll)
-        
-        # Store results
-        st.session_state.bankroll_history = history
-        st.session_state.simulation_results = {
-            "final_bankroll": bankroll,
-            "max_bankroll": max(history),
-            "min_bankroll": min(history),
-            "bankrupt": history[-1] <= 0
-        }
+            # Store results
+            st.session_state.bankroll_history = sim["bands"][50].tolist()
+            st.session_state.simulation_results = {
+                "mode": "monte_carlo",
+                "num_paths": num_paths,
+                "bands": {q: band.tolist() for q, band in sim["bands"].items()},
+                "final_bankroll": sim["bands"][50][-1],
+                "mean_final": sim["mean_final"],
+                "ruin_probability": sim["ruin_probability"]
+            }
+        elif betting_strategy == "Flat Bet":
+            # Exact distributions by FFT convolution of the per-bet outcome distribution - no sampling
+            dist = flat_bet_projection(house_edge, flat_bet, num_sessions, bets_per_session,
+                                       stop_loss=session_stop_loss or None, profit_goal=session_win_goal or None)
+            
+            st.session_state.bankroll_history = []
+            st.session_state.simulation_results = {
+                "mode": "distribution",
+                "trip_values": (initial_bankroll + dist["trip_values"]).tolist(),
+                "trip_probabilities": dist["trip_probabilities"].tolist(),
+                "final_quantiles": {q: initial_bankroll + value for q, value in dist["trip_quantiles"].items()},
+                "session_quantiles": dist["session_quantiles"],
+                "expected_final": initial_bankroll + dist["expected_trip"],
+                "profit_probability": dist["trip_profit_probability"],
+                "stop_probability": dist["stop_probability"],
+                "goal_probability": dist["goal_probability"]
+            }
+        else:
+            # Exact solution over (bankroll, bet level) states; the progression restarts each session
+            solution = progression_projection(betting_strategy, initial_bankroll, house_edge, base_bet, table_max,
+                                              num_sessions, bets_per_session)
+            
+            # Store results
+            st.session_state.bankroll_history = []
+            st.session_state.simulation_results = {
+                "mode": "exact",
+                "bankroll_values": solution["bankroll_values"].tolist(),
+                "probabilities": solution["probabilities"].tolist(),
+                "ruin_by_session": solution["ruin_by_bet"][::bets_per_session].tolist(),
+                "expected_final": solution["expected_final"],
+                "profit_probability": solution["profit_probability"],
+                "ruin_probability": solution["ruin_probability"]
+            }
     
     # Display simulation results
     if st.session_state.simulation_results:
         results = st.session_state.simulation_results
         
         st.subheader("Simulation Results")
-        col_a, col_b, col_c = st.columns(3)
-        col_a.metric("Final Bankroll", f"${results['final_bankroll']:.2f}")
-        col_b.metric("Max Bankroll", f"${results['max_bankroll']:.2f}")
-        col_c.metric("Min Bankroll", f"${results['min_bankroll']:.2f}")
-        
-        if results['bankrupt']:
-            st.error("Bankroll reached $0 - Bankrupt!")
+        if results.get("mode") == "monte_carlo":
+            bands = results["bands"]
+            col_a, col_b, col_c = st.columns(3)
+            col_a.metric("Median Final Bankroll", f"${results['final_bankroll']:.2f}")
+            col_b.metric("Mean Final Bankroll", f"${results['mean_final']:.2f}")
+            col_c.metric("Risk of Ruin", f"{results['ruin_probability'] * 100:.2f}%")
+            st.caption(f"Based on {results['num_paths']:,} simulated paths. "
+                       f"90% of paths finished between ${bands[5][-1]:,.2f} and ${bands[95][-1]:,.2f}.")
+            
+            # Percentile bands with the median path on top
+            band_data = pd.DataFrame({f"p{q}": bands[q] for q in DEFAULT_PERCENTILES})
+            band_data['Session'] = range(len(band_data))
+            band_data = downsample_frame(band_data, [f"p{q}" for q in DEFAULT_PERCENTILES])
+            
+            outer = alt.Chart(band_data).mark_area(opacity=0.2).encode(
+                x='Session', y=alt.Y('p5', title='Bankroll'), y2='p95'
+            )
+            inner = alt.Chart(band_data).mark_area(opacity=0.35).encode(
+                x='Session', y='p25', y2='p75'
+            )
+            line = alt.Chart(band_data).mark_line().encode(
+                x='Session', y='p50'
+            )
+            
+            rule = alt.Chart(pd.DataFrame({'Starting Bankroll': [initial_bankroll]})).mark_rule(
+                color='red',
+                strokeDash=[5, 5]
+            ).encode(y='Starting Bankroll')
+            
+            chart = (outer + inner + line + rule).properties(
+                title='Bankroll Over Sessions',
+                width=600,
+                height=400
+            )
+            
+            st.altair_chart(chart, use_container_width=True)
+        elif results.get("mode") == "distribution":
+            quantiles = results["final_quantiles"]
+            col_a, col_b = st.columns(2)
+            col_a.metric("Expected Final Bankroll", f"${results['expected_final']:.2f}")
+            col_b.metric("Chance of Profit", f"{results['profit_probability'] * 100:.1f}%")
+            col_a.metric("Session Stop Loss Hit", f"{results['stop_probability'] * 100:.1f}%")
+            col_b.metric("Session Win Goal Hit", f"{results['goal_probability'] * 100:.1f}%")
+            st.caption(f"Exact distribution - no sampling noise. 90% of trips finish between "
+                       f"${quantiles[5]:,.2f} and ${quantiles[95]:,.2f} (median ${quantiles[50]:,.2f}).")
+            st.dataframe(pd.DataFrame({
+                'Percentile': [f"{q}th" for q in DEFAULT_PERCENTILES],
+                'Session Result ($)': [results['session_quantiles'][q] for q in DEFAULT_PERCENTILES],
+                'Final Bankroll ($)': [quantiles[q] for q in DEFAULT_PERCENTILES]
+            }), hide_index=True)
+            
+            dist_data = pd.DataFrame({
+                'Final Bankroll': results['trip_values'],
+                'Probability': results['trip_probabilities']
+            })
+            dist_data = downsample_frame(dist_data, 'Probability')
+            st.altair_chart(alt.Chart(dist_data).mark_area(opacity=0.6).encode(
+                x=alt.X('Final Bankroll:Q'),
+                y=alt.Y('Probability:Q')
+            ).properties(title='Final Bankroll Distribution'), use_container_width=True)
         else:
-            roi = ((results['final_bankroll'] - initial_bankroll) / initial_bankroll) * 100
-            st.success(f"Return on Investment: {roi:.1f}%")
-        
-        # Plot bankroll history with Altair
-        chart_data = pd.DataFrame({
-            'Session': range(len(st.session_state.bankroll_history)),
-            'Bankroll': st.session_state.bankroll_history
-        })
-        
-        line = alt.Chart(chart_data).mark_line().encode(
-            x='Session',
-            y='Bankroll'
-        )
-        
-        rule = alt.Chart(pd.DataFrame({'Starting Bankroll': [initial_bankroll]})).mark_rule(
-            color='red',
-            strokeDash=[5, 5]
-        ).encode(y='Starting Bankroll')
-        
-        chart = (line + rule).properties(
-            title='Bankroll Over Sessions',
-            width=600,
-            height=400
-        )
-        
-        st.altair_chart(chart, use_container_width=True)
+            col_a, col_b, col_c = st.columns(3)
+            col_a.metric("Expected Final Bankroll", f"${results['expected_final']:.2f}")
+            col_b.metric("Chance of Profit", f"{results['profit_probability'] * 100:.1f}%")
+            col_c.metric("Risk of Ruin", f"{results['ruin_probability'] * 100:.2f}%")
+            st.caption("Exact probabilities for the full progression - no sampling noise.")
+            
+            # Distribution of the final bankroll
+            dist_data = pd.DataFrame({
+                'Final Bankroll': results['bankroll_values'],
+                'Probability': results['probabilities']
+            })
+            st.altair_chart(alt.Chart(dist_data).mark_bar().encode(
+                x=alt.X('Final Bankroll:Q'),
+                y=alt.Y('Probability:Q')
+            ).properties(title='Final Bankroll Distribution'), use_container_width=True)
+            
+            # Cumulative risk of ruin by session
+            ruin_data = pd.DataFrame({
+                'Session': range(len(results['ruin_by_session'])),
+                'Risk of Ruin': results['ruin_by_session']
+            })
+            ruin_data = downsample_frame(ruin_data, 'Risk of Ruin')
+            st.altair_chart(alt.Chart(ruin_data).mark_line().encode(
+                x='Session',
+                y=alt.Y('Risk of Ruin:Q', axis=alt.Axis(format='%'))
+            ).properties(title='Risk of Ruin Over Sessions'), use_container_width=True)
     else:
         st.info("Run the simulation to see bankroll projections")
 
+# Parameter sweep over many strategy settings at once
+st.divider()
+st.header("Strategy Sweep")
+st.caption("Simulate every combination below in parallel and compare risk of ruin and median outcome. "
+           "Kelly is not swept: at any house edge it bets nothing.")
+
+sweep_col1, sweep_col2 = st.columns(2)
+with sweep_col1:
+    sweep_strategies = st.multiselect("Strategies", SWEEP_STRATEGIES, default=SWEEP_STRATEGIES)
+    sweep_risks = st.multiselect("Risk Tolerances", RISK_TOLERANCES, default=RISK_TOLERANCES)
+    sweep_bets = st.multiselect("Bets per Session", [5, 10, 20, 50, 100], default=[10, 20, 50])
+with sweep_col2:
+    edge_low, edge_high = st.slider("House Edge Range (%)", min_value=0.1, max_value=20.0, value=(0.5, 10.0), step=0.1)
+    edge_steps = st.slider("House Edge Steps", 2, 40, 20)
+    sweep_paths = st.select_slider("Paths per Cell", options=[1000, 2000, 5000, 10000], value=2000)
+    sweep_base_bet = st.number_input("Progression Base Bet ($)", min_value=1.0, value=25.0, step=5.0)
+    sweep_table_max = st.number_input("Progression Table Maximum ($)", min_value=sweep_base_bet,
+                                      value=max(sweep_base_bet, 1000.0), step=100.0)
+
+house_edges = np.round(np.linspace(edge_low, edge_high, edge_steps) / 100, 5)
+cells = sweep_cells(sweep_strategies, sweep_risks, house_edges, sorted(sweep_bets))
+st.write(f"{len(cells):,} simulations over {num_sessions} sessions each")
+
+if st.button("Run Sweep", key="sweep", disabled=not cells):
+    with st.spinner("Running sweep..."):
+        sweep = run_sweep(cells, initial_bankroll, num_sessions, num_paths=sweep_paths, min_bet=1.0,
+                          base_bet=sweep_base_bet, table_max=sweep_table_max)
+    sweep['Strategy'] = [row_label(strategy, risk) for strategy, risk in zip(sweep['strategy'], sweep['risk_tolerance'])]
+    sweep['House Edge (%)'] = sweep['house_edge'] * 100
+    st.session_state.sweep_results = sweep
+
+if st.session_state.sweep_results is not None:
+    sweep = st.session_state.sweep_results
+    heat_base = alt.Chart(sweep).mark_rect().encode(
+        x=alt.X('House Edge (%):O', axis=alt.Axis(format='.1f')),
+        y=alt.Y('Strategy:N', title=None),
+        column=alt.Column('bets_per_session:O', title='Bets per Session')
+    )
+    st.altair_chart(heat_base.encode(
+        color=alt.Color('ruin_probability:Q', title='Risk of Ruin', scale=alt.Scale(scheme='reds'),
+                        legend=alt.Legend(format='%')),
+        tooltip=['Strategy', 'House Edge (%)', 'bets_per_session', alt.Tooltip('ruin_probability:Q', format='.2%')]
+    ).properties(title='Risk of Ruin'))
+    st.altair_chart(heat_base.encode(
+        color=alt.Color('median_final:Q', title='Median Final ($)', scale=alt.Scale(scheme='blues')),
+        tooltip=['Strategy', 'House Edge (%)', 'bets_per_session', alt.Tooltip('median_final:Q', format='$,.2f')]
+    ).properties(title='Median Final Bankroll'))
+
 # Additional strategy notes
 st.divider()
 st.header("Strategy Explanations")
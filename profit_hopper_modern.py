@@ -3,6 +3,9 @@ import pandas as pd
 from datetime import datetime
 import pytz
 
+from game_recommender import GameRecommender
+from session_math import session_plan, tracker_totals
+
 APP_VERSION = "v3.4.2"
 
 @st.cache_data
@@ -13,17 +16,13 @@ def load_games():
     except:
         return pd.DataFrame(columns=["Name", "Type", "Volatility", "Bonus", "Min_Bet", "RTP"])
 
-def recommend_games(games_df, session_bankroll, max_bet):
-    df = games_df.copy()
-    df = df[df["Min_Bet"] <= max_bet]
-    df["Score"] = (
-        (df["RTP"] / 100) +
-        df["Bonus"].map(lambda b: 0.2 if b else 0) +
-        df["Volatility"].map(lambda v: 0.3 if v == "Low" else (0.2 if v == "Medium" else 0.1))
-    )
-    df["Stop_Loss"] = session_bankroll * 0.6
-    df["Stop_Loss"] = pd.to_numeric(df[["Stop_Loss", "Min_Bet"]].max(axis=1), errors="coerce").round(2)
-    return df.sort_values("Score", ascending=False).reset_index(drop=True)
+# Scores and sort order are computed once per catalog; playable rows are memoized per min-bet breakpoint
+@st.cache_resource
+def load_recommender():
+    return GameRecommender(load_games())
+
+def recommend_games(session_bankroll, max_bet):
+    return load_recommender().recommend(session_bankroll, max_bet)
 
 if "session_log" not in st.session_state:
     st.session_state["session_log"] = []
@@ -32,8 +31,9 @@ st.sidebar.title("🎯 Profit Hopper")
 st.sidebar.markdown("**App Version:** v3.4.2")
 total_bankroll = st.sidebar.number_input("Total Bankroll", value=100.0, step=10.0)
 sessions = st.sidebar.number_input("Number of Sessions", value=5, step=1)
-session_bankroll = round(total_bankroll / sessions, 2)
-max_bet = round(session_bankroll * 0.25, 2)
+plan = session_plan(total_bankroll, sessions)
+session_bankroll = round(plan['session_bankroll'], 2)
+max_bet = round(plan['max_bet'], 2)
 
 tab1, tab2, tab3 = st.tabs(["📋 Game Plan", "🧾 Tracker", "📊 Summary"])
 
@@ -41,8 +41,7 @@ with tab1:
     st.markdown("### 🎯 Game Plan Summary")
     st.markdown(f"**Total Bankroll:** ${total_bankroll:.2f} | **Sessions:** {sessions} | **Session Bankroll:** ${session_bankroll:.2f} | **Max Bet:** ${max_bet:.2f}")
 
-    games_df = load_games()
-    recommended = recommend_games(games_df, session_bankroll, max_bet)
+    recommended = recommend_games(session_bankroll, max_bet)
 
     st.markdown("---")
     st.markdown("### 🎮 Recommended Games to Play (Best Order):")
@@ -81,9 +80,8 @@ with tab3:
         df = pd.DataFrame(st.session_state["session_log"])
         st.dataframe(df, use_container_width=True)
 
-        total_in = df["In"].sum()
-        total_out = df["Out"].sum()
-        net = total_out - total_in
+        totals = tracker_totals(df["In"], df["Out"])
+        total_in, total_out, net = totals['total_in'], totals['total_out'], totals['net']
 
         st.markdown(f"**Money In:** ${total_in:.2f} | **Money Out:** ${total_out:.2f} | **Net:** ${net:.2f}")
     else:
@@ -3,6 +3,9 @@ import pandas as pd
 from datetime import datetime, timedelta
 import pytz
 
+from session_import import read_session_chunks, tracker_entries
+from session_math import tracker_totals, unit_plan
+
 # Attempt to use browser JS to detect timezone offset
 try:
     from streamlit_js_eval import streamlit_js_eval
@@ -53,16 +56,15 @@ with st.sidebar:
     profit_goal_percent = st.slider("🏁 Profit Goal (%)", 5, 100, 20)
 
 # --- Strategy calculations ---
-session_unit = bankroll / sessions
-risk_factor = {"Low": 40, "Medium": 30, "High": 20}
-max_bet = session_unit / risk_factor[risk]
-profit_goal = bankroll * (1 + profit_goal_percent / 100)
+plan = unit_plan(bankroll, sessions, risk, profit_goal_percent)
+session_unit = plan['session_unit']
+max_bet = plan['max_bet']
+profit_goal = plan['profit_goal']
 
 # --- Summary section ---
 df = pd.DataFrame(st.session_state.tracker)
-total_in = df["Amount In"].sum() if not df.empty else 0.0
-total_out = df["Amount Out"].sum() if not df.empty else 0.0
-net = total_out - total_in
+totals = tracker_totals(df["Amount In"], df["Amount Out"]) if not df.empty else tracker_totals([], [])
+total_in, total_out, net = totals['total_in'], totals['total_out'], totals['net']
 
 st.markdown("### 📊 Quick Summary")
 st.markdown(
@@ -146,6 +148,18 @@ with tab1:
             st.success("Session added.")
             st.rerun()
 
+    # Bulk import of past sessions, e.g. an exported session log or a spreadsheet
+    with st.expander("📥 Import Past Sessions (CSV)"):
+        import_file = st.file_uploader("Session CSV", type=["csv"], key="session_import_file")
+        if import_file is not None and st.button("Import Sessions"):
+            try:
+                for chunk in read_session_chunks(import_file, require_date=False):
+                    st.session_state.tracker.extend(tracker_entries(chunk, timestamps=True))
+            except ValueError as e:
+                st.error(f"Could not import {import_file.name}: {e}")
+            else:
+                st.rerun()
+
 # --- Log Table ---
 with tab2:
     st.subheader("🧾 Session Log")
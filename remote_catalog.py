@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from game_catalog import CACHE_DIR, CATALOG_URL, _cache_paths
+
+# Downloaded versions kept on disk: the current one and the one before it
+KEEP_VERSIONS = 2
+
+
+class RemoteCatalog:
+    """The remote catalog CSV, kept in the disk cache and revalidated in the background.
+
+    Each version is stored under its content hash and a small JSON state file
+    points at the current one, along with the server's ETag / Last-Modified.
+    Once `ttl` seconds have passed since the last check, path() starts a
+    conditional GET on a background thread and keeps returning the stale copy;
+    a 304 only renews the check. A changed catalog is downloaded, handed to
+    `on_update(path)` (e.g. to parse and cache it ahead of time) and only then
+    swapped in. Only the first fetch, with nothing on disk, blocks the caller.
+    """
+
+    def __init__(self, url=CATALOG_URL, cache_dir=CACHE_DIR, ttl=3600, on_update=None, timeout=30):
+        self.url = url
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.on_update = on_update
+        self.timeout = timeout
+        self.state_path = self.cache_dir / "remote_catalog.json"
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._thread = None
+        self._state = self._read_state()
+
+    def _read_state(self):
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if state.get('url') != self.url or not (self.cache_dir / state.get('file', '')).is_file():
+            return {}
+        return state
+
+    def path(self):
+        """Path of the current copy; starts a background revalidation once the TTL has passed"""
+        with self._lock:
+            state = self._state
+            if state and time.time() - state['checked'] >= self.ttl and self._thread is None:
+                self._thread = threading.Thread(target=self._background_refresh, name="catalog-refresh",
+                                                daemon=True)
+                self._thread.start()
+        if not state:
+            with self._fetch_lock:
+                if not self._state:
+                    self._fetch()
+            state = self._state
+        return self.cache_dir / state['file']
+
+    def refresh(self):
+        """Revalidate now, on this thread; True when a new version was swapped in"""
+        with self._fetch_lock:
+            return self._fetch()
+
+    def wait(self, timeout=None):
+        """Wait for a background refresh in progress, if any"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+            self.last_error = None
+        except Exception as e:
+            # Offline, server error or unparseable download: keep serving the stale copy until the next TTL
+            self.last_error = e
+            self._swap({**self._state, 'checked': time.time()}, write=False)
+        finally:
+            with self._lock:
+                self._thread = None
+
+    def _fetch(self):
+        state = self._state
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        request = urllib.request.Request(self.url, headers=headers)
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or not state:
+                raise
+            self._swap({**state, 'checked': time.time()})
+            return False
+
+        with response:
+            path, digest = self._store(response)
+            fetched = {
+                'url': self.url,
+                'file': path.name,
+                'sha256': digest,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'checked': time.time()
+            }
+        changed = digest != state.get('sha256')
+        if changed and self.on_update is not None:
+            self.on_update(path)
+        self._swap(fetched)
+        if changed:
+            self._prune()
+        return changed
+
+    def _store(self, response):
+        """Stream the body to disk and name it by its content hash"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        tmp = self.cache_dir / f"remote-{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            for chunk in iter(lambda: response.read(1 << 20), b''):
+                digest.update(chunk)
+                f.write(chunk)
+        digest = digest.hexdigest()
+        path = self.cache_dir / f"remote-{digest[:16]}.csv"
+        if path.exists():
+            # Same content again (e.g. a server without validators): keep the file and its mtime
+            tmp.unlink()
+        else:
+            os.replace(tmp, path)
+        return path, digest
+
+    def _swap(self, state, write=True):
+        with self._lock:
+            self._state = state
+        if write:
+            tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, self.state_path)
+
+    def _prune(self):
+        versions = sorted(self.cache_dir.glob("remote-*.csv"), key=lambda path: path.stat().st_mtime_ns,
+                          reverse=True)
+        for path in versions[KEEP_VERSIONS:]:
+            for stale in (path, *_cache_paths(path, self.cache_dir)):
+                stale.unlink(missing_ok=True)
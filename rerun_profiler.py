@@ -0,0 +1,221 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Optional outputs: one JSON line per rerun, and a Prometheus text-format file (e.g. for the
+# node_exporter textfile collector) rewritten after every rerun
+PROFILE_LOG = os.environ.get("PROFIT_HOPPER_PROFILE_LOG")
+METRICS_PATH = os.environ.get("PROFIT_HOPPER_METRICS")
+
+METRIC_PREFIX = "profit_hopper"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+class RerunProfiler:
+    """Timings of one script rerun: named sections of the script and each cached call.
+
+    Sections are laps - `checkpoint(name)` charges the time since the previous
+    checkpoint to `name` - so a long script body can be split without
+    re-indenting it. The profiler of the running rerun is kept per thread,
+    which is how Streamlit runs each session's script.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.sections = {}
+        self.calls = []
+        self.misses = 0
+        _local.profiler = self
+
+    def checkpoint(self, name):
+        now = time.perf_counter()
+        self.sections[name] = self.sections.get(name, 0.0) + (now - self.last)
+        self.last = now
+
+    def record_call(self, name, seconds, hit):
+        self.calls.append({'name': name, 'seconds': seconds, 'hit': hit})
+
+    def finish(self):
+        """Close the rerun, write the configured outputs and return its record"""
+        record = {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'total': time.perf_counter() - self.started,
+            'sections': self.sections,
+            'calls': self.calls
+        }
+        if _local.__dict__.get('profiler') is self:
+            del _local.profiler
+        if PROFILE_LOG or METRICS_PATH:
+            with _write_lock:
+                if PROFILE_LOG:
+                    append_jsonl(PROFILE_LOG, record)
+                if METRICS_PATH:
+                    _metrics.add(record)
+                    write_atomic(METRICS_PATH, _metrics.render())
+        return record
+
+
+def current():
+    """Profiler of the rerun running on this thread, or None"""
+    return _local.__dict__.get('profiler')
+
+
+def note_miss():
+    """Called from inside a cached function's body, which only runs on a cache miss"""
+    profiler = current()
+    if profiler is not None:
+        profiler.misses += 1
+
+
+def profiled(name, cache_misses=None):
+    """Time calls of a cached function and record whether they hit its cache.
+
+    A call is a miss if the function body called note_miss() (for Streamlit
+    caches) or `cache_misses()` - a running miss count such as
+    compute_core.cache_misses - went up during the call. The latter is process
+    wide, so a miss in a concurrent session can occasionally be charged here.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = current()
+            if profiler is None:
+                return func(*args, **kwargs)
+            noted = profiler.misses
+            counted = cache_misses() if cache_misses else 0
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                missed = profiler.misses > noted or (cache_misses is not None and cache_misses() > counted)
+                profiler.record_call(name, seconds, not missed)
+        return wrapper
+    return decorator
+
+
+# Outputs
+
+def append_jsonl(path, record):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def write_atomic(path, text):
+    """Replace a file in one step so scrapers never read it half written"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_text(text)
+    os.replace(temp, path)
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = np.zeros(len(LATENCY_BUCKETS), dtype=np.int64)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[np.searchsorted(LATENCY_BUCKETS, seconds):] += 1
+        self.total += 1
+        self.sum += seconds
+
+    def lines(self, metric, labels=""):
+        separator = "," if labels else ""
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            yield f'{metric}_bucket{{{labels}{separator}le="{bound}"}} {count}'
+        yield f'{metric}_bucket{{{labels}{separator}le="+Inf"}} {self.total}'
+        yield f"{metric}_sum{{{labels}}} {self.sum}" if labels else f"{metric}_sum {self.sum}"
+        yield f"{metric}_count{{{labels}}} {self.total}" if labels else f"{metric}_count {self.total}"
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusMetrics:
+    """Cumulative latency histograms of this process's reruns, sections and cached calls"""
+
+    def __init__(self):
+        self.reruns = _Histogram()
+        self.sections = {}
+        self.calls = {}
+
+    def add(self, record):
+        self.reruns.observe(record['total'])
+        for name, seconds in record['sections'].items():
+            self.sections.setdefault(name, _Histogram()).observe(seconds)
+        for call in record['calls']:
+            key = (call['name'], "hit" if call['hit'] else "miss")
+            self.calls.setdefault(key, _Histogram()).observe(call['seconds'])
+
+    def render(self):
+        lines = [
+            f"# HELP {METRIC_PREFIX}_rerun_seconds Duration of a full app rerun.",
+            f"# TYPE {METRIC_PREFIX}_rerun_seconds histogram",
+            *self.reruns.lines(f"{METRIC_PREFIX}_rerun_seconds"),
+            f"# HELP {METRIC_PREFIX}_section_seconds Time spent in a named section of a rerun.",
+            f"# TYPE {METRIC_PREFIX}_section_seconds histogram"
+        ]
+        for name, histogram in sorted(self.sections.items()):
+            lines.extend(histogram.lines(f"{METRIC_PREFIX}_section_seconds", f'section="{_label(name)}"'))
+        lines += [
+            f"# HELP {METRIC_PREFIX}_cached_call_seconds Duration of a cached call by cache result.",
+            f"# TYPE {METRIC_PREFIX}_cached_call_seconds histogram"
+        ]
+        for (name, result), histogram in sorted(self.calls.items()):
+            lines.extend(histogram.lines(f"{METRIC_PREFIX}_cached_call_seconds",
+                                         f'function="{_label(name)}",result="{result}"'))
+        return "\n".join(lines) + "\n"
+
+
+_metrics = PrometheusMetrics()
+
+
+# Reading logs back
+
+def read_log(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def latency_summary(records, percentiles=(50, 90, 99)):
+    """Count and latency percentiles (ms) of reruns, each section and each cached call"""
+    samples = {'rerun': [record['total'] for record in records]}
+    for record in records:
+        for name, seconds in record['sections'].items():
+            samples.setdefault(f"section {name}", []).append(seconds)
+        for call in record['calls']:
+            result = "hit" if call['hit'] else "miss"
+            samples.setdefault(f"call {call['name']} ({result})", []).append(call['seconds'])
+    return {
+        name: {'count': len(values), **{f"p{q}": float(np.percentile(values, q)) * 1000 for q in percentiles}}
+        for name, values in samples.items() if values
+    }
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("usage: python rerun_profiler.py <profile log (JSON lines)>")
+    summary = latency_summary(read_log(sys.argv[1]))
+    print(f"{'':<45}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for name, stats in summary.items():
+        print(f"{name:<45}{stats['count']:>8}{stats['p50']:>10.2f}{stats['p90']:>10.2f}{stats['p99']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import math
+
+import numpy as np
+
+from bankroll_sim import win_probability_for_edge
+
+PROGRESSIONS = ["Martingale", "D'Alembert"]
+
+
+def progression_levels(strategy, base_bet, table_max):
+    """Bet size (in base-bet units) and next level after a win / loss for each progression level.
+
+    Martingale doubles after a loss and resets after a win; once the doubled
+    bet would exceed the table maximum, a loss abandons the progression and
+    resets to the base bet. D'Alembert adds one unit after a loss and removes
+    one after a win, holding at the base bet and at the table maximum.
+    """
+    if base_bet <= 0 or table_max < base_bet:
+        raise ValueError("table_max must be at least the base bet")
+    max_units = int(table_max // base_bet)
+
+    if strategy == "Martingale":
+        top = int(math.log2(max_units))
+        bets = 2 ** np.arange(top + 1)
+        win_next = np.zeros(top + 1, dtype=int)
+        loss_next = np.append(np.arange(1, top + 1), 0)
+    elif strategy == "D'Alembert":
+        bets = np.arange(1, max_units + 1)
+        win_next = np.maximum(np.arange(max_units) - 1, 0)
+        loss_next = np.minimum(np.arange(max_units) + 1, max_units - 1)
+    else:
+        raise ValueError(f"Unknown progression: {strategy}")
+    return bets, win_next, loss_next
+
+
+def _reset_levels(mass, low, high):
+    """Fold the mass of every progression level back onto the base bet"""
+    active = np.flatnonzero(high >= low)
+    lo, hi = low[active].min(), high[active].max()
+    combined = mass[active, lo:hi + 1].sum(axis=0)
+    mass[active, lo:hi + 1] = 0.0
+    mass[0, lo:hi + 1] = combined
+    low = np.full(len(low), 1)
+    high = np.full(len(high), 0)
+    low[0], high[0] = lo, hi
+    return mass, low, high
+
+
+def solve_progression(strategy, initial_bankroll, house_edge, base_bet, table_max, num_bets,
+                      bets_per_session=None):
+    """Exact risk of ruin and final bankroll distribution for a betting progression.
+
+    Propagates the probability mass over (bet level, bankroll) states one even-money
+    bet at a time, with every bankroll of a level updated in a single array operation.
+    The bankroll is tracked in whole base-bet units; when the progression calls for
+    more than is left, the remaining units are bet. Ruin is reaching zero units,
+    i.e. no longer being able to cover the base bet. With `bets_per_session`, the
+    progression restarts from the base bet at the start of every session.
+    """
+    bets, win_next, loss_next = progression_levels(strategy, base_bet, table_max)
+    p = win_probability_for_edge(house_edge)
+    q = 1 - p
+
+    start_units = int(initial_bankroll // base_bet)
+    remainder = initial_bankroll - start_units * base_bet
+    if start_units < 1:
+        raise ValueError("initial_bankroll must cover at least one base bet")
+
+    num_levels = len(bets)
+    # Bankroll window [low, high] holding probability mass at each level (empty when high < low)
+    low = np.full(num_levels, 1)
+    high = np.full(num_levels, 0)
+    low[0] = high[0] = start_units
+    width = start_units + 2 * int(bets.max()) + 1
+    mass = np.zeros((num_levels, width))
+    spare = np.zeros_like(mass)
+    mass[0, start_units] = 1.0
+
+    ruin_by_bet = np.zeros(num_bets + 1)
+    ruined = 0.0
+
+    for bet_index in range(num_bets):
+        if bets_per_session and bet_index and bet_index % bets_per_session == 0:
+            mass, low, high = _reset_levels(mass, low, high)
+
+        needed = int((high + bets).max()) + 1
+        if needed > width:
+            # Grow the bankroll axis geometrically so reallocation stays rare
+            width = max(needed, 2 * width)
+            mass = np.pad(mass, ((0, 0), (0, width - mass.shape[1])))
+            spare = np.zeros_like(mass)
+
+        new_mass = spare
+        new_low = np.full(num_levels, width)
+        new_high = np.full(num_levels, -1)
+        for j in range(num_levels):
+            lo, hi = low[j], high[j]
+            if hi < lo:
+                continue
+            b = int(bets[j])
+            win_level = win_next[j]
+            loss_level = loss_next[j]
+
+            full = max(lo, b)
+            if hi >= full:
+                # Full bets: bankroll x moves to x + b or x - b
+                row = mass[j, full:hi + 1]
+                new_mass[win_level, full + b:hi + b + 1] += p * row
+                new_mass[loss_level, full - b:hi - b + 1] += q * row
+                new_low[win_level] = min(new_low[win_level], full + b)
+                new_high[win_level] = max(new_high[win_level], hi + b)
+                new_low[loss_level] = min(new_low[loss_level], full - b)
+                new_high[loss_level] = max(new_high[loss_level], hi - b)
+            if lo < b:
+                # Short of the full bet: the remaining x units go in, doubling or busting
+                short = min(b - 1, hi)
+                row = mass[j, lo:short + 1]
+                new_mass[win_level, 2 * lo:2 * short + 1:2] += p * row
+                ruined += q * row.sum()
+                new_low[win_level] = min(new_low[win_level], 2 * lo)
+                new_high[win_level] = max(new_high[win_level], 2 * short)
+
+        # Landing on zero units is ruin
+        ruined += new_mass[:, 0].sum()
+        new_mass[:, 0] = 0.0
+        new_low = np.maximum(new_low, 1)
+
+        # Clear the old windows so the buffer can be reused next step
+        for j in range(num_levels):
+            if high[j] >= low[j]:
+                mass[j, low[j]:high[j] + 1] = 0.0
+        spare = mass
+        mass = new_mass
+        low, high = new_low, new_high
+        ruin_by_bet[bet_index + 1] = ruined
+
+    units = np.arange(mass.shape[1])
+    final = mass.sum(axis=0)
+    final[0] = ruined
+    support = np.flatnonzero(final)
+    values = units[support] * base_bet + remainder
+    probabilities = final[support]
+
+    return {
+        "bankroll_values": values,
+        "probabilities": probabilities,
+        "ruin_probability": float(ruined),
+        "ruin_by_bet": ruin_by_bet,
+        "expected_final": float(values @ probabilities),
+        "profit_probability": float(probabilities[values > initial_bankroll].sum())
+    }
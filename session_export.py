@@ -0,0 +1,89 @@
+import csv
+import gzip
+import io
+import tempfile
+
+from session_store import SESSION_COLUMNS
+
+# Parquet export needs pyarrow; the format is not offered without it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except Exception:
+    _HAS_PYARROW = False
+
+# Label shown in the app -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip")
+}
+if _HAS_PYARROW:
+    EXPORT_FORMATS["Parquet"] = ("parquet", "application/vnd.apache.parquet")
+
+CHUNK_SIZE = 5000
+# Exports stay in memory up to this size and spill to a temporary file beyond it
+SPOOL_BYTES = 8 * 1024 * 1024
+
+
+def export_file_name(stem, fmt):
+    return f"{stem}.{EXPORT_FORMATS[fmt][0]}"
+
+
+def export_mime(fmt):
+    return EXPORT_FORMATS[fmt][1]
+
+
+def write_chunks(chunks, columns, fmt):
+    """Write an iterable of row-dict chunks in `fmt` and return the rewound file.
+
+    Rows are encoded one chunk at a time into a spooled temporary file, so the
+    full table is never materialized as a DataFrame or a string.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    if fmt == "Parquet":
+        _write_parquet(chunks, columns, out)
+    else:
+        raw = gzip.GzipFile(fileobj=out, mode='wb', mtime=0) if fmt == "CSV (gzip)" else out
+        text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        writer = csv.DictWriter(text, fieldnames=columns, extrasaction='ignore', lineterminator='\n')
+        writer.writeheader()
+        for chunk in chunks:
+            writer.writerows(chunk)
+        # Detach so closing the wrapper chain does not close `out`
+        text.flush()
+        text.detach()
+        if raw is not out:
+            raw.close()
+    out.seek(0)
+    return out
+
+
+def _write_parquet(chunks, columns, out):
+    writer = None
+    for chunk in chunks:
+        table = pa.Table.from_pylist(chunk).select(columns)
+        if writer is None:
+            writer = pq.ParquetWriter(out, table.schema)
+        elif table.schema != writer.schema:
+            table = table.cast(writer.schema)
+        writer.write_table(table)
+    if writer is None:
+        # No rows: still write a valid file with the expected columns
+        writer = pq.ParquetWriter(out, pa.Table.from_pydict({col: [] for col in columns}).schema)
+    writer.close()
+
+
+def export_sessions(store, fmt, trip_id=None, chunk_size=CHUNK_SIZE):
+    """Stream a trip's sessions (or the whole history) from the store into an export file"""
+    return write_chunks(store.iter_session_chunks(trip_id, chunk_size), SESSION_COLUMNS, fmt)
+
+
+def export_frame(df, fmt, chunk_size=CHUNK_SIZE):
+    """Export a DataFrame chunk by chunk"""
+    chunks = (
+        df.iloc[start:start + chunk_size].to_dict('records') for start in range(0, len(df), chunk_size)
+    )
+    return write_chunks(chunks, [str(col) for col in df.columns], fmt)
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+
+from game_catalog import game_key, normalize_column_name
+
+# Rows read, validated and inserted at a time; bounds memory for any file size
+IMPORT_CHUNK_SIZE = 5000
+
+# Standard session fields and the (normalized) headers they may appear as in spreadsheets,
+# tracker exports and player-card win/loss statements
+SESSION_COLUMN_MAP = {
+    'date': ['date', 'session_date', 'date_time', 'datetime', 'played_on', 'day', 'gaming_date'],
+    'game': ['game', 'game_played', 'game_machine_name', 'game_name', 'machine', 'name', 'title'],
+    'money_in': ['money_in', 'amount_in', 'amount_inserted', 'buy_in', 'cash_in', 'coin_in', 'in'],
+    'money_out': ['money_out', 'amount_out', 'cashout_amount', 'cashout', 'cash_out', 'coin_out', 'out'],
+    'profit': ['profit', 'win_loss', 'profit_loss', 'net', 'net_win_loss', 'result'],
+    'casino': ['casino', 'property', 'location'],
+    'notes': ['notes', 'session_notes', 'note', 'comments']
+}
+
+REJECT_REASONS = ['invalid date', 'missing game', 'invalid amount', 'negative amount']
+
+
+def normalize_header(name):
+    """normalize_column_name without the edge underscores left by symbols like "($)" """
+    return normalize_column_name(str(name)).strip('_')
+
+
+def session_columns(headers, require_date=True):
+    """Standard field -> source header for a file's headers; raises if the file cannot be imported"""
+    normalized = {normalize_header(header): header for header in headers}
+    columns = {}
+    for standard, variants in SESSION_COLUMN_MAP.items():
+        for variant in variants:
+            if variant in normalized:
+                columns[standard] = normalized[variant]
+                break
+
+    missing = [col for col in (('date', 'game') if require_date else ('game',)) if col not in columns]
+    if 'profit' not in columns and not {'money_in', 'money_out'} <= columns.keys():
+        missing.append("money_in and money_out, or profit")
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    return columns
+
+
+def game_lookup(game_names):
+    """Series mapping game keys to catalog names (first catalog row wins)"""
+    names = pd.Series(pd.unique(pd.Series(game_names, dtype=str)), dtype=str)
+    lookup = pd.Series(names.to_numpy(), index=game_key(names))
+    return lookup[~lookup.index.duplicated()]
+
+
+def parse_amounts(values):
+    """Numbers from money text such as "$1,250.00" or "(12.50)" (negative); NaN when unparseable"""
+    text = values.astype(str).str.strip()
+    negative = text.str.startswith('(') & text.str.endswith(')')
+    amounts = pd.to_numeric(text.str.replace(r'[$,()\s]', '', regex=True), errors='coerce').to_numpy(np.float64)
+    return np.where(negative.to_numpy(), -np.abs(amounts), amounts)
+
+
+def parse_dates(values):
+    """YYYY-MM-DD strings (None when unparseable); ISO dates take a fast path, others are parsed one by one"""
+    parsed = pd.to_datetime(values, format='ISO8601', errors='coerce')
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(values[retry], format='mixed', errors='coerce')
+    return parsed.dt.strftime('%Y-%m-%d').where(parsed.notna(), None)
+
+
+def empty_report():
+    return {'rows': 0, 'imported': 0, 'rejected': dict.fromkeys(REJECT_REASONS, 0), 'matched_games': 0,
+            'unmatched_games': set()}
+
+
+def prepare_chunk(raw, columns, casino="", lookup=None, report=None):
+    """Validated, typed session rows of one raw chunk (all text); rejected rows are counted in `report`.
+
+    Money in / out take precedence; with only a net win/loss, a loss counts as
+    money in and a win as money out. Games are replaced by their catalog name
+    when `lookup` (from game_lookup) knows them.
+    """
+    report = empty_report() if report is None else report
+    report['rows'] += len(raw)
+
+    dates = parse_dates(raw[columns['date']]) if 'date' in columns else pd.Series(None, index=raw.index, dtype=object)
+    games = raw[columns['game']].fillna("").astype(str).str.strip()
+    if 'money_in' in columns and 'money_out' in columns:
+        money_in = parse_amounts(raw[columns['money_in']])
+        money_out = parse_amounts(raw[columns['money_out']])
+        profit = money_out - money_in
+    else:
+        profit = parse_amounts(raw[columns['profit']])
+        money_in = np.maximum(-profit, 0.0)
+        money_out = np.maximum(profit, 0.0)
+
+    checks = {
+        'invalid date': dates.isna().to_numpy() & ('date' in columns),
+        'missing game': (games == "").to_numpy(),
+        'invalid amount': ~(np.isfinite(money_in) & np.isfinite(money_out)),
+        'negative amount': (money_in < 0) | (money_out < 0)
+    }
+    # Each rejected row is counted once, under its first failing check
+    rejected = np.zeros(len(raw), dtype=bool)
+    for reason in REJECT_REASONS:
+        failing = checks[reason] & ~rejected
+        report['rejected'][reason] += int(failing.sum())
+        rejected |= failing
+    keep = ~rejected
+
+    games = games[keep]
+    if lookup is not None and len(lookup):
+        matched = game_key(games).map(lookup)
+        found = matched.notna()
+        report['matched_games'] += int(found.sum())
+        report['unmatched_games'].update(games[~found].unique())
+        games = matched.where(found, games)
+
+    notes = raw[columns['notes']][keep].fillna("").astype(str).to_numpy() if 'notes' in columns else ""
+    casinos = raw[columns['casino']][keep].fillna(casino).astype(str).to_numpy() if 'casino' in columns else casino
+    return pd.DataFrame({
+        'date': dates[keep].to_numpy(),
+        'casino': casinos,
+        'game': games.to_numpy(),
+        'money_in': money_in[keep],
+        'money_out': money_out[keep],
+        'profit': profit[keep],
+        'notes': notes
+    }, index=pd.RangeIndex(int(keep.sum())))
+
+
+def read_session_chunks(source, casino="", game_names=None, chunk_size=IMPORT_CHUNK_SIZE, report=None,
+                        require_date=True):
+    """Yield validated session frames from a CSV path or file object, `chunk_size` rows at a time.
+
+    Without `require_date`, files with no date column are accepted and their rows have no date.
+    """
+    lookup = game_lookup(game_names) if game_names is not None else None
+    columns = None
+    for raw in pd.read_csv(source, dtype=str, chunksize=chunk_size, skipinitialspace=True):
+        if columns is None:
+            columns = session_columns(raw.columns, require_date)
+        yield prepare_chunk(raw, columns, casino, lookup, report)
+
+
+def import_sessions(store, source, trip_id, casino="", game_names=None, chunk_size=IMPORT_CHUNK_SIZE,
+                    on_chunk=None):
+    """Import a CSV of past sessions into a trip, one bulk insert per chunk, and return the import report.
+
+    Files are rarely in date order, so the trip's running profit is brought up
+    to date once, from the earliest imported date, after the last chunk rather
+    than after each one. `on_chunk(report)` is called after every chunk, e.g.
+    to show progress.
+    """
+    report = empty_report()
+    earliest = None
+    for chunk in read_session_chunks(source, casino, game_names, chunk_size, report):
+        if not len(chunk):
+            continue
+        chunk['trip_id'] = trip_id
+        report['imported'] += store.add_sessions(chunk.to_dict('records'), running_profit=False)
+        earliest = min(earliest or chunk['date'].min(), chunk['date'].min())
+        if on_chunk is not None:
+            on_chunk(report)
+    if earliest is not None:
+        store.update_running_profit(trip_id, earliest)
+    return report
+
+
+def tracker_entries(chunk, timestamps=False):
+    """Rows of a prepared chunk in the session-state tracker format of profit_hopper.py; `timestamps`
+    adds the "Date/Time" column of profit_hopper_with_game_order.py"""
+    entries = [{
+        "Game": game,
+        "Amount In": money_in,
+        "Amount Out": money_out,
+        "Win/Loss": profit,
+        "Bonus Hit": "",
+        "Rule Followed": "",
+        "Notes": notes
+    } for game, money_in, money_out, profit, notes in zip(
+        chunk['game'], chunk['money_in'], chunk['money_out'], chunk['profit'], chunk['notes'])]
+    if timestamps:
+        stamps = pd.to_datetime(chunk['date']).dt.strftime("%I:%M %p %m/%d/%Y").fillna("")
+        entries = [{"Date/Time": stamp, **entry} for stamp, entry in zip(stamps, entries)]
+    return entries
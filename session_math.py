@@ -0,0 +1,42 @@
+# Session plan shares of the session bankroll (profit_hopper_app.py, profit_hopper_modern.py)
+MAX_BET_SHARE = 0.25
+STOP_LOSS_SHARE = 0.6
+
+# Session unit divided by these gives the max bet per risk level (profit_hopper.py uses "Low")
+RISK_BET_DIVISORS = {"Low": 40, "Medium": 30, "High": 20}
+
+
+def session_plan(total_bankroll, num_sessions, max_bet_share=MAX_BET_SHARE, stop_loss_share=STOP_LOSS_SHARE):
+    """Per-session bankroll, max bet and stop loss for a trip bankroll split into sessions"""
+    session_bankroll = total_bankroll / num_sessions
+    return {
+        'session_bankroll': session_bankroll,
+        'max_bet': session_bankroll * max_bet_share,
+        'stop_loss': session_bankroll * stop_loss_share
+    }
+
+
+def unit_plan(bankroll, num_sessions, risk, profit_goal_percent):
+    """Session unit, max bet per spin and cash-out target for the risk-level apps"""
+    session_unit = bankroll / num_sessions
+    return {
+        'session_unit': session_unit,
+        'max_bet': session_unit / RISK_BET_DIVISORS[risk],
+        'profit_goal': bankroll * (1 + profit_goal_percent / 100)
+    }
+
+
+def trip_summary(starting_bankroll, sessions, total_profit, total_invested):
+    """Current bankroll, ROI (%) and average session profit from a trip's running totals"""
+    return {
+        'current_bankroll': starting_bankroll + total_profit,
+        'roi': (total_profit / total_invested) * 100 if total_invested > 0 else 0,
+        'avg_session_profit': total_profit / sessions if sessions else 0.0
+    }
+
+
+def tracker_totals(amounts_in, amounts_out):
+    """Money in, money out and net for a tracker log's amount columns"""
+    total_in = float(sum(amounts_in))
+    total_out = float(sum(amounts_out))
+    return {'total_in': total_in, 'total_out': total_out, 'net': total_out - total_in}
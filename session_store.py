@@ -0,0 +1,339 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+DB_PATH = Path(os.environ.get("PROFIT_HOPPER_DB", APP_DIR / "profit_hopper.db"))
+
+SESSION_COLUMNS = ["session_id", "trip_id", "date", "casino", "game", "money_in", "money_out", "profit", "notes"]
+SCHEMA_VERSION = 2
+TRIP_COLUMNS = ["trip_id", "casino", "starting_bankroll", "num_sessions", "created_at"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trips (
+    trip_id INTEGER PRIMARY KEY,
+    casino TEXT NOT NULL,
+    starting_bankroll REAL NOT NULL,
+    num_sessions INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    trip_id INTEGER NOT NULL REFERENCES trips(trip_id),
+    date TEXT NOT NULL,
+    casino TEXT NOT NULL,
+    game TEXT NOT NULL,
+    money_in REAL NOT NULL,
+    money_out REAL NOT NULL,
+    profit REAL NOT NULL,
+    notes TEXT NOT NULL DEFAULT '',
+    cumulative_profit REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS trip_stats (
+    trip_id INTEGER PRIMARY KEY REFERENCES trips(trip_id),
+    sessions INTEGER NOT NULL,
+    total_profit REAL NOT NULL,
+    total_invested REAL NOT NULL,
+    wins INTEGER NOT NULL,
+    min_profit REAL NOT NULL,
+    max_profit REAL NOT NULL,
+    first_date TEXT NOT NULL,
+    last_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trip_game_stats (
+    trip_id INTEGER NOT NULL REFERENCES trips(trip_id),
+    game TEXT NOT NULL,
+    sessions INTEGER NOT NULL,
+    total_profit REAL NOT NULL,
+    total_invested REAL NOT NULL,
+    PRIMARY KEY (trip_id, game)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_trip_date ON sessions(trip_id, date);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date);
+CREATE INDEX IF NOT EXISTS idx_sessions_game ON sessions(game, trip_id);
+"""
+
+SESSION_SELECT = "SELECT " + ", ".join(SESSION_COLUMNS) + " FROM sessions"
+
+EMPTY_TRIP_STATS = {
+    'sessions': 0, 'total_profit': 0.0, 'total_invested': 0.0, 'wins': 0,
+    'min_profit': None, 'max_profit': None, 'first_date': None, 'last_date': None
+}
+
+
+class SessionStore:
+    """Persistent trips and sessions in SQLite (WAL mode).
+
+    Sessions are indexed by trip and date, by date and by game, so the
+    per-trip lookups the app makes on every rerun are index range scans
+    instead of passes over the full history. One connection is shared
+    behind a lock, so a single store can serve every Streamlit session.
+
+    Per-trip totals, per-game totals and each session's running profit are
+    maintained in the same transaction that inserts a session, so summary
+    numbers are single-row reads however long the history grows.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = str(path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            with self.conn:
+                # DDL does not open a transaction implicitly; without BEGIN a failed migration
+                # would leave the columns it added committed and user_version behind
+                self.conn.execute("BEGIN")
+                self._migrate()
+                self._create_schema()
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _create_schema(self):
+        # One statement at a time: executescript() would commit the open transaction first
+        for statement in SCHEMA.split(";"):
+            if statement.strip():
+                self.conn.execute(statement)
+
+    def _migrate(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        tables = {row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if version < 2 and 'sessions' in tables:
+            # Version 1 stores had no aggregates; add the running profit and backfill them below
+            self.conn.execute("ALTER TABLE sessions ADD COLUMN cumulative_profit REAL NOT NULL DEFAULT 0")
+            self._create_schema()
+            self._rebuild_aggregates()
+
+    def _rebuild_aggregates(self):
+        """Recompute every aggregate from the session rows"""
+        self.conn.execute("DELETE FROM trip_stats")
+        self.conn.execute("DELETE FROM trip_game_stats")
+        self.conn.execute(
+            "INSERT INTO trip_stats SELECT trip_id, COUNT(*), SUM(profit), SUM(money_in), SUM(profit >= 0), "
+            "MIN(profit), MAX(profit), MIN(date), MAX(date) FROM sessions GROUP BY trip_id"
+        )
+        self.conn.execute(
+            "INSERT INTO trip_game_stats SELECT trip_id, game, COUNT(*), SUM(profit), SUM(money_in) "
+            "FROM sessions GROUP BY trip_id, game"
+        )
+        self.conn.execute(
+            "UPDATE sessions SET cumulative_profit = running.total FROM ("
+            "SELECT session_id, SUM(profit) OVER (PARTITION BY trip_id ORDER BY date, session_id) AS total "
+            "FROM sessions) AS running WHERE sessions.session_id = running.session_id"
+        )
+
+    def close(self):
+        self.conn.close()
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    # Trips
+
+    def start_trip(self, casino, starting_bankroll, num_sessions):
+        """Create a trip and return its id"""
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO trips (casino, starting_bankroll, num_sessions, created_at) VALUES (?, ?, ?, ?)",
+                (casino, float(starting_bankroll), int(num_sessions), datetime.now().isoformat(timespec='seconds'))
+            )
+            return cursor.lastrowid
+
+    def save_trip(self, trip_id, casino, starting_bankroll, num_sessions):
+        """Update a trip's settings"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE trips SET casino = ?, starting_bankroll = ?, num_sessions = ? WHERE trip_id = ?",
+                (casino, float(starting_bankroll), int(num_sessions), trip_id)
+            )
+
+    def get_trip(self, trip_id):
+        rows = self._query("SELECT * FROM trips WHERE trip_id = ?", (trip_id,))
+        return rows[0] if rows else None
+
+    def latest_trip(self):
+        rows = self._query("SELECT * FROM trips ORDER BY trip_id DESC LIMIT 1")
+        return rows[0] if rows else None
+
+    def trips(self):
+        return self._query("SELECT * FROM trips ORDER BY trip_id")
+
+    # Sessions
+
+    def add_session(self, session):
+        """Insert one session (a session_log-style dict), update the trip aggregates and return its id"""
+        trip_id, date, game = session['trip_id'], session['date'], session['game']
+        profit, money_in = float(session['profit']), float(session['money_in'])
+        with self.lock, self.conn:
+            # Running profit through every earlier-or-same-date session of the trip
+            previous = self.conn.execute(
+                "SELECT cumulative_profit FROM sessions WHERE trip_id = ? AND date <= ? "
+                "ORDER BY date DESC, session_id DESC LIMIT 1", (trip_id, date)
+            ).fetchone()
+            cursor = self.conn.execute(
+                "INSERT INTO sessions (trip_id, date, casino, game, money_in, money_out, profit, notes, "
+                "cumulative_profit) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (trip_id, date, session['casino'], game, money_in, session['money_out'], profit,
+                 session.get('notes', ''), (previous[0] if previous else 0.0) + profit)
+            )
+            # Only a backdated session shifts the running profit of later ones
+            self.conn.execute(
+                "UPDATE sessions SET cumulative_profit = cumulative_profit + ? WHERE trip_id = ? AND date > ?",
+                (profit, trip_id, date)
+            )
+            self.conn.execute(
+                "INSERT INTO trip_stats VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (trip_id) DO UPDATE SET "
+                "sessions = sessions + 1, total_profit = total_profit + excluded.total_profit, "
+                "total_invested = total_invested + excluded.total_invested, wins = wins + excluded.wins, "
+                "min_profit = MIN(min_profit, excluded.min_profit), max_profit = MAX(max_profit, excluded.max_profit), "
+                "first_date = MIN(first_date, excluded.first_date), last_date = MAX(last_date, excluded.last_date)",
+                (trip_id, profit, money_in, int(profit >= 0), profit, profit, date, date)
+            )
+            self.conn.execute(
+                "INSERT INTO trip_game_stats VALUES (?, ?, 1, ?, ?) ON CONFLICT (trip_id, game) DO UPDATE SET "
+                "sessions = sessions + 1, total_profit = total_profit + excluded.total_profit, "
+                "total_invested = total_invested + excluded.total_invested",
+                (trip_id, game, profit, money_in)
+            )
+            return cursor.lastrowid
+
+    def add_sessions(self, sessions, running_profit=True):
+        """Insert many sessions (session_log-style dicts) in one transaction and return how many.
+
+        Aggregates are updated with one grouped upsert over the new rows, and
+        running profits are recomputed per affected trip from the earliest new
+        date on, so a chunk costs a few statements instead of several per row.
+        A bulk load of many chunks can pass running_profit=False and call
+        update_running_profit once at the end instead.
+        """
+        rows = [(s['trip_id'], s['date'], s['casino'], s['game'], float(s['money_in']), float(s['money_out']),
+                 float(s['profit']), s.get('notes', '')) for s in sessions]
+        if not rows:
+            return 0
+        with self.lock, self.conn:
+            last_id = self.conn.execute("SELECT COALESCE(MAX(session_id), 0) FROM sessions").fetchone()[0]
+            self.conn.executemany(
+                "INSERT INTO sessions (trip_id, date, casino, game, money_in, money_out, profit, notes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self.conn.execute(
+                "INSERT INTO trip_stats SELECT trip_id, COUNT(*), SUM(profit), SUM(money_in), SUM(profit >= 0), "
+                "MIN(profit), MAX(profit), MIN(date), MAX(date) FROM sessions WHERE session_id > ? GROUP BY trip_id "
+                "ON CONFLICT (trip_id) DO UPDATE SET "
+                "sessions = sessions + excluded.sessions, total_profit = total_profit + excluded.total_profit, "
+                "total_invested = total_invested + excluded.total_invested, wins = wins + excluded.wins, "
+                "min_profit = MIN(min_profit, excluded.min_profit), max_profit = MAX(max_profit, excluded.max_profit), "
+                "first_date = MIN(first_date, excluded.first_date), last_date = MAX(last_date, excluded.last_date)",
+                (last_id,)
+            )
+            self.conn.execute(
+                "INSERT INTO trip_game_stats SELECT trip_id, game, COUNT(*), SUM(profit), SUM(money_in) "
+                "FROM sessions WHERE session_id > ? GROUP BY trip_id, game "
+                "ON CONFLICT (trip_id, game) DO UPDATE SET "
+                "sessions = sessions + excluded.sessions, total_profit = total_profit + excluded.total_profit, "
+                "total_invested = total_invested + excluded.total_invested",
+                (last_id,)
+            )
+            if running_profit:
+                affected = self.conn.execute(
+                    "SELECT trip_id, MIN(date) FROM sessions WHERE session_id > ? GROUP BY trip_id", (last_id,)
+                ).fetchall()
+                for trip_id, since in affected:
+                    self._update_running_profit(trip_id, since)
+            return len(rows)
+
+    def _update_running_profit(self, trip_id, since):
+        # Sessions dated before `since` keep their running profit
+        previous = self.conn.execute(
+            "SELECT cumulative_profit FROM sessions WHERE trip_id = ? AND date < ? "
+            "ORDER BY date DESC, session_id DESC LIMIT 1", (trip_id, since)
+        ).fetchone()
+        self.conn.execute(
+            "UPDATE sessions SET cumulative_profit = running.total FROM ("
+            "SELECT session_id, ? + SUM(profit) OVER (ORDER BY date, session_id) AS total "
+            "FROM sessions WHERE trip_id = ? AND date >= ?) AS running "
+            "WHERE sessions.session_id = running.session_id",
+            (previous[0] if previous else 0.0, trip_id, since)
+        )
+
+    def update_running_profit(self, trip_id, since=""):
+        """Recompute the running profit of a trip's sessions dated `since` (YYYY-MM-DD) or later"""
+        with self.lock, self.conn:
+            self._update_running_profit(trip_id, since)
+
+    def trip_sessions(self, trip_id):
+        """All sessions of a trip, oldest first"""
+        return self._query(
+            SESSION_SELECT + " WHERE trip_id = ? ORDER BY date, session_id", (trip_id,)
+        )
+
+    def iter_session_chunks(self, trip_id=None, chunk_size=5000):
+        """Yield sessions (one trip or all) in date order, `chunk_size` rows at a time.
+
+        Each chunk is a separate keyset query on (date, session_id), so the lock
+        is never held between chunks and memory stays bounded by the chunk size.
+        """
+        where = "" if trip_id is None else "trip_id = ? AND "
+        base = () if trip_id is None else (trip_id,)
+        rows = self._query(
+            SESSION_SELECT + f" WHERE {where}1 ORDER BY date, session_id LIMIT ?", base + (chunk_size,)
+        )
+        while rows:
+            yield rows
+            if len(rows) < chunk_size:
+                return
+            last = rows[-1]
+            rows = self._query(
+                SESSION_SELECT + f" WHERE {where}(date, session_id) > (?, ?) ORDER BY date, session_id LIMIT ?",
+                base + (last['date'], last['session_id'], chunk_size)
+            )
+
+    def sessions_since(self, session_id, limit=100000):
+        """Up to `limit` sessions with an id above `session_id`, in id order"""
+        return self._query(
+            SESSION_SELECT + " WHERE session_id > ? ORDER BY session_id LIMIT ?", (session_id, limit)
+        )
+
+    def sessions_between(self, start_date, end_date):
+        """Sessions dated within [start_date, end_date] (YYYY-MM-DD), across trips"""
+        return self._query(
+            SESSION_SELECT + " WHERE date BETWEEN ? AND ? ORDER BY date, session_id", (start_date, end_date)
+        )
+
+    def game_sessions(self, game, trip_id=None):
+        """Sessions played on one game, optionally limited to a trip"""
+        if trip_id is None:
+            return self._query(SESSION_SELECT + " WHERE game = ? ORDER BY date, session_id", (game,))
+        return self._query(
+            SESSION_SELECT + " WHERE game = ? AND trip_id = ? ORDER BY date, session_id", (game, trip_id)
+        )
+
+    # Aggregates
+
+    def trip_totals(self, trip_id):
+        """Session count, profit and money-in totals, wins, min/max profit and date range of a trip"""
+        rows = self._query("SELECT * FROM trip_stats WHERE trip_id = ?", (trip_id,))
+        return rows[0] if rows else dict(EMPTY_TRIP_STATS, trip_id=trip_id)
+
+    def game_totals(self, trip_id):
+        """Session count, total profit and total money in per game played on a trip"""
+        return self._query("SELECT * FROM trip_game_stats WHERE trip_id = ? ORDER BY game", (trip_id,))
+
+    def profit_series(self, trip_id):
+        """(date, cumulative profit) after each session of a trip, oldest first"""
+        rows = self._query(
+            "SELECT date, cumulative_profit FROM sessions WHERE trip_id = ? ORDER BY date, session_id", (trip_id,)
+        )
+        return [(row['date'], row['cumulative_profit']) for row in rows]
+
+    def profit_points(self, trip_id, after_session_id=0):
+        """session_id, date and cumulative profit of a trip's sessions with an id above `after_session_id`,
+        in date order"""
+        return self._query(
+            "SELECT session_id, date, cumulative_profit FROM sessions WHERE trip_id = ? AND session_id > ? "
+            "ORDER BY date, session_id", (trip_id, after_session_id)
+        )
@@ -0,0 +1,120 @@
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from bankroll_sim import FIXED_FRACTIONS, KELLY_MULTIPLIERS, simulate_bankroll, strategy_fraction
+from ruin_solver import PROGRESSIONS, solve_progression
+
+PROPORTIONAL_STRATEGIES = ["Fixed Fraction", "Kelly Criterion"]
+# Strategies offered in the app. Even-money Kelly bets nothing at any house edge, so its
+# rows would only show the untouched bankroll; cells with a player edge (negative house
+# edge) can still be built with sweep_cells.
+SWEEP_STRATEGIES = ["Fixed Fraction"] + PROGRESSIONS
+RISK_TOLERANCES = list(FIXED_FRACTIONS)
+
+# Cells handed to a worker at a time; keeps scheduling overhead low on big grids
+CHUNK_SIZE = 4
+
+_pool = None
+_pool_workers = None
+
+
+def sweep_cells(strategies, risk_tolerances, house_edges, bets_per_session_values):
+    """Grid cells as (strategy, risk tolerance, house edge, bets per session) tuples.
+
+    Progressions ignore the risk tolerance, so they get one cell per edge and
+    bet count (risk tolerance None) that is shared by every risk row.
+    """
+    cells = []
+    for strategy, edge, bets in itertools.product(strategies, house_edges, bets_per_session_values):
+        if strategy in PROGRESSIONS:
+            cells.append((strategy, None, float(edge), int(bets)))
+        else:
+            cells.extend((strategy, risk, float(edge), int(bets)) for risk in risk_tolerances)
+    return cells
+
+
+def cell_fraction(strategy, risk, house_edge):
+    """Bankroll fraction bet per wager in a proportional cell; 0 when the strategy would not bet.
+
+    Kelly sizes against the even-money odds implied by the house edge, where
+    full Kelly is 2p - 1 = -house_edge: with any house edge it bets nothing.
+    """
+    if strategy == "Kelly Criterion":
+        return max(0.0, -house_edge * KELLY_MULTIPLIERS[risk])
+    return strategy_fraction(strategy, risk)
+
+
+def run_cell(cell, initial_bankroll, num_sessions, num_paths, min_bet, base_bet, table_max, seed):
+    """Ruin probability, median / mean final bankroll and bet fraction (NaN for progressions) for one cell"""
+    strategy, risk, house_edge, bets_per_session = cell
+    if strategy in PROGRESSIONS:
+        solution = solve_progression(strategy, initial_bankroll, house_edge, base_bet, table_max,
+                                     num_sessions * bets_per_session, bets_per_session=bets_per_session)
+        cumulative = np.cumsum(solution["probabilities"])
+        median = solution["bankroll_values"][min(np.searchsorted(cumulative, 0.5), len(cumulative) - 1)]
+        return solution["ruin_probability"], float(median), solution["expected_final"], np.nan
+
+    fraction = cell_fraction(strategy, risk, house_edge)
+    if fraction <= 0:
+        # No bet: the bankroll is never at risk
+        return 0.0, float(initial_bankroll), float(initial_bankroll), 0.0
+    sim = simulate_bankroll(initial_bankroll, fraction, house_edge, num_sessions, bets_per_session,
+                            num_paths=num_paths, min_bet=min_bet, percentiles=(50,), seed=seed)
+    return sim["ruin_probability"], float(sim["bands"][50][-1]), sim["mean_final"], fraction
+
+
+def _run_chunk(cells, params):
+    return [run_cell(cell, **params) for cell in cells]
+
+
+def _get_pool(workers):
+    """Process pool reused across sweeps; spawned workers stay safe inside a threaded server"""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_workers = workers
+    return _pool
+
+
+def run_sweep(cells, initial_bankroll, num_sessions, num_paths=5000, min_bet=1.0, base_bet=25.0,
+              table_max=1000.0, seed=0, workers=None):
+    """Run every cell, spread over a process pool, and return one row per cell.
+
+    With a single worker (or a single-core machine) the cells run in-process.
+    Every cell uses the same seed, so results are reproducible and cells differ
+    only by their parameters.
+    """
+    params = {
+        'initial_bankroll': initial_bankroll,
+        'num_sessions': num_sessions,
+        'num_paths': num_paths,
+        'min_bet': min_bet,
+        'base_bet': base_bet,
+        'table_max': table_max,
+        'seed': seed
+    }
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(cells) <= CHUNK_SIZE:
+        outcomes = _run_chunk(cells, params)
+    else:
+        chunks = [cells[i:i + CHUNK_SIZE] for i in range(0, len(cells), CHUNK_SIZE)]
+        pool = _get_pool(workers)
+        outcomes = [outcome for chunk in pool.map(_run_chunk, chunks, itertools.repeat(params))
+                    for outcome in chunk]
+
+    results = pd.DataFrame(cells, columns=['strategy', 'risk_tolerance', 'house_edge', 'bets_per_session'])
+    columns = ['ruin_probability', 'median_final', 'mean_final', 'bet_fraction']
+    results[columns] = np.array(outcomes, dtype=np.float64)
+    return results
+
+
+def row_label(strategy, risk_tolerance):
+    """Heatmap row for a cell; progressions have one row regardless of risk tolerance"""
+    return strategy if risk_tolerance is None or pd.isna(risk_tolerance) else f"{strategy} · {risk_tolerance}"
@@ -0,0 +1,64 @@
+import math
+
+import numpy as np
+import pytest
+
+from bankroll_sim import kelly_fraction, simulate_bankroll, win_probability_for_edge
+
+
+def brute_force_ruin(initial, fraction, house_edge, num_bets, min_bet, num_paths, seed):
+    """Ruin probability from a plain bet-by-bet simulation"""
+    rng = np.random.default_rng(seed)
+    p = win_probability_for_edge(house_edge)
+    bankroll = np.full(num_paths, float(initial))
+    ruined = np.zeros(num_paths, dtype=bool)
+    for _ in range(num_bets):
+        wins = rng.random(num_paths) < p
+        bankroll *= np.where(wins, 1 + fraction, 1 - fraction)
+        ruined |= bankroll < min_bet
+    return ruined.mean()
+
+
+def test_same_seed_gives_same_paths():
+    first = simulate_bankroll(1000, 0.05, 0.02, 5, 50, num_paths=500, seed=7)
+    second = simulate_bankroll(1000, 0.05, 0.02, 5, 50, num_paths=500, seed=7)
+    np.testing.assert_array_equal(first['final_bankrolls'], second['final_bankrolls'])
+
+
+def test_mean_final_matches_expected_growth():
+    # Without ruin every bet multiplies the expected bankroll by 1 - fraction * house_edge
+    result = simulate_bankroll(1000, 0.025, 0.05, 4, 50, num_paths=20000, min_bet=1e-6, seed=1)
+    assert result['ruin_probability'] == 0
+    expected = 1000 * (1 - 0.025 * 0.05) ** 200
+    assert result['mean_final'] == pytest.approx(expected, rel=0.01)
+
+
+def test_median_band_matches_binomial_median():
+    num_bets, fraction, p = 200, 0.05, win_probability_for_edge(0.02)
+    result = simulate_bankroll(1000, fraction, 0.02, 1, num_bets, num_paths=20001, min_bet=1e-6, seed=2)
+    cdf = np.cumsum([math.comb(num_bets, w) * p ** w * (1 - p) ** (num_bets - w) for w in range(num_bets + 1)])
+    wins = int(np.searchsorted(cdf, 0.5))
+    # The sample median may land one win either side of the exact one
+    candidates = [1000 * (1 + fraction) ** w * (1 - fraction) ** (num_bets - w) for w in (wins - 1, wins, wins + 1)]
+    assert min(candidates) <= result['bands'][50][-1] <= max(candidates)
+
+
+def test_ruin_matches_bet_by_bet_simulation():
+    result = simulate_bankroll(100, 0.2, 0.05, 5, 20, num_paths=20000, min_bet=50, seed=3)
+    expected = brute_force_ruin(100, 0.2, 0.05, 100, 50, 20000, seed=4)
+    assert result['ruin_probability'] == pytest.approx(expected, abs=0.02)
+    assert np.all(np.diff(result['ruin_by_session']) >= 0)
+    assert np.all(result['final_bankrolls'][result['final_bankrolls'] > 0] >= 50)
+
+
+@pytest.mark.parametrize("fraction", [0, 1, -0.1])
+def test_fraction_outside_unit_interval_raises(fraction):
+    with pytest.raises(ValueError):
+        simulate_bankroll(1000, fraction, 0.02, 1, 10)
+
+
+def test_kelly_fraction_is_clamped():
+    assert kelly_fraction(0.55, 2.0, "Aggressive") == pytest.approx(0.1)
+    assert kelly_fraction(0.55, 2.0, "Conservative") == pytest.approx(0.05)
+    assert kelly_fraction(0.45, 2.0, "Aggressive") == 0.01
+    assert kelly_fraction(0.9, 2.0, "Aggressive") == 0.2
@@ -0,0 +1,101 @@
+import os
+
+import pandas as pd
+import pytest
+
+from catalog_merge import build_catalog, configured_sources, merge_catalogs, parse_precedence, read_source
+
+VENDOR = """Game Name,RTP,Min Bet,Volatility
+Buffalo Gold,95.5,0.40,
+Cleopatra,95.0,1.00,3
+Lightning Link,,0.50,4
+"""
+
+SURVEY = """Title,Expected RTP,MinBet,Vol,Tips
+BUFFALO-GOLD,94.8,0.60,4,Chase the gold heads
+Lightning  Link,92.1,,5,
+Dragon Link,93.0,0.50,4,Hold and spin
+"""
+
+
+def frames():
+    vendor = pd.DataFrame({'game_name': ["Buffalo Gold", "Cleopatra", "Lightning Link"],
+                           'rtp': [95.5, 95.0, None], 'min_bet': [0.4, 1.0, 0.5], 'volatility': [None, 3, 4]})
+    survey = pd.DataFrame({'game_name': ["BUFFALO-GOLD", "Lightning  Link", "Dragon Link", None],
+                           'rtp': [94.8, 92.1, 93.0, 90.0], 'min_bet': [0.6, None, 0.5, 1.0],
+                           'volatility': [4, 5, 4, 2]})
+    return [vendor, survey]
+
+
+def by_key(df):
+    return df.assign(key=df['game_name'].str.lower().str.replace(r'\W+', '', regex=True)).set_index('key')
+
+
+def test_duplicates_take_first_non_missing_value_in_source_order():
+    merged, duplicates = merge_catalogs(frames(), ["vendor", "survey"])
+    assert duplicates == 2
+    assert len(merged) == 5
+    games = by_key(merged.dropna(subset=['game_name']))
+    assert games.loc['buffalogold', ['game_name', 'rtp', 'min_bet', 'volatility']].tolist() == \
+        ["Buffalo Gold", 95.5, 0.4, 4]
+    # A field missing from the first source falls through to the next
+    assert games.loc['lightninglink', 'rtp'] == 92.1
+    assert games.loc['lightninglink', 'min_bet'] == 0.5
+    # Unnamed rows are kept as they are
+    assert merged['game_name'].isna().sum() == 1
+
+
+def test_precedence_reorders_sources_per_field():
+    merged, _ = merge_catalogs(frames(), ["vendor", "survey"], {'rtp': ["survey"], 'missing': ["survey"]})
+    games = by_key(merged.dropna(subset=['game_name']))
+    assert games.loc['buffalogold', 'rtp'] == 94.8
+    assert games.loc['lightninglink', 'rtp'] == 92.1
+    assert games.loc['cleopatra', 'rtp'] == 95.0
+    # Other fields keep the source order
+    assert games.loc['buffalogold', 'min_bet'] == 0.4
+
+
+def test_read_source_maps_header_variants(tmp_path):
+    path = tmp_path / "survey.csv"
+    path.write_text(SURVEY)
+    df = read_source(path)
+    assert list(df.columns) == ['game_name', 'rtp', 'min_bet', 'volatility', 'tips']
+    assert df['rtp'].tolist() == [94.8, 92.1, 93.0]
+
+
+def test_build_catalog_is_versioned(tmp_path):
+    vendor, survey = tmp_path / "vendor.csv", tmp_path / "survey.csv"
+    vendor.write_text(VENDOR)
+    survey.write_text(SURVEY)
+    cache = tmp_path / "cache"
+
+    df, manifest = build_catalog([vendor, survey], {'rtp': ["survey"]}, cache)
+    assert manifest['duplicates'] == 2 and manifest['games'] == 4 == len(df)
+    assert [source['rows'] for source in manifest['sources']] == [3, 3]
+    games = by_key(df)
+    assert games.loc['buffalogold', 'rtp'] == pytest.approx(94.8)
+    assert games.loc['dragonlink', 'tips'] == "Hold and spin"
+    # Fields no source gives a game take the column default
+    assert games.loc['cleopatra', 'tips'] == "No tips available"
+
+    again, same = build_catalog([vendor, survey], {'rtp': ["survey"]}, cache)
+    assert same == manifest
+    other, reordered = build_catalog([survey, vendor], None, cache)
+    assert reordered['version'] != manifest['version']
+    assert by_key(other).loc['buffalogold', 'game_name'] == "BUFFALO-GOLD"
+
+
+def test_parse_precedence_and_sources(tmp_path):
+    assert parse_precedence(["RTP=survey, vendor", "min bet=vendor"]) == \
+        {'rtp': ["survey", "vendor"], 'min_bet': ["vendor"]}
+    with pytest.raises(ValueError):
+        parse_precedence(["rtp"])
+    folder = tmp_path / "catalogs"
+    folder.mkdir()
+    (folder / "b.csv").write_text(VENDOR)
+    (folder / "a.csv").write_text(VENDOR)
+    (folder / "notes.txt").write_text("")
+    extra = tmp_path / "extra.csv"
+    assert configured_sources(os.pathsep.join([str(extra), str(folder)])) == \
+        (extra, folder / "a.csv", folder / "b.csv")
+    assert configured_sources("") is None
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from chart_data import BankrollSeries, lttb_indices, minmax_indices, profit_histogram
+from session_store import SessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(tmp_path / "sessions.db")
+    yield store
+    store.close()
+
+
+def add(store, trip_id, date, profit):
+    store.add_session({'trip_id': trip_id, 'date': date, 'casino': "Aria", 'game': "Cleopatra",
+                       'money_in': max(-profit, 0.0), 'money_out': max(profit, 0.0), 'profit': profit})
+
+
+def test_series_follows_new_and_backdated_sessions(store):
+    trip_id = store.start_trip("Aria", 1000, 5)
+    series = BankrollSeries(store, trip_id).refresh()
+    assert series.chart_frame(1000).empty
+
+    add(store, trip_id, '2024-03-02', 50.0)
+    add(store, trip_id, '2024-03-03', -20.0)
+    series.refresh()
+    assert series.chart_frame(1000)['Bankroll'].tolist() == [1000.0, 1050.0, 1030.0]
+
+    # A backdated session shifts every later running profit
+    add(store, trip_id, '2024-03-01', -100.0)
+    series.refresh()
+    frame = series.chart_frame(1000)
+    assert frame['Date'].tolist() == ['2024-03-01', '2024-03-01', '2024-03-02', '2024-03-03']
+    assert frame['Bankroll'].tolist() == [1000.0, 900.0, 950.0, 930.0]
+    assert series.chart_frame(1000) is frame
+
+
+def test_same_size_with_a_backdated_session_reloads(store):
+    trip_id = store.start_trip("Aria", 1000, 5)
+    add(store, trip_id, '2024-03-02', 50.0)
+    series = BankrollSeries(store, trip_id).refresh()
+    add(store, trip_id, '2024-03-01', 10.0)
+    series.refresh(sessions=2)
+    np.testing.assert_array_equal(series.profit[:series.size], [10.0, 60.0])
+
+
+def test_downsampling_keeps_endpoints_and_extremes():
+    y = np.sin(np.linspace(0, 20, 5000))
+    y[1234] = 5.0
+    for indices in (lttb_indices(y, 200), minmax_indices(y, 200)):
+        assert len(indices) <= 200
+        assert indices[0] == 0 and indices[-1] == len(y) - 1
+        assert np.all(np.diff(indices) > 0)
+        assert 1234 in indices
+
+
+def check_bars(profits, bars, max_bins):
+    """Every profit lies in exactly one bar of its own type, and bars never straddle zero"""
+    assert bars['Count'].sum() == len(profits)
+    assert len(set(bars['bin_start'])) <= max_bins + 1
+    for profit in profits:
+        label = 'Win' if profit >= 0 else 'Loss'
+        inside = bars[(bars['bin_start'] <= profit) & (profit < bars['bin_end'])]
+        assert inside['Type'].tolist() == [label]
+    assert not ((bars['bin_start'] < 0) & (bars['bin_end'] > 0)).any()
+    assert ((bars['Type'] == 'Win') == (bars['bin_start'] >= 0)).all()
+
+
+@pytest.mark.parametrize("profits", [
+    [-0.3, 0.0, 0.05, -0.25, 1.4],
+    [-120.0, -40.0, -0.01, 0.0, 0.01, 35.0, 260.0],
+    list(np.random.default_rng(18).normal(-20, 80, 5000).round(2))
+])
+def test_histogram_bars(profits):
+    check_bars(profits, profit_histogram(profits, 20), 20)
+
+
+def test_zero_is_a_bar_edge():
+    bars = profit_histogram([-3.0, -1.0, 2.0, 7.0], 5)
+    assert 0.0 in set(bars['bin_start']) | set(bars['bin_end'])
+    assert bars.loc[bars['Type'] == 'Loss', 'bin_end'].max() <= 0
+
+
+def test_break_even_sessions_count_as_wins():
+    bars = profit_histogram([0.0, 0.0, -5.0], 10)
+    assert bars.loc[bars['Type'] == 'Win', 'Count'].sum() == 2
+    assert bars.loc[bars['Type'] == 'Win', 'bin_start'].tolist() == [0.0]
+
+
+@pytest.mark.parametrize("profits, label", [([25.0] * 4, 'Win'), ([-25.0] * 4, 'Loss'), ([0.0] * 4, 'Win')])
+def test_equal_profits_make_one_bar(profits, label):
+    bars = profit_histogram(profits)
+    assert bars[['Type', 'Count']].values.tolist() == [[label, 4]]
+    assert bars['bin_start'].iloc[0] <= profits[0] < bars['bin_end'].iloc[0]
+
+
+def test_empty_and_missing_profits():
+    for profits in ([], [np.nan, np.nan]):
+        bars = profit_histogram(profits)
+        assert bars.empty and list(bars.columns) == ['bin_start', 'bin_end', 'Type', 'Count']
+    bars = profit_histogram([np.nan, -10.0, 30.0])
+    assert bars['Count'].sum() == 2
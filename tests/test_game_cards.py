@@ -0,0 +1,46 @@
+import pandas as pd
+
+from game_cards import (add_display_labels, map_advantage, map_bonus_freq, map_volatility, page_count,
+                        render_game_cards)
+
+
+def catalog():
+    return pd.DataFrame({
+        'game_name': ['Jacks & "Better" <VP>', "Cleopatra"],
+        'type': ["Video <Poker>", "Slot & Reel"],
+        'min_bet': [0.25, 1250.0],
+        'rtp': [99.54, 95.0],
+        'advantage_play_potential': [4.7, 9],
+        'volatility': [1, 3],
+        'bonus_frequency': [0.05, 0.35],
+        'tips': ['Hold "pairs" & <never> split', "No tips available"]
+    })
+
+
+def test_labels_match_the_single_card_helpers():
+    df = add_display_labels(catalog())
+    assert df['advantage_label'].tolist() == [map_advantage(int(v)) for v in df['advantage_play_potential']]
+    assert df['volatility_label'].tolist() == [map_volatility(int(v)) for v in df['volatility']]
+    assert df['bonus_label'].tolist() == [map_bonus_freq(v) for v in df['bonus_frequency']]
+
+
+def test_text_fields_are_escaped():
+    html = render_game_cards(add_display_labels(catalog()))
+    assert 'Jacks &amp; &quot;Better&quot; &lt;VP&gt;' in html
+    assert 'Video &lt;Poker&gt;' in html and 'Slot &amp; Reel' in html
+    assert 'Hold &quot;pairs&quot; &amp; &lt;never&gt; split' in html
+    for raw in ('<VP>', '<Poker>', '<never>', '"Better"', 'Slot & Reel'):
+        assert raw not in html
+    assert '$1,250.00' in html and '99.54%' in html
+    assert html.count('class="ph-game-card"') == 2
+
+
+def test_categorical_columns_render_the_same():
+    df = add_display_labels(catalog())
+    compact = df.astype({'type': 'category', 'tips': 'category', 'bonus_label': 'category'})
+    assert render_game_cards(compact) == render_game_cards(df)
+
+
+def test_empty_page_and_page_count():
+    assert render_game_cards(add_display_labels(catalog()).iloc[:0]) == '<div class="ph-game-grid"></div>'
+    assert [page_count(total, 25) for total in (0, 1, 25, 26)] == [1, 1, 1, 2]
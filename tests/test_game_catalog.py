@@ -0,0 +1,151 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import game_catalog
+from game_cards import add_display_labels, render_game_cards
+from game_catalog import compact_catalog, load_catalog, normalize_catalog
+from game_filters import GameFilterIndex
+from game_ranking import top_k
+
+CATALOG = """Game Name,RTP,Min Bet,Vol,Tips,Type
+Buffalo Gold,95.5,0.40,4,Chase the gold heads,Slot
+Cleopatra,95.0,1.00,3,,Slot
+Jacks or Better,99.5,0.25,1,Hold pairs,Video Poker
+No RTP,,1.00,2,,Slot
+"""
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Counts of CSV parses and content hashes made by load_catalog"""
+    counts = {'parsed': 0, 'hashed': 0}
+
+    def counting(name, function):
+        def wrapper(*args):
+            counts[name] += 1
+            return function(*args)
+        return wrapper
+
+    monkeypatch.setattr(game_catalog, 'normalize_catalog', counting('parsed', normalize_catalog))
+    monkeypatch.setattr(game_catalog, 'file_digest', counting('hashed', game_catalog.file_digest))
+    return counts
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_text(CATALOG)
+    return path
+
+
+def check_catalog(df):
+    assert df['game_name'].tolist() == ["Buffalo Gold", "Cleopatra", "Jacks or Better"]
+    assert df['rtp'].tolist() == [95.5, 95.0, 99.5]
+    assert df['volatility'].tolist() == [4, 3, 1]
+    assert df['advantage_play_potential'].tolist() == [3, 3, 3]
+
+
+def test_unchanged_file_reuses_the_cache(source, tmp_path, calls):
+    cache = tmp_path / "cache"
+    check_catalog(load_catalog(source, cache))
+    assert calls == {'parsed': 1, 'hashed': 1}
+    check_catalog(load_catalog(source, cache))
+    assert calls == {'parsed': 1, 'hashed': 1}
+
+
+def test_touched_file_is_hashed_but_not_parsed(source, tmp_path, calls):
+    cache = tmp_path / "cache"
+    load_catalog(source, cache)
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    check_catalog(load_catalog(source, cache))
+    assert calls == {'parsed': 1, 'hashed': 2}
+    # The new mtime is recorded, so the next load skips the hash
+    load_catalog(source, cache)
+    assert calls == {'parsed': 1, 'hashed': 2}
+
+
+def test_edited_file_is_rebuilt(source, tmp_path, calls):
+    cache = tmp_path / "cache"
+    load_catalog(source, cache)
+    source.write_text(CATALOG.replace("95.5", "96.5"))
+    df = load_catalog(source, cache)
+    assert calls['parsed'] == 2
+    assert df['rtp'].tolist() == [96.5, 95.0, 99.5]
+
+
+def test_npz_cache_without_pyarrow(source, tmp_path, calls, monkeypatch):
+    monkeypatch.setattr(game_catalog, '_HAS_PYARROW', False)
+    cache = tmp_path / "cache"
+    first = load_catalog(source, cache)
+    second = load_catalog(source, cache)
+    assert calls['parsed'] == 1
+    assert [path.suffix for path in sorted(cache.iterdir())] == [".json", ".npz"]
+    check_catalog(second)
+    # Missing text comes back as missing, not as an empty string
+    pd.testing.assert_series_equal(second['tips'].isna(), first['tips'].isna())
+
+
+@pytest.mark.skipif(not game_catalog._HAS_PYARROW, reason="pyarrow is not installed")
+def test_cache_format_change_rebuilds(source, tmp_path, calls, monkeypatch):
+    cache = tmp_path / "cache"
+    load_catalog(source, cache)
+    monkeypatch.setattr(game_catalog, '_HAS_PYARROW', not game_catalog._HAS_PYARROW)
+    check_catalog(load_catalog(source, cache))
+    assert calls['parsed'] == 2
+
+
+def test_missing_required_columns_raise(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_text("Game Name,RTP\nCleopatra,95\n")
+    with pytest.raises(ValueError, match="min_bet"):
+        load_catalog(path, tmp_path / "cache")
+
+
+@pytest.fixture
+def labelled():
+    rng = np.random.default_rng(15)
+    size = 400
+    raw = pd.DataFrame({
+        'Name': [f"{rng.choice(['Buffalo', 'Cleopatra', 'Wheel'])} {i}" for i in range(size)],
+        'Type': rng.choice(["Slot", "Video Poker", "Table"], size),
+        'RTP': rng.uniform(85, 99, size).round(2),
+        'Min Bet': rng.choice([0.01, 0.25, 1.0, 5.0], size),
+        'Volatility': rng.integers(1, 6, size),
+        'APP': rng.integers(1, 6, size),
+        'Bonus Frequency': rng.uniform(0, 0.5, size).round(2),
+        'Has Bonus': rng.choice(["Yes", "No"], size),
+        'Tips': rng.choice(["Hold pairs", "Bet max", "No tips available"], size)
+    })
+    return add_display_labels(normalize_catalog(raw))
+
+
+def test_compaction_keeps_filters_rankings_and_cards(labelled):
+    compact = compact_catalog(labelled)
+    assert compact['volatility'].dtype == np.int8
+    assert compact['advantage_play_potential'].dtype == np.int8
+    # float32 would change scores in the last digits and reorder near-ties
+    assert compact['bonus_frequency'].dtype == np.float64
+    assert compact['has_bonus'].dtype == bool
+    for col in ('type', 'tips', 'volatility_label', 'advantage_label', 'bonus_label'):
+        assert isinstance(compact[col].dtype, pd.CategoricalDtype), col
+    assert compact['game_name'].dtype != 'category'
+    assert 'name' not in compact.columns and 'app' not in compact.columns
+    assert compact.memory_usage(deep=True).sum() < labelled.memory_usage(deep=True).sum() / 2
+
+    full, small = GameFilterIndex(labelled), GameFilterIndex(compact)
+    for filters in ({}, {'max_min_bet': 1.0, 'min_rtp': 94.0}, {'game_type': "Slot", 'volatility': "High (4-5)"},
+                    {'advantage': "Medium (3)", 'name_query': "buffalo"}):
+        rows = full.query(**filters)
+        np.testing.assert_array_equal(small.query(**filters), rows)
+        ranked = top_k(full.scores, rows, 50)
+        np.testing.assert_array_equal(top_k(small.scores, rows, 50), ranked)
+        assert render_game_cards(compact.iloc[ranked]) == render_game_cards(labelled.iloc[ranked])
+
+
+def test_fractional_ratings_are_not_narrowed(labelled):
+    labelled = labelled.assign(volatility=labelled['volatility'] + 0.5)
+    assert compact_catalog(labelled)['volatility'].dtype == np.float64
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from game_filters import ADVANTAGE_BANDS, VOLATILITY_BANDS, GameFilterIndex
+
+WORDS = ["Buffalo", "Gold", "Cleopatra", "Dragon", "Link", "Lightning", "Wheel", "Fortune", "Mega", "Royal"]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    rng = np.random.default_rng(11)
+    size = 700
+    names = [" ".join(rng.choice(WORDS, size=rng.integers(1, 4))) for _ in range(size)]
+    # Repeated names, an empty name and names with non-ASCII characters
+    names[5] = names[6] = "Buffalo Gold"
+    names[7] = ""
+    names[8] = "Château Fortune"
+    rtp = rng.uniform(85, 99, size).round(1)
+    rtp[::50] = np.nan
+    return pd.DataFrame({
+        'game_name': names,
+        'type': rng.choice(["Slot", "Video Poker", "Table"], size),
+        'min_bet': rng.choice([0.01, 0.25, 1.0, 5.0, 25.0], size),
+        'rtp': rtp,
+        'volatility': rng.integers(1, 6, size),
+        'advantage_play_potential': rng.integers(1, 6, size),
+        'bonus_frequency': rng.uniform(0, 10, size).round(1)
+    })
+
+
+def mask_query(df, max_min_bet=None, min_rtp=None, game_type="All", advantage="All", volatility="All",
+               name_query=""):
+    """The same filters as a plain pandas mask chain"""
+    mask = pd.Series(True, index=df.index)
+    if max_min_bet is not None:
+        mask &= df['min_bet'] <= max_min_bet
+    if min_rtp is not None:
+        mask &= df['rtp'] >= min_rtp
+    if game_type != "All":
+        mask &= df['type'] == game_type
+    if advantage != "All":
+        mask &= ADVANTAGE_BANDS[advantage](df['advantage_play_potential'])
+    if volatility != "All":
+        mask &= VOLATILITY_BANDS[volatility](df['volatility'])
+    if name_query:
+        mask &= df['game_name'].str.contains(name_query, case=False, regex=False)
+    return np.flatnonzero(mask.to_numpy())
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {'max_min_bet': 1.0},
+    {'max_min_bet': 0.5, 'min_rtp': 94.0},
+    {'min_rtp': 97.3, 'game_type': "Slot", 'volatility': "Low (1-2)"},
+    {'game_type': "Table", 'advantage': "High (4-5)"},
+    {'game_type': "Keno"},
+    {'max_min_bet': 5.0, 'advantage': "Medium (3)", 'name_query': "gold"},
+    {'name_query': "ON LI"},
+    {'name_query': "Château"},
+    {'min_rtp': 100.0}
+])
+def test_query_matches_pandas_masks(catalog, filters):
+    index = GameFilterIndex(catalog)
+    np.testing.assert_array_equal(index.query(**filters), mask_query(catalog, **filters))
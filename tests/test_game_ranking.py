@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from game_ranking import SCORE_WEIGHTS, game_scores, top_k
+
+
+def full_sort(scores, positions):
+    """Positions by descending score, ties by position and missing scores last"""
+    values = np.where(np.isnan(scores[positions]), -np.inf, scores[positions])
+    return positions[np.lexsort((positions, -values))]
+
+
+def test_scores_follow_the_weights():
+    df = pd.DataFrame({'rtp': [96.0], 'bonus_frequency': [5.0], 'advantage_play_potential': [4],
+                       'volatility': [2]})
+    expected = (96 * SCORE_WEIGHTS['rtp'] + 5 * SCORE_WEIGHTS['bonus_frequency'] +
+                4 * SCORE_WEIGHTS['advantage_play_potential'] + 4 * SCORE_WEIGHTS['volatility'])
+    assert game_scores(df)[0] == pytest.approx(expected)
+
+
+def test_pages_match_a_full_sort():
+    rng = np.random.default_rng(13)
+    # Few distinct scores so ties straddle page boundaries
+    scores = rng.integers(0, 20, 2000).astype(np.float64)
+    scores[::97] = np.nan
+    positions = np.sort(rng.choice(2000, 1500, replace=False))
+    ranked = full_sort(scores, positions)
+    for k, offset in ((10, 0), (10, 10), (25, 40), (10, len(positions) - 3), (5000, 0)):
+        np.testing.assert_array_equal(top_k(scores, positions, k, offset), ranked[offset:offset + k])
+    assert len(top_k(scores, positions, 10, len(positions))) == 0
+    assert len(top_k(scores, positions[:0], 10)) == 0
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from game_recommender import GameRecommender
+
+
+def recommend_games(games_df, session_bankroll, max_bet):
+    """profit_hopper_modern.py's original implementation"""
+    df = games_df.copy()
+    df = df[df["Min_Bet"] <= max_bet]
+    df["Score"] = (
+        (df["RTP"] / 100) +
+        df["Bonus"].map(lambda b: 0.2 if b else 0) +
+        df["Volatility"].map(lambda v: 0.3 if v == "Low" else (0.2 if v == "Medium" else 0.1))
+    )
+    df["Stop_Loss"] = session_bankroll * 0.6
+    df["Stop_Loss"] = pd.to_numeric(df[["Stop_Loss", "Min_Bet"]].max(axis=1), errors="coerce").round(2)
+    return df.sort_values("Score", ascending=False).reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def games():
+    rng = np.random.default_rng(14)
+    size = 500
+    rtp = rng.uniform(85, 99, size)
+    rtp[::41] = np.nan
+    min_bet = rng.choice([0.01, 0.25, 0.5, 1.0, 2.0, 5.0, 25.0], size)
+    min_bet[::53] = np.nan
+    return pd.DataFrame({
+        'Name': [f"Game {i}" for i in range(size)],
+        'Type': rng.choice(["Slot", "Video Poker"], size),
+        'Volatility': rng.choice(["Low", "Medium", "High", "Very High"], size),
+        'Bonus': rng.random(size) < 0.4,
+        'Min_Bet': min_bet,
+        'RTP': rtp
+    })
+
+
+@pytest.mark.parametrize("session_bankroll, max_bet", [(20.0, 5.0), (4.0, 1.0), (0.5, 0.01), (3.33, 0.83),
+                                                       (100.0, 25.0), (1000.0, 250.0)])
+def test_matches_the_original_implementation(games, session_bankroll, max_bet):
+    expected = recommend_games(games, session_bankroll, max_bet)
+    result = GameRecommender(games).recommend(session_bankroll, max_bet)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_bankrolls_between_breakpoints_share_a_cache_entry(games):
+    recommender = GameRecommender(games)
+    first = recommender.recommend(20.0, 5.0)
+    second = recommender.recommend(28.0, 7.0)
+    assert recommender.cache_info().hits == 1
+    assert first['Name'].tolist() == second['Name'].tolist()
+    assert second['Stop_Loss'].max() == pytest.approx(28.0 * 0.6)
+    # Crossing a min bet changes the rows and misses
+    recommender.recommend(100.0, 25.0)
+    assert recommender.cache_info().misses == 2
+    # A caller changing its result does not change the cached rows
+    first['Name'] = "changed"
+    assert recommender.recommend(20.0, 5.0)['Name'].tolist() == second['Name'].tolist()
+
+
+def test_no_playable_games(games):
+    result = GameRecommender(games).recommend(1.0, 0.0)
+    assert result.empty
+    assert list(result.columns) == list(games.columns) + ["Score", "Stop_Loss"]
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kelly_optimizer import catalog_distributions, catalog_kelly, kelly_fractions, log_growth, paytable_distribution
+
+
+def test_catalog_distributions_return_the_rtp():
+    rtp = np.array([88.0, 94.5, 99.0, 101.5])
+    multipliers, probabilities = catalog_distributions(rtp, [1, 2, 4, 5], [2, 5, 8, 10])
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+    np.testing.assert_allclose((multipliers * probabilities).sum(axis=1), rtp / 100)
+    assert (probabilities >= 0).all()
+
+
+def test_binary_bet_matches_closed_form():
+    # Win b-to-1 with probability p: f* = (b p - (1 - p)) / b
+    p, b = 0.55, 1.0
+    multipliers, probabilities = paytable_distribution({b + 1: p})
+    fractions, growth = kelly_fractions(multipliers, probabilities)
+    assert fractions[0] == pytest.approx((b * p - (1 - p)) / b, abs=1e-6)
+    assert growth[0] == pytest.approx(p * np.log1p(0.1) + (1 - p) * np.log1p(-0.1), abs=1e-9)
+
+
+def test_multi_outcome_optimum_beats_a_fine_grid():
+    multipliers, probabilities = paytable_distribution({1.0: 0.3, 2.0: 0.15, 10.0: 0.02, 100.0: 0.001})
+    fractions, growth = kelly_fractions(multipliers, probabilities)
+    grid = np.linspace(0, 0.999, 20000)[None, :]
+    values = log_growth(grid, multipliers[None, :], probabilities[None, :])[0]
+    assert fractions[0] == pytest.approx(grid[0, np.argmax(values)], abs=1e-3)
+    assert growth[0] >= values.max() - 1e-9
+
+
+def test_negative_expectation_bets_nothing():
+    multipliers, probabilities = catalog_distributions([92.0, 105.0], [3, 3], [5, 5])
+    fractions, growth = kelly_fractions(multipliers, probabilities)
+    assert fractions[0] == 0 and growth[0] == 0
+    assert fractions[1] > 0 and growth[1] > 0
+
+
+def test_paytable_rejects_too_much_probability():
+    with pytest.raises(ValueError):
+        paytable_distribution({2.0: 0.6, 3.0: 0.5})
+
+
+def test_catalog_kelly_scales_fractions():
+    df = pd.DataFrame({'rtp': [96.0, 103.0], 'volatility': [2, 4], 'bonus_frequency': [5, 7]})
+    full, full_growth = catalog_kelly(df, rtp_adjustment=2.0)
+    half, half_growth = catalog_kelly(df, rtp_adjustment=2.0, kelly_multiplier=0.5)
+    np.testing.assert_allclose(half, full / 2)
+    assert full[0] == 0 and half_growth[0] == 0
+    # Half Kelly keeps about three quarters of the growth
+    assert 0.6 * full_growth[1] < half_growth[1] < full_growth[1]
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from name_search import NameSearchIndex
+
+WORDS = ["Buffalo", "Gold", "Cleopatra", "Dragon", "Link", "Lightning", "Wheel", "Fortune", "Mega", "Royal"]
+
+
+@pytest.fixture(scope="module")
+def names():
+    rng = np.random.default_rng(12)
+    names = [" ".join(rng.choice(WORDS, size=rng.integers(1, 4))) for _ in range(700)]
+    # Repeated names, a missing and an empty name, and non-ASCII characters
+    names[5] = names[6] = "Buffalo Gold"
+    names[7] = ""
+    names[8] = None
+    names[9] = "Château Fortune"
+    return pd.Series(names, dtype=object)
+
+
+@pytest.mark.parametrize("query", ["g", "go", "gold", "GOLD", "buffalo gold", "d l", "zzz", "fortune mega royal",
+                                   "château", "âteau f"])
+def test_search_matches_substring_and_prefix(names, query):
+    index = NameSearchIndex(names)
+    lowered = names.fillna("").str.lower()
+    query = query.lower()
+    np.testing.assert_array_equal(index.search(query), np.flatnonzero(lowered.str.contains(query, regex=False)))
+    np.testing.assert_array_equal(index.search(query, prefix=True), np.flatnonzero(lowered.str.startswith(query)))
+
+
+def test_rows_of_repeated_names_are_all_returned(names):
+    rows = NameSearchIndex(names).search("buffalo gold", prefix=True)
+    assert {5, 6} <= set(rows)
+    assert np.all(np.diff(rows) > 0)
@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+import pytest
+
+from bankroll_sim import win_probability_for_edge
+from kelly_optimizer import catalog_distributions
+from outcome_distribution import bet_outcomes, even_money_distribution, flat_bet_distribution, quantiles
+
+
+def assert_matches(values, probabilities, expected_values, expected):
+    """Outcomes below MASS_EPSILON are dropped; the rest must match the exact distribution"""
+    index = np.searchsorted(expected_values, values)
+    np.testing.assert_allclose(expected_values[index], values)
+    np.testing.assert_allclose(probabilities, expected[index], atol=1e-12)
+    assert expected.sum() - expected[index].sum() < 1e-9
+
+
+def binomial_results(num_bets, p, bet):
+    """Exact (values, probabilities) of `num_bets` even-money bets"""
+    wins = np.arange(num_bets + 1)
+    probabilities = np.array([math.comb(num_bets, w) * p ** w * (1 - p) ** (num_bets - w) for w in wins])
+    return (2 * wins - num_bets) * bet, probabilities
+
+
+def test_even_money_session_is_binomial():
+    multipliers, probabilities = even_money_distribution(0.0526)
+    result = flat_bet_distribution(multipliers, probabilities, 10, 100)
+    values, expected = binomial_results(100, win_probability_for_edge(0.0526), 10)
+    assert_matches(result['session_values'], result['session_probabilities'], values, expected)
+    assert result['expected_session'] == pytest.approx(-0.0526 * 10 * 100)
+
+
+def test_trip_is_sum_of_sessions():
+    multipliers, probabilities = even_money_distribution(0.02)
+    result = flat_bet_distribution(multipliers, probabilities, 5, 40, num_sessions=3)
+    values, expected = binomial_results(120, win_probability_for_edge(0.02), 5)
+    assert_matches(result['trip_values'], result['trip_probabilities'], values, expected)
+    assert result['expected_trip'] == pytest.approx(3 * result['expected_session'])
+    assert result['trip_profit_probability'] == pytest.approx(expected[values > 0].sum())
+
+
+def test_off_grid_payouts_keep_the_mean():
+    multipliers, probabilities = catalog_distributions([94.5], [4], [6])
+    low, pmf = bet_outcomes(multipliers[0], probabilities[0], 1.0, 0.25)
+    values = (low + np.arange(len(pmf))) * 0.25
+    assert pmf.sum() == pytest.approx(1.0)
+    assert values @ pmf == pytest.approx(0.945 - 1)
+    result = flat_bet_distribution(multipliers[0], probabilities[0], 2.0, 50)
+    assert result['expected_session'] == pytest.approx(50 * 2.0 * (0.945 - 1))
+
+
+def test_limits_match_gamblers_ruin():
+    # A fair game with symmetric limits reaches either one with equal probability
+    multipliers, probabilities = even_money_distribution(0.0)
+    result = flat_bet_distribution(multipliers, probabilities, 10, 3000, stop_loss=100, profit_goal=100)
+    assert result['stop_probability'] == pytest.approx(0.5, abs=1e-6)
+    assert result['goal_probability'] == pytest.approx(0.5, abs=1e-6)
+    assert result['session_values'].min() == -100
+    assert result['session_values'].max() == 100
+
+
+def test_limits_with_house_edge():
+    # Classic gambler's ruin: start at 5 units, stop at 0 or 10
+    p = win_probability_for_edge(0.1)
+    r = (1 - p) / p
+    multipliers, probabilities = even_money_distribution(0.1)
+    result = flat_bet_distribution(multipliers, probabilities, 1, 2000, stop_loss=5, profit_goal=5)
+    assert result['goal_probability'] == pytest.approx((1 - r ** 5) / (1 - r ** 10), abs=1e-6)
+    assert result['session_probabilities'].sum() == pytest.approx(1.0)
+
+
+def test_quantiles_are_smallest_values_reaching_each_rank():
+    values = np.array([-2.0, -1.0, 0.0, 1.0])
+    pmf = np.array([0.1, 0.4, 0.3, 0.2])
+    assert quantiles(values, pmf, (5, 10, 50, 80, 95)) == {5: -2.0, 10: -2.0, 50: -1.0, 80: 0.0, 95: 1.0}
+
+
+@pytest.mark.parametrize("kwargs", [{'bet': 0}, {'num_bets': 0}, {'stop_loss': -5}, {'profit_goal': 0}])
+def test_invalid_arguments_raise(kwargs):
+    multipliers, probabilities = even_money_distribution(0.05)
+    arguments = {'bet': 10, 'num_bets': 10, **kwargs}
+    with pytest.raises(ValueError):
+        flat_bet_distribution(multipliers, probabilities, **arguments)
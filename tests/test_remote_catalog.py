@@ -0,0 +1,111 @@
+import hashlib
+import http.server
+import threading
+
+import pytest
+
+from remote_catalog import RemoteCatalog
+
+CATALOG = b"game_name,rtp,min_bet\nBuffalo Gold,95.5,0.4\n"
+
+
+class CatalogServer:
+    """Local stand-in for the catalog host: serves `body` with an ETag and answers If-None-Match with 304"""
+
+    def __init__(self):
+        self.body = CATALOG
+        self.requests = []
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                etag = '"%s"' % hashlib.sha256(server.body).hexdigest()[:16]
+                server.requests.append(self.headers.get('If-None-Match'))
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(server.body)))
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/catalog.csv"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = CatalogServer()
+    yield server
+    server.close()
+
+
+def test_first_fetch_downloads_and_records_validators(server, tmp_path):
+    updates = []
+    catalog = RemoteCatalog(server.url, tmp_path, ttl=3600, on_update=updates.append)
+    path = catalog.path()
+    assert path.read_bytes() == CATALOG
+    assert updates == [path]
+    assert server.requests == [None]
+    assert RemoteCatalog(server.url, tmp_path).path() == path
+
+
+def test_unchanged_catalog_is_revalidated_with_304(server, tmp_path):
+    catalog = RemoteCatalog(server.url, tmp_path, ttl=0)
+    path = catalog.path()
+    checked = catalog._state['checked']
+    assert catalog.refresh() is False
+    assert server.requests[-1] is not None
+    assert catalog.path() == path
+    assert catalog._state['checked'] > checked
+    assert sorted(p.name for p in tmp_path.glob("remote-*.csv")) == [path.name]
+
+
+def test_changed_catalog_is_swapped_in_after_on_update(server, tmp_path):
+    seen = []
+    catalog = RemoteCatalog(server.url, tmp_path, ttl=3600)
+    old = catalog.path()
+    catalog.on_update = lambda path: seen.append((path, catalog.path()))
+    server.body = CATALOG + b"Cleopatra,95.0,1.0\n"
+    assert catalog.refresh() is True
+    new = catalog.path()
+    assert new != old and new.read_bytes() == server.body
+    # on_update runs before the swap, while the old copy is still served
+    assert seen == [(new, old)]
+
+
+def test_old_versions_are_pruned(server, tmp_path):
+    catalog = RemoteCatalog(server.url, tmp_path, ttl=3600)
+    catalog.path()
+    for i in range(3):
+        server.body = CATALOG + f"Game {i},94,1\n".encode()
+        catalog.refresh()
+    assert len(list(tmp_path.glob("remote-*.csv"))) == 2
+    assert catalog.path().read_bytes() == server.body
+
+
+def test_background_refresh_serves_stale_copy_while_offline(server, tmp_path):
+    catalog = RemoteCatalog(server.url, tmp_path, ttl=0)
+    path = catalog.path()
+    server.close()
+    assert catalog.path() == path
+    catalog.wait(10)
+    assert isinstance(catalog.last_error, OSError)
+    assert catalog.path() == path
+
+
+def test_first_fetch_offline_raises(tmp_path):
+    catalog = RemoteCatalog("http://127.0.0.1:9/catalog.csv", tmp_path, timeout=2)
+    with pytest.raises(OSError):
+        catalog.path()
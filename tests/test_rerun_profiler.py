@@ -0,0 +1,124 @@
+import json
+import sys
+
+import pytest
+
+import rerun_profiler
+from rerun_profiler import PrometheusMetrics, RerunProfiler, latency_summary, note_miss, profiled, read_log
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def perf_counter(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def outputs(tmp_path, monkeypatch):
+    clock = FakeClock()
+    log, metrics = tmp_path / "logs" / "profile.jsonl", tmp_path / "metrics" / "profit_hopper.prom"
+    monkeypatch.setattr(rerun_profiler, 'time', clock)
+    monkeypatch.setattr(rerun_profiler, 'PROFILE_LOG', str(log))
+    monkeypatch.setattr(rerun_profiler, 'METRICS_PATH', str(metrics))
+    monkeypatch.setattr(rerun_profiler, '_metrics', PrometheusMetrics())
+    return clock, log, metrics
+
+
+def rerun(clock, plan, miss):
+    """A fake script rerun: a sidebar section, one cached call and a tabs section"""
+    profiler = RerunProfiler()
+    clock.advance(0.01)
+    profiler.checkpoint("sidebar")
+    plan(miss)
+    clock.advance(0.003)
+    profiler.checkpoint("tabs")
+    return profiler.finish()
+
+
+def profile_two_reruns(clock):
+    @profiled("trip_plan")
+    def plan(miss):
+        if miss:
+            note_miss()
+            clock.advance(0.2)
+        else:
+            clock.advance(0.002)
+
+    return rerun(clock, plan, True), rerun(clock, plan, False)
+
+
+def test_reruns_are_logged_as_json_lines(outputs):
+    clock, log, _ = outputs
+    first, second = profile_two_reruns(clock)
+    records = read_log(log)
+    assert records == [json.loads(json.dumps(first)), json.loads(json.dumps(second))]
+    assert records[0]['total'] == pytest.approx(0.213)
+    assert records[0]['sections'] == pytest.approx({'sidebar': 0.01, 'tabs': 0.203})
+    assert [(call['name'], call['hit']) for call in records[0]['calls']] == [("trip_plan", False)]
+    assert records[1]['calls'][0]['hit'] is True
+    assert records[1]['calls'][0]['seconds'] == pytest.approx(0.002)
+    assert rerun_profiler.current() is None
+
+
+def metric_values(text):
+    values = {}
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            values[name] = float(value)
+    return values
+
+
+def test_metrics_file_has_cumulative_histograms(outputs):
+    clock, _, metrics = outputs
+    profile_two_reruns(clock)
+    text = metrics.read_text()
+    assert "# TYPE profit_hopper_rerun_seconds histogram" in text
+    values = metric_values(text)
+    buckets = [values[f'profit_hopper_rerun_seconds_bucket{{le="{bound}"}}'] for bound in
+               (*rerun_profiler.LATENCY_BUCKETS, "+Inf")]
+    assert buckets == [0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2]
+    assert values['profit_hopper_rerun_seconds_count'] == 2
+    assert values['profit_hopper_rerun_seconds_sum'] == pytest.approx(0.228)
+
+    miss = 'profit_hopper_cached_call_seconds_{}{{function="trip_plan",result="miss"}}'
+    hit = 'profit_hopper_cached_call_seconds_{}{{function="trip_plan",result="hit"}}'
+    assert values[miss.format("count")] == 1 and values[miss.format("sum")] == pytest.approx(0.2)
+    assert values[hit.format("count")] == 1 and values[hit.format("sum")] == pytest.approx(0.002)
+    assert values['profit_hopper_section_seconds_bucket{section="tabs",le="0.25"}'] == 2
+    assert values['profit_hopper_section_seconds_bucket{section="tabs",le="0.005"}'] == 1
+    assert not list(metrics.parent.glob("*.tmp"))
+
+
+def test_labels_are_escaped():
+    metrics = PrometheusMetrics()
+    metrics.add({'total': 0.1, 'sections': {'say "hi"\\now': 0.1}, 'calls': []})
+    assert 'section="say \\"hi\\"\\\\now"' in metrics.render()
+
+
+def test_calls_outside_a_rerun_are_not_recorded(outputs):
+    calls = []
+    assert profiled("plan")(lambda: calls.append(1) or "result")() == "result"
+    assert calls == [1]
+
+
+def test_percentile_summary_and_cli(outputs, monkeypatch, capsys):
+    clock, log, _ = outputs
+    profile_two_reruns(clock)
+    summary = latency_summary(read_log(log))
+    assert summary['rerun']['count'] == 2
+    assert summary['rerun']['p50'] == pytest.approx((213 + 15) / 2)
+    assert summary['call trip_plan (miss)'] == pytest.approx({'count': 1, 'p50': 200.0, 'p90': 200.0, 'p99': 200.0})
+    assert summary['section sidebar']['p99'] == pytest.approx(10.0)
+
+    monkeypatch.setattr(sys, 'argv', ["rerun_profiler.py", str(log)])
+    rerun_profiler.main()
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == ["count", "p50", "ms", "p90", "ms", "p99", "ms"]
+    assert lines[1].split()[:2] == ["rerun", "2"]
+    assert any(line.startswith("call trip_plan (hit)") for line in lines)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from bankroll_sim import win_probability_for_edge
+from ruin_solver import progression_levels, solve_progression
+
+
+def simulate_martingale(initial_units, house_edge, max_units, num_bets, num_paths, seed):
+    """Martingale ruin probability from a plain bet-by-bet simulation, in base-bet units"""
+    rng = np.random.default_rng(seed)
+    p = win_probability_for_edge(house_edge)
+    bankroll = np.full(num_paths, initial_units)
+    bet = np.ones(num_paths, dtype=np.int64)
+    for _ in range(num_bets):
+        alive = bankroll > 0
+        stake = np.minimum(bet, bankroll)
+        wins = rng.random(num_paths) < p
+        bankroll = np.where(alive, bankroll + np.where(wins, stake, -stake), 0)
+        doubled = bet * 2
+        bet = np.where(wins | (doubled > max_units), 1, doubled)
+    return np.mean(bankroll == 0)
+
+
+def test_probabilities_sum_to_one():
+    result = solve_progression("D'Alembert", 500, 0.0526, 10, 200, 300)
+    assert result['probabilities'].sum() == pytest.approx(1.0)
+    assert result['ruin_probability'] == pytest.approx(result['ruin_by_bet'][-1])
+    assert np.all(np.diff(result['ruin_by_bet']) >= -1e-15)
+
+
+@pytest.mark.parametrize("strategy", ["Martingale", "D'Alembert"])
+def test_fair_game_keeps_expected_bankroll(strategy):
+    result = solve_progression(strategy, 1000, 0.0, 10, 500, 200)
+    assert result['expected_final'] == pytest.approx(1000)
+
+
+def test_house_edge_loses_expected_bet_total():
+    # Flat betting is D'Alembert with the table max at the base bet
+    result = solve_progression("D'Alembert", 10000, 0.05, 10, 10, 100)
+    assert result['ruin_probability'] == 0
+    assert result['expected_final'] == pytest.approx(10000 - 0.05 * 10 * 100)
+
+
+def test_martingale_ruin_matches_simulation():
+    result = solve_progression("Martingale", 200, 0.0526, 10, 640, 500)
+    expected = simulate_martingale(20, 0.0526, 64, 500, 40000, seed=5)
+    assert result['ruin_probability'] == pytest.approx(expected, abs=0.01)
+
+
+def test_progression_levels():
+    bets, win_next, loss_next = progression_levels("Martingale", 10, 100)
+    np.testing.assert_array_equal(bets, [1, 2, 4, 8])
+    np.testing.assert_array_equal(win_next, [0, 0, 0, 0])
+    np.testing.assert_array_equal(loss_next, [1, 2, 3, 0])
+    bets, win_next, loss_next = progression_levels("D'Alembert", 10, 30)
+    np.testing.assert_array_equal(bets, [1, 2, 3])
+    np.testing.assert_array_equal(win_next, [0, 0, 1])
+    np.testing.assert_array_equal(loss_next, [1, 2, 2])
+
+
+def test_invalid_progressions_raise():
+    with pytest.raises(ValueError):
+        progression_levels("Paroli", 10, 100)
+    with pytest.raises(ValueError):
+        progression_levels("Martingale", 10, 5)
+    with pytest.raises(ValueError):
+        solve_progression("Martingale", 5, 0.05, 10, 100, 10)
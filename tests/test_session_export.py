@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from session_export import _HAS_PYARROW, EXPORT_FORMATS, export_frame, export_sessions
+from session_store import SESSION_COLUMNS, SessionStore
+
+FORMATS = ["CSV", "CSV (gzip)", pytest.param("Parquet", marks=pytest.mark.skipif(
+    not _HAS_PYARROW, reason="pyarrow is not installed"))]
+
+
+def read_export(out, fmt):
+    if fmt == "Parquet":
+        return pd.read_parquet(out)
+    return pd.read_csv(out, compression='gzip' if fmt == "CSV (gzip)" else None, keep_default_na=False)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(tmp_path / "sessions.db")
+    big = store.start_trip("Bellagio", 1000, 30)
+    small = store.start_trip("Aria", 500, 2)
+    # Dates repeat and arrive out of order, so pages break inside a run of equal dates
+    store.add_sessions([{'trip_id': big, 'date': f'2024-03-{(i * 7) % 10 + 1:02d}', 'casino': "Bellagio",
+                         'game': 'Buffalo Gold' if i % 3 else 'Jacks, "Better" & more', 'money_in': 20.0 + i,
+                         'money_out': 1.5 * i, 'profit': 1.5 * i - 20.0 - i, 'notes': "note\nline" if i == 4 else ""}
+                        for i in range(57)])
+    store.add_session({'trip_id': small, 'date': '2024-03-01', 'casino': "Aria", 'game': "Cleopatra",
+                       'money_in': 10.0, 'money_out': 0.0, 'profit': -10.0, 'notes': ""})
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_trip_export_round_trips(store, fmt):
+    expected = pd.DataFrame(store.trip_sessions(1), columns=SESSION_COLUMNS)
+    exported = read_export(export_sessions(store, fmt, trip_id=1, chunk_size=10), fmt)
+    assert len(expected) > 10
+    pd.testing.assert_frame_equal(exported, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_full_history_export(store, fmt):
+    exported = read_export(export_sessions(store, fmt, chunk_size=10), fmt)
+    assert sorted(exported['session_id']) == list(range(1, 59))
+    assert list(exported.columns) == SESSION_COLUMNS
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_empty_export_keeps_the_header(store, fmt):
+    exported = read_export(export_sessions(store, fmt, trip_id=99), fmt)
+    assert exported.empty and list(exported.columns) == SESSION_COLUMNS
+
+
+def test_frame_export_round_trips():
+    df = pd.DataFrame({'game': ["Cleopatra", "Buffalo Gold", "Wheel"], 'sessions': [3, 1, 2],
+                       'profit': [-12.5, 40.0, 0.0]})
+    for fmt in EXPORT_FORMATS:
+        pd.testing.assert_frame_equal(read_export(export_frame(df, fmt, chunk_size=2), fmt), df)
+
+
+def test_unknown_format_raises(store):
+    with pytest.raises(ValueError):
+        export_sessions(store, "XLSX")
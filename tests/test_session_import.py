@@ -0,0 +1,71 @@
+import io
+
+import pandas as pd
+import pytest
+
+from session_import import empty_report, import_sessions, parse_amounts, read_session_chunks, session_columns
+from session_store import SessionStore
+
+CSV = """Date,Game Played,Amount In ($),Cashout,Notes
+2024-03-01,buffalo gold,$100.00,$40.00,first
+03/02/2024,Cleopatra,50,"$1,250.00",
+not a date,Cleopatra,50,60,bad date
+,Cleopatra,50,60,no date
+2024-03-03,,50,60,no game
+2024-03-03,  ,50,60,blank game
+2024-03-04,Cleopatra,lots,60,bad amount
+2024-03-04,Cleopatra,(20.00),60,negative in
+bad,,x,y,fails every check
+2024-03-05,Mystery Reels,20,0,
+"""
+
+CATALOG_NAMES = ["Buffalo Gold", "Cleopatra"]
+
+
+def test_rejected_rows_are_counted_once_under_the_first_reason():
+    report = empty_report()
+    chunks = list(read_session_chunks(io.StringIO(CSV), casino="Aria", game_names=CATALOG_NAMES, chunk_size=4,
+                                      report=report))
+    assert report['rows'] == 10
+    assert report['rejected'] == {'invalid date': 3, 'missing game': 2, 'invalid amount': 1, 'negative amount': 1}
+    assert sum(len(chunk) for chunk in chunks) == 3
+    assert report['matched_games'] == 2
+    assert report['unmatched_games'] == {"Mystery Reels"}
+
+
+def test_import_stores_valid_rows(tmp_path):
+    store = SessionStore(tmp_path / "sessions.db")
+    trip_id = store.start_trip("Aria", 1000, 5)
+    report = import_sessions(store, io.StringIO(CSV), trip_id, casino="Aria", game_names=CATALOG_NAMES,
+                             chunk_size=3)
+    assert report['imported'] == 3
+    rows = store.trip_sessions(trip_id)
+    assert [(row['date'], row['game'], row['profit']) for row in rows] == [
+        ('2024-03-01', "Buffalo Gold", -60.0), ('2024-03-02', "Cleopatra", 1200.0),
+        ('2024-03-05', "Mystery Reels", -20.0)
+    ]
+    assert store.profit_series(trip_id)[-1] == ('2024-03-05', 1120.0)
+    store.close()
+
+
+def test_net_profit_only_files():
+    report = empty_report()
+    csv = "Session Date,Machine,Win/Loss\n2024-03-01,Cleopatra,(25)\n2024-03-02,Cleopatra,40\n"
+    chunk, = read_session_chunks(io.StringIO(csv), report=report)
+    assert chunk['money_in'].tolist() == [25.0, 0.0]
+    assert chunk['money_out'].tolist() == [0.0, 40.0]
+    assert chunk['profit'].tolist() == [-25.0, 40.0]
+
+
+def test_missing_columns_raise():
+    with pytest.raises(ValueError, match="date"):
+        session_columns(["Game", "Profit"])
+    with pytest.raises(ValueError, match="money_in and money_out, or profit"):
+        session_columns(["Date", "Game", "Money In"])
+    assert session_columns(["Game", "Profit"], require_date=False) == {'game': "Game", 'profit': "Profit"}
+
+
+def test_parse_amounts():
+    amounts = parse_amounts(pd.Series(["$1,250.50", "(12.50)", "7", "abc", None]))
+    assert amounts[:3].tolist() == [1250.5, -12.5, 7.0]
+    assert all(amount != amount for amount in amounts[3:])
@@ -0,0 +1,204 @@
+import sqlite3
+
+import pytest
+
+from session_store import SCHEMA_VERSION, SessionStore
+
+SESSIONS = [
+    ('2024-03-02', 'Buffalo Gold', 100.0, 40.0),
+    ('2024-03-01', 'Cleopatra', 50.0, 120.0),
+    ('2024-03-03', 'Buffalo Gold', 80.0, 80.0),
+    ('2024-03-01', 'Double Diamond', 60.0, 0.0),
+    ('2024-03-04', 'Cleopatra', 200.0, 150.0)
+]
+
+V1_SCHEMA = """
+CREATE TABLE trips (
+    trip_id INTEGER PRIMARY KEY,
+    casino TEXT NOT NULL,
+    starting_bankroll REAL NOT NULL,
+    num_sessions INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE sessions (
+    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    trip_id INTEGER NOT NULL REFERENCES trips(trip_id),
+    date TEXT NOT NULL,
+    casino TEXT NOT NULL,
+    game TEXT NOT NULL,
+    money_in REAL NOT NULL,
+    money_out REAL NOT NULL,
+    profit REAL NOT NULL,
+    notes TEXT NOT NULL DEFAULT ''
+);
+PRAGMA user_version = 1;
+"""
+
+
+def session(trip_id, date, game, money_in, money_out):
+    return {'trip_id': trip_id, 'date': date, 'casino': "Bellagio", 'game': game, 'money_in': money_in,
+            'money_out': money_out, 'profit': money_out - money_in, 'notes': ""}
+
+
+def expected_totals(rows):
+    profits = [money_out - money_in for _, _, money_in, money_out in rows]
+    return {
+        'sessions': len(rows),
+        'total_profit': sum(profits),
+        'total_invested': sum(money_in for _, _, money_in, _ in rows),
+        'wins': sum(profit >= 0 for profit in profits),
+        'min_profit': min(profits),
+        'max_profit': max(profits),
+        'first_date': min(date for date, *_ in rows),
+        'last_date': max(date for date, *_ in rows)
+    }
+
+
+def expected_running(rows):
+    """Cumulative profit in (date, insertion) order"""
+    ordered = sorted(enumerate(rows), key=lambda item: (item[1][0], item[0]))
+    running, total = [], 0.0
+    for _, (date, _, money_in, money_out) in ordered:
+        total += money_out - money_in
+        running.append((date, total))
+    return running
+
+
+def check_aggregates(store, trip_id, rows):
+    totals = store.trip_totals(trip_id)
+    assert {key: totals[key] for key in expected_totals(rows)} == expected_totals(rows)
+    games = {}
+    for _, game, money_in, money_out in rows:
+        count, profit, invested = games.get(game, (0, 0.0, 0.0))
+        games[game] = (count + 1, profit + money_out - money_in, invested + money_in)
+    assert {row['game']: (row['sessions'], row['total_profit'], row['total_invested'])
+            for row in store.game_totals(trip_id)} == games
+    assert store.profit_series(trip_id) == expected_running(rows)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(tmp_path / "sessions.db")
+    yield store
+    store.close()
+
+
+def test_trips_are_persisted(tmp_path):
+    path = tmp_path / "sessions.db"
+    store = SessionStore(path)
+    first = store.start_trip("Bellagio", 1000, 5)
+    second = store.start_trip("Aria", 500, 2)
+    store.save_trip(first, "Wynn", 1500, 6)
+    store.close()
+
+    store = SessionStore(path)
+    assert [(trip['casino'], trip['starting_bankroll'], trip['num_sessions']) for trip in store.trips()] == \
+        [("Wynn", 1500.0, 6), ("Aria", 500.0, 2)]
+    assert store.latest_trip()['trip_id'] == second
+    assert store.get_trip(99) is None
+    store.close()
+
+
+def test_session_queries(store):
+    trip_id = store.start_trip("Bellagio", 1000, 5)
+    other = store.start_trip("Aria", 500, 2)
+    for row in SESSIONS:
+        store.add_session(session(trip_id, *row))
+    store.add_session(session(other, '2024-03-02', 'Cleopatra', 10.0, 0.0))
+
+    rows = store.trip_sessions(trip_id)
+    assert [(row['date'], row['game']) for row in rows] == sorted(
+        [(date, game) for date, game, *_ in SESSIONS], key=lambda item: item[0])
+    assert rows[0]['profit'] == 70.0
+    assert [row['session_id'] for row in store.sessions_between('2024-03-02', '2024-03-03')] == [1, 6, 3]
+    assert [row['session_id'] for row in store.game_sessions('Cleopatra')] == [2, 6, 5]
+    assert [row['session_id'] for row in store.game_sessions('Cleopatra', trip_id)] == [2, 5]
+    assert [row['session_id'] for row in store.sessions_since(3, limit=2)] == [4, 5]
+
+
+def test_session_chunks_page_through_every_row(store):
+    trip_id = store.start_trip("Bellagio", 1000, 5)
+    store.add_sessions([session(trip_id, f'2024-03-{day % 28 + 1:02d}', 'Cleopatra', 10.0, day)
+                        for day in range(23)])
+    chunks = list(store.iter_session_chunks(trip_id, chunk_size=5))
+    assert [len(chunk) for chunk in chunks] == [5, 5, 5, 5, 3]
+    assert [row for chunk in chunks for row in chunk] == store.trip_sessions(trip_id)
+    assert list(store.iter_session_chunks(trip_id + 1)) == []
+
+
+def test_add_session_keeps_aggregates(store):
+    trip_id = store.start_trip("Bellagio", 1000, 5)
+    other = store.start_trip("Aria", 500, 2)
+    store.add_session(session(other, '2024-03-01', 'Cleopatra', 10.0, 0.0))
+    for date, game, money_in, money_out in SESSIONS:
+        store.add_session(session(trip_id, date, game, money_in, money_out))
+    check_aggregates(store, trip_id, SESSIONS)
+    check_aggregates(store, other, [('2024-03-01', 'Cleopatra', 10.0, 0.0)])
+
+
+def test_bulk_insert_matches_single_inserts(store):
+    trip_id = store.start_trip("Bellagio", 1000, 5)
+    store.add_session(session(trip_id, *SESSIONS[0]))
+    assert store.add_sessions([session(trip_id, *row) for row in SESSIONS[1:]]) == 4
+    check_aggregates(store, trip_id, SESSIONS)
+
+
+def test_deferred_running_profit(store):
+    trip_id = store.start_trip("Bellagio", 1000, 5)
+    store.add_sessions([session(trip_id, *row) for row in SESSIONS[:2]], running_profit=False)
+    store.add_sessions([session(trip_id, *row) for row in SESSIONS[2:]], running_profit=False)
+    store.update_running_profit(trip_id, '2024-03-01')
+    check_aggregates(store, trip_id, SESSIONS)
+    points = store.profit_points(trip_id, after_session_id=2)
+    assert [point['session_id'] for point in points] == [4, 3, 5]
+
+
+def test_empty_trip_totals(store):
+    trip_id = store.start_trip("Bellagio", 1000, 5)
+    totals = store.trip_totals(trip_id)
+    assert totals['sessions'] == 0 and totals['total_profit'] == 0.0 and totals['first_date'] is None
+
+
+def v1_store(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(V1_SCHEMA)
+    conn.execute("INSERT INTO trips VALUES (1, 'Bellagio', 1000, 5, '2024-03-01')")
+    conn.executemany(
+        "INSERT INTO sessions (trip_id, date, casino, game, money_in, money_out, profit) "
+        "VALUES (1, ?, 'Bellagio', ?, ?, ?, ?)",
+        [(date, game, money_in, money_out, money_out - money_in) for date, game, money_in, money_out in SESSIONS]
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_version_1_store(tmp_path):
+    path = tmp_path / "sessions.db"
+    v1_store(path)
+    store = SessionStore(path)
+    assert store.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    check_aggregates(store, 1, SESSIONS)
+    store.close()
+
+
+def test_failed_migration_rolls_back(tmp_path, monkeypatch):
+    path = tmp_path / "sessions.db"
+    v1_store(path)
+
+    def fail(self):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(SessionStore, '_rebuild_aggregates', fail)
+        with pytest.raises(sqlite3.OperationalError):
+            SessionStore(path)
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    assert 'cumulative_profit' not in [row[1] for row in conn.execute("PRAGMA table_info(sessions)")]
+    conn.close()
+
+    store = SessionStore(path)
+    assert store.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    check_aggregates(store, 1, SESSIONS)
+    store.close()
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from strategy_sweep import SWEEP_STRATEGIES, cell_fraction, run_sweep, sweep_cells
+
+
+def test_progressions_get_one_cell_per_edge_and_bet_count():
+    cells = sweep_cells(["Fixed Fraction", "Martingale"], ["Conservative", "Aggressive"], [0.01, 0.05], [50])
+    assert len(cells) == 6
+    assert ("Martingale", None, 0.01, 50) in cells
+
+
+def test_kelly_bets_nothing_against_a_house_edge():
+    assert "Kelly Criterion" not in SWEEP_STRATEGIES
+    assert cell_fraction("Kelly Criterion", "Aggressive", 0.05) == 0.0
+    assert cell_fraction("Kelly Criterion", "Moderate", -0.02) == pytest.approx(0.015)
+    assert cell_fraction("Fixed Fraction", "Moderate", 0.05) == 0.025
+
+
+def test_sweep_rows():
+    cells = sweep_cells(["Kelly Criterion", "Fixed Fraction", "D'Alembert"], ["Moderate"], [0.05], [20])
+    results = run_sweep(cells, 1000, 3, num_paths=500, base_bet=10, table_max=100, workers=1)
+    kelly, fixed, progression = results.to_dict('records')
+    assert kelly['bet_fraction'] == 0 and kelly['ruin_probability'] == 0
+    assert kelly['median_final'] == kelly['mean_final'] == 1000
+    assert fixed['bet_fraction'] == 0.025 and fixed['mean_final'] < 1000
+    assert np.isnan(progression['bet_fraction']) and progression['mean_final'] < 1000
+
+
+def test_kelly_cells_with_a_player_edge_are_simulated():
+    cells = sweep_cells(["Kelly Criterion"], ["Aggressive"], [-0.04], [20])
+    row, = run_sweep(cells, 1000, 3, num_paths=500, workers=1).to_dict('records')
+    assert row['bet_fraction'] == pytest.approx(0.04)
+    assert row['mean_final'] > 1000
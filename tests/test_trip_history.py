@@ -0,0 +1,44 @@
+import pytest
+
+from session_store import SessionStore
+from trip_history import _HAS_PYARROW, TripHistory
+
+pytestmark = pytest.mark.skipif(not _HAS_PYARROW, reason="pyarrow is not installed")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(tmp_path / "sessions.db")
+    for casino in ("Aria", "Bellagio"):
+        trip_id = store.start_trip(casino, 1000, 5)
+        for day in range(1, 4):
+            store.add_session({'trip_id': trip_id, 'date': f'2024-03-0{day}', 'casino': casino, 'game': "Cleopatra",
+                               'money_in': 20.0, 'money_out': 10.0 * day, 'profit': 10.0 * day - 20.0})
+    yield store
+    store.close()
+
+
+def test_sync_appends_and_reloads(store, tmp_path):
+    root = tmp_path / "history"
+    history = TripHistory(store, root)
+    assert history.sync() == 6
+    assert history.sync() == 0
+    store.add_session({'trip_id': 1, 'date': '2024-03-04', 'casino': "Aria", 'game': "Buffalo Gold",
+                       'money_in': 20.0, 'money_out': 0.0, 'profit': -20.0})
+    assert history.sync() == 1
+    assert sorted(path.name for path in root.iterdir()) == ["_history.json", "casino=Aria", "casino=Bellagio"]
+
+    reloaded = TripHistory(store, root).frame()
+    assert reloaded['session_id'].tolist() == list(range(1, 8))
+    assert reloaded['profit'].sum() == pytest.approx(store.trip_totals(1)['total_profit'] +
+                                                     store.trip_totals(2)['total_profit'])
+
+
+def test_rebuild_keeps_unrelated_files(store, tmp_path):
+    root = tmp_path / "history"
+    TripHistory(store, root).sync()
+    (root / "_history.json").write_text('{"version": -1}')
+    (root / "notes.txt").write_text("keep me")
+    history = TripHistory(store, root)
+    assert len(history.frame()) == 6
+    assert (root / "notes.txt").read_text() == "keep me"
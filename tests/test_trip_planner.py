@@ -0,0 +1,73 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trip_planner import _mills, _normal_cdf, game_session_models, plan_stop_risk, plan_trip, session_outcomes
+
+# Relative error bound of the erfc fit behind _mills
+ERFC_FIT_ERROR = 1.2e-7
+
+
+def catalog(min_bets, rtp=None):
+    size = len(min_bets)
+    return pd.DataFrame({
+        'game_name': [f"Game {i}" for i in range(size)],
+        'min_bet': min_bets,
+        'rtp': np.linspace(97, 92, size) if rtp is None else rtp,
+        'volatility': [1, 2, 3, 4, 5, 3, 2, 1][:size],
+        'bonus_frequency': np.full(size, 5.0)
+    })
+
+
+def test_mills_ratio_matches_erfc():
+    x = np.linspace(0, 25, 2001)
+    exact = np.array([0.5 * math.erfc(v / math.sqrt(2)) / (math.exp(-v * v / 2) / math.sqrt(2 * math.pi))
+                      for v in x])
+    np.testing.assert_allclose(_mills(x), exact, rtol=ERFC_FIT_ERROR)
+
+
+def test_normal_cdf_matches_erfc():
+    z = np.linspace(-30, 8, 3001)
+    exact = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in z])
+    # Relative accuracy holds in the lower tail, where the values are tiny
+    np.testing.assert_allclose(_normal_cdf(z), exact, rtol=ERFC_FIT_ERROR, atol=1e-300)
+
+
+def test_no_stop_loss_loses_the_edge_on_every_spin():
+    models = game_session_models(catalog([1.0, 1.0, 1.0]))
+    eligible, expected, p_stop = session_outcomes([1e6], models, 200, 0.25, 0.6)
+    assert eligible.all()
+    np.testing.assert_allclose(expected[0], -models['edge'] * 200, rtol=1e-6)
+    assert p_stop.max() < 1e-9
+
+
+def test_rotation_uses_every_game_before_repeating():
+    df = catalog([0.25, 0.5, 1.0, 0.25, 0.5])
+    plan = plan_trip(df, 5000, 12, 0.25, 0.6)
+    games = plan['game'].tolist()
+    assert len(games) == 12
+    for start in range(0, 10, 5):
+        assert len(set(games[start:start + 5])) == 5
+    assert set(games[10:]) < set(games[:5]) and len(set(games[10:])) == 2
+    # Without rotation the best game is simply repeated
+    assert plan_trip(df, 5000, 12, 0.25, 0.6, rotate=False)['game'].nunique() < 5
+
+
+def test_only_games_under_the_max_bet_are_played():
+    df = catalog([0.5, 5.0, 25.0, 1.0, np.nan, 0.0], rtp=[92.0, 99.0, 99.5, 93.0, 99.0, 99.0])
+    plan = plan_trip(df, 400, 8, 0.25, 0.6)
+    assert len(plan) == 8
+    assert (plan['min_bet'] <= plan['max_bet']).all()
+    # Games without a usable min bet never qualify, and the $25 game only once a session allows a $25 bet
+    assert not {"Game 4", "Game 5"} & set(plan['game'])
+    assert "Game 2" not in set(plan.loc[plan['max_bet'] < 25, 'game'])
+    assert "Game 1" in set(plan['game'])
+
+
+def test_sessions_without_an_affordable_game_are_left_out():
+    assert plan_trip(catalog([25.0, 50.0]), 100, 4, 0.25, 0.6).empty
+    plan = plan_trip(catalog([1.0, 1.0], rtp=[85.0, 85.0]), 30, 10, 0.25, 0.6, rotate=False)
+    assert (plan['min_bet'] <= plan['max_bet']).all()
+    assert 0 <= plan_stop_risk(plan) <= 1
@@ -0,0 +1,219 @@
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+# The partitioned history needs pyarrow; without it the frame is read from the session store
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except Exception:
+    _HAS_PYARROW = False
+
+APP_DIR = Path(__file__).resolve().parent
+HISTORY_DIR = Path(os.environ.get("PROFIT_HOPPER_HISTORY", APP_DIR / ".history"))
+
+# Bump when the file layout changes so the history is rebuilt from the store
+HISTORY_VERSION = 1
+SYNC_CHUNK = 100000
+# Partitions with more part files than this are merged into one on sync
+MAX_PART_FILES = 16
+
+HISTORY_COLUMNS = ['session_id', 'date', 'game', 'money_in', 'money_out', 'profit']
+
+# Analytics groupings offered in the app -> history column
+GROUPINGS = {
+    "Casino": "casino",
+    "Game": "game",
+    "Month": "month",
+    "Trip": "trip_id"
+}
+
+
+def _to_frame(rows):
+    """Columnar frame from session rows, with the derived month column"""
+    df = pd.DataFrame.from_records(rows, columns=['trip_id', 'casino'] + HISTORY_COLUMNS)
+    return _with_month(df)
+
+
+def _with_month(df):
+    dates = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[D]')
+    df['date'] = dates
+    df['month'] = dates.astype('datetime64[M]')
+    return df
+
+
+def _categorize(df):
+    for col in ('casino', 'game'):
+        df[col] = df[col].astype('category')
+    df['trip_id'] = df['trip_id'].astype(np.int64)
+    return df
+
+
+class TripHistory:
+    """Session history across all trips as a Parquet dataset partitioned by casino and trip.
+
+    New sessions are appended from the SQLite store past a watermark, one part
+    file per touched partition, and partitions are compacted once they collect
+    too many parts. The full history is held in memory as one columnar frame
+    (categorical casino and game) and extended in place on sync, so analytics
+    are vectorized groupbys rather than loops over session dicts.
+    """
+
+    def __init__(self, store, root=HISTORY_DIR):
+        self.store = store
+        self.root = Path(root)
+        self.meta_path = self.root / "_history.json"
+        self.lock = threading.Lock()
+        self._frame = None
+        self.watermark = 0
+        if _HAS_PYARROW:
+            self.partitioning = ds.partitioning(
+                pa.schema([('casino', pa.string()), ('trip_id', pa.int64())]), flavor='hive'
+            )
+            meta = json.loads(self.meta_path.read_text()) if self.meta_path.exists() else {}
+            if meta.get('version') == HISTORY_VERSION:
+                self.watermark = meta['watermark']
+
+    def _write_meta(self):
+        tmp = self.meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({'version': HISTORY_VERSION, 'watermark': self.watermark}))
+        os.replace(tmp, self.meta_path)
+
+    def _clear(self):
+        """Remove the files this class writes - partitions and metadata - and nothing else under root"""
+        for directory in self.root.glob("casino=*"):
+            if directory.is_dir():
+                shutil.rmtree(directory)
+        for path in (self.meta_path, self.meta_path.with_suffix(".tmp")):
+            path.unlink(missing_ok=True)
+
+    def _partition_dir(self, casino, trip_id):
+        return self.root / f"casino={quote(str(casino), safe='')}" / f"trip_id={int(trip_id)}"
+
+    def _append_parts(self, df):
+        # Named by the first session id of the batch, so a sync interrupted before
+        # the watermark is saved overwrites its own files when it is retried
+        name = f"part-{int(df['session_id'].iloc[0]):012d}.parquet"
+        touched = []
+        for (casino, trip_id), part in df.groupby(['casino', 'trip_id'], sort=False):
+            directory = self._partition_dir(casino, trip_id)
+            directory.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pandas(part[HISTORY_COLUMNS], preserve_index=False)
+            pq.write_table(table, directory / name)
+            touched.append(directory)
+        return touched
+
+    def compact(self, directories=None, max_files=MAX_PART_FILES):
+        """Merge the part files of partitions holding more than `max_files` of them"""
+        if directories is None:
+            directories = [path for path in self.root.glob("casino=*/trip_id=*") if path.is_dir()]
+        for directory in directories:
+            parts = sorted(directory.glob("part-*.parquet"))
+            if len(parts) <= max_files:
+                continue
+            table = pa.concat_tables([pq.read_table(part) for part in parts])
+            # Keep the first part's name so a retry after a crash stays idempotent
+            tmp = directory / "_compact.tmp"
+            pq.write_table(table, tmp)
+            os.replace(tmp, parts[0])
+            for part in parts[1:]:
+                part.unlink()
+
+    def _load(self):
+        if not _HAS_PYARROW or not self.watermark or not self.root.exists():
+            return None
+        # Metadata and temporary files start with "_" and are skipped by dataset discovery
+        dataset = ds.dataset(self.root, format='parquet', partitioning=self.partitioning)
+        df = dataset.to_table().to_pandas()
+        df = df[['trip_id', 'casino'] + HISTORY_COLUMNS]
+        # Parts past the watermark (or duplicated by an interrupted compaction) are left
+        # over from a sync that did not finish; they are rewritten from the store
+        df = df[df['session_id'] <= self.watermark].drop_duplicates('session_id')
+        df = df.sort_values('session_id', kind='stable').reset_index(drop=True)
+        return _categorize(_with_month(df.astype({'casino': object})))
+
+    def _extend(self, chunk):
+        chunk = _categorize(chunk)
+        if self._frame is None:
+            self._frame = chunk
+            return
+        for col in ('casino', 'game'):
+            # Append new categories after the existing ones so existing codes stay valid
+            categories = self._frame[col].cat.categories
+            merged = categories.append(chunk[col].cat.categories.difference(categories))
+            self._frame[col] = self._frame[col].cat.set_categories(merged)
+            chunk[col] = chunk[col].cat.set_categories(merged)
+        self._frame = pd.concat([self._frame, chunk], ignore_index=True)
+
+    def sync(self):
+        """Bring the history up to date with the store; returns the number of sessions added"""
+        with self.lock:
+            if self._frame is None:
+                self._frame = self._load()
+                if self._frame is None and self.root.exists() and _HAS_PYARROW:
+                    # Unknown or missing watermark: rebuild the whole history from the store
+                    self._clear()
+                    self.watermark = 0
+            added = 0
+            while True:
+                rows = self.store.sessions_since(self.watermark, SYNC_CHUNK)
+                if not rows:
+                    break
+                chunk = _to_frame(rows)
+                watermark = int(chunk['session_id'].iloc[-1])
+                if _HAS_PYARROW:
+                    self.root.mkdir(parents=True, exist_ok=True)
+                    touched = self._append_parts(chunk)
+                    self.watermark = watermark
+                    self._write_meta()
+                    self.compact(touched)
+                self.watermark = watermark
+                self._extend(chunk)
+                added += len(chunk)
+            return added
+
+    def frame(self):
+        """Every session of every trip (trip_id, casino, date, month, game, money and profit columns)"""
+        self.sync()
+        if self._frame is None:
+            return _categorize(_to_frame([]))
+        return self._frame.copy(deep=False)
+
+
+def summarize(df, by):
+    """Sessions, totals, average profit and ROI per value of `by` (a column or list of columns)"""
+    grouped = df.groupby(by, observed=True, sort=True)
+    summary = pd.DataFrame({
+        'sessions': grouped.size(),
+        'total_profit': grouped['profit'].sum(),
+        'total_invested': grouped['money_in'].sum()
+    })
+    summary['avg_profit'] = summary['total_profit'] / summary['sessions']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        summary['roi'] = np.where(summary['total_invested'] > 0,
+                                  summary['total_profit'] / summary['total_invested'] * 100, 0.0)
+    return summary
+
+
+def roi_trend(df):
+    """Monthly ROI alongside the ROI of everything played up to that month"""
+    trend = summarize(df, 'month')
+    invested = trend['total_invested'].cumsum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trend['cumulative_roi'] = np.where(invested > 0, trend['total_profit'].cumsum() / invested * 100, 0.0)
+    return trend
+
+
+def best_and_worst_games(df, n=5, min_sessions=1):
+    """The `n` games with the highest and the lowest ROI among those played `min_sessions` times"""
+    games = summarize(df, 'game')
+    games = games[games['sessions'] >= min_sessions].sort_values('roi', ascending=False, kind='stable')
+    return games.head(n), games.tail(n).iloc[::-1]
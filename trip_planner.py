@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+
+from kelly_optimizer import catalog_distributions
+
+SPINS_PER_SESSION = 150
+# Quadrature points for the expected number of spins before the stop loss
+SURVIVAL_NODES = 8
+BEAM_WIDTH = 16
+# Dollars of expected value given up per dollar of bankroll exposed to a stop-loss hit
+RISK_WEIGHT = 0.25
+
+PLAN_COLUMNS = ['session', 'game', 'min_bet', 'volatility', 'rtp', 'session_bankroll', 'max_bet', 'stop_loss',
+                'expected_result', 'stop_loss_probability', 'expected_bankroll']
+
+
+def _mills(x):
+    """Phi(-x) / phi(x) for x >= 0, from the Numerical Recipes erfc fit (relative error < 1.2e-7)"""
+    t = 1 / (1 + x / (2 * np.sqrt(2)))
+    return np.sqrt(np.pi / 2) * t * np.exp(-1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (
+        0.09678418 + t * (-0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277)))))))))
+
+
+def _normal_pdf(z):
+    return np.exp(-0.5 * z * z) / np.sqrt(2 * np.pi)
+
+
+def _normal_cdf(z):
+    # NumPy has no erf; the tail is phi(z) times the Mills ratio, which stays accurate far out
+    tail = _normal_pdf(z) * _mills(np.abs(z))
+    return np.where(z < 0, tail, 1 - tail)
+
+
+def game_session_models(df):
+    """Per-game bet, expected loss per dollar wagered and per-spin standard deviation per dollar.
+
+    The spin distribution is the catalog payout model of kelly_optimizer, so the
+    spread grows with the volatility rating. Rows without a usable RTP or min bet
+    are marked ineligible.
+    """
+    rtp = df['rtp'].to_numpy(dtype=np.float64)
+    min_bet = df['min_bet'].to_numpy(dtype=np.float64)
+    volatility = np.nan_to_num(df['volatility'].to_numpy(dtype=np.float64), nan=3.0)
+    bonus = np.nan_to_num(df['bonus_frequency'].to_numpy(dtype=np.float64), nan=0.0)
+    valid = np.isfinite(rtp) & np.isfinite(min_bet) & (min_bet > 0)
+
+    multipliers, probabilities = catalog_distributions(np.where(valid, rtp, 100.0), volatility, bonus)
+    mean = (multipliers * probabilities).sum(axis=1)
+    spread = np.sqrt(np.maximum((multipliers ** 2 * probabilities).sum(axis=1) - mean ** 2, 0.0))
+    return {'min_bet': np.where(valid, min_bet, np.inf), 'edge': 1 - mean, 'spread': spread, 'valid': valid}
+
+
+def session_outcomes(session_bankroll, models, spins, max_bet_share, stop_loss_share):
+    """Expected result and stop-loss probability of one session on every game, for each session bankroll.
+
+    A session is up to `spins` min-bet spins and ends early once it is down by
+    the stop loss. The running result is treated as a drifting Brownian motion,
+    whose chance of not having reached the stop loss after t spins is known in
+    closed form; integrating it gives the expected number of spins played, and
+    by Wald's identity the expected result is that times the mean result of a
+    spin. Returns (eligible, expected, p_stop) arrays of shape (bankrolls,
+    games); a game is eligible when its min bet fits under the session's max bet.
+    """
+    session_bankroll = np.asarray(session_bankroll, dtype=np.float64)[:, None]
+    bet = models['min_bet']
+    eligible = models['valid'] & (bet <= session_bankroll * max_bet_share)
+
+    stop_loss = (session_bankroll * stop_loss_share)[..., None]
+    # Ineligible rows have an infinite min bet; a zero stake keeps their (unused) numbers finite
+    stake = np.where(models['valid'], bet, 0.0)
+    drift = (-stake * models['edge'])[:, None]
+    sd = np.maximum(stake * models['spread'], 1e-9)[:, None]
+    # Gauss-Legendre nodes over (0, spins] for the expected spins played, plus the end of the session
+    nodes, weights = np.polynomial.legendre.leggauss(SURVIVAL_NODES)
+    times = np.append((nodes + 1) * spins / 2, spins)
+    scale = sd * np.sqrt(times)
+    upper = (stop_loss + drift * times) / scale
+    lower = (-stop_loss + drift * times) / scale
+
+    # P(no stop by t) = Phi(upper) - exp(-2 drift L / sd^2) Phi(lower); for a losing game
+    # (drift < 0) the second term equals phi(upper) * Phi(lower) / phi(lower), which cannot overflow
+    density = _normal_pdf(upper)
+    upper_tail = density * _mills(np.abs(upper))
+    survival = np.where(upper < 0, upper_tail, 1 - upper_tail) - density * _mills(-lower)
+    winning = np.flatnonzero(drift[:, 0] >= 0)
+    if len(winning):
+        reflected = np.exp(-2 * drift[winning] * stop_loss / sd[winning] ** 2) * _normal_cdf(lower[:, winning])
+        survival[:, winning] = _normal_cdf(upper[:, winning]) - reflected
+    survival = np.clip(survival, 0.0, 1.0)
+
+    spins_played = survival[..., :-1] @ weights * spins / 2
+    expected = drift[:, 0] * spins_played
+    p_stop = 1 - survival[..., -1]
+    return eligible, expected, p_stop
+
+
+def plan_trip(df, bankroll, num_sessions, max_bet_share, stop_loss_share, spins=SPINS_PER_SESSION,
+              beam_width=BEAM_WIDTH, risk_weight=RISK_WEIGHT, rotate=True):
+    """Assign a catalog game to each of `num_sessions` sessions by beam search.
+
+    Each session gets an equal share of the bankroll left, and its max bet and
+    stop loss are that share times `max_bet_share` / `stop_loss_share`, so all
+    three shrink after expected losses. A plan scores its expected final
+    bankroll minus `risk_weight` x starting bankroll x the chance of hitting at
+    least one stop loss; the search keeps the `beam_width` best partial plans
+    after every session. With `rotate`, a game
+    is only replayed once every other affordable game has been played as often.
+    Sessions where no game fits the max bet are left out of the plan.
+    """
+    models = game_session_models(df)
+    num_games = len(models['min_bet'])
+    bankrolls = np.array([float(bankroll)])
+    survival = np.ones(1)
+    plays = np.zeros((1, num_games), dtype=np.int32)
+    steps = []
+
+    for session in range(num_sessions):
+        session_bankroll = bankrolls / (num_sessions - session)
+        eligible, expected, p_stop = session_outcomes(session_bankroll, models, spins, max_bet_share,
+                                                       stop_loss_share)
+        allowed = eligible
+        if rotate:
+            fewest = np.where(eligible, plays, np.iinfo(np.int32).max).min(axis=1)
+            allowed = eligible & (plays <= fewest[:, None])
+        if not allowed.any():
+            break
+
+        next_bankrolls = bankrolls[:, None] + expected
+        next_survival = survival[:, None] * (1 - p_stop)
+        scores = np.where(allowed, next_bankrolls - risk_weight * bankroll * (1 - next_survival), -np.inf)
+
+        flat = scores.ravel()
+        keep = min(beam_width, int(np.count_nonzero(allowed)))
+        best = np.argpartition(-flat, keep - 1)[:keep] if keep < len(flat) else np.arange(len(flat))
+        best = best[np.argsort(-flat[best], kind='stable')]
+        parents, games = np.divmod(best, num_games)
+
+        steps.append({
+            'parents': parents,
+            'games': games,
+            'session_bankroll': session_bankroll[parents],
+            'expected': expected[parents, games],
+            'p_stop': p_stop[parents, games],
+            'bankroll': next_bankrolls[parents, games]
+        })
+        bankrolls = next_bankrolls[parents, games]
+        survival = next_survival[parents, games]
+        plays = plays[parents]
+        plays[np.arange(len(games)), games] += 1
+
+    # Walk back from the best final plan
+    rows = []
+    beam = 0
+    for session in range(len(steps) - 1, -1, -1):
+        step = steps[session]
+        rows.append((session + 1, step['games'][beam], step['session_bankroll'][beam], step['expected'][beam],
+                     step['p_stop'][beam], step['bankroll'][beam]))
+        beam = step['parents'][beam]
+    rows.reverse()
+    return _plan_frame(df, rows, max_bet_share, stop_loss_share)
+
+
+def _plan_frame(df, rows, max_bet_share, stop_loss_share):
+    if not rows:
+        return pd.DataFrame(columns=PLAN_COLUMNS)
+    session, games, session_bankroll, expected, p_stop, bankroll = (np.array(column) for column in zip(*rows))
+    return pd.DataFrame({
+        'session': session,
+        'game': df['game_name'].to_numpy()[games],
+        'min_bet': df['min_bet'].to_numpy(dtype=np.float64)[games],
+        'volatility': df['volatility'].to_numpy()[games],
+        'rtp': df['rtp'].to_numpy(dtype=np.float64)[games],
+        'session_bankroll': session_bankroll,
+        'max_bet': session_bankroll * max_bet_share,
+        'stop_loss': session_bankroll * stop_loss_share,
+        'expected_result': expected,
+        'stop_loss_probability': p_stop,
+        'expected_bankroll': bankroll
+    })
+
+
+def plan_stop_risk(plan):
+    """Chance of hitting at least one stop loss over the plan"""
+    return float(1 - np.prod(1 - plan['stop_loss_probability'].to_numpy(dtype=np.float64)))